@@ -0,0 +1,125 @@
+from collections.abc import AsyncIterable
+from typing import Any, Literal
+from pydantic import BaseModel
+
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.runnables import Runnable
+
+import logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORMAT_INSTRUCTION = (
+    'Set response status to input_required if the user needs to provide more information to complete the request.'
+    'Set response status to error if there is an error while processing the request.'
+    'Set response status to completed if the request is complete.'
+)
+
+class ResponseFormat(BaseModel):
+    """Respond to the user in this format."""
+
+    status: Literal['input_required', 'completed', 'error'] = 'error'
+    message: str
+
+
+class LangGraphAgentAdapter:
+    def __init__(self, agent: Runnable, stream_tokens: bool = False, callbacks: list | None = None):
+        """
+        Wrap a compiled LangGraph agent for A2A execution.
+
+        Args:
+            agent: Compiled LangGraph agent
+            stream_tokens: Also yield LLM tokens as they are generated
+                (``messages`` stream mode). Token items carry ``is_partial: True``.
+            callbacks: Callback handlers for every run, e.g. a TracingCallbackHandler
+        """
+        self.graph = agent
+        self.stream_tokens = stream_tokens
+        self.callbacks = callbacks
+
+    async def stream(self, query, context_id) -> AsyncIterable[dict[str, Any]]:
+        inputs = {'messages': [('user', query)]}
+        config = {'configurable': {'thread_id': context_id}}
+        if self.callbacks:
+            config['callbacks'] = self.callbacks
+
+        # astream keeps the event loop free while the LLM / tools run,
+        # so concurrent requests on the same server are not serialized.
+        stream_mode = ['values', 'messages'] if self.stream_tokens else ['values']
+        values: dict[str, Any] = {}
+        async for mode, chunk in self.graph.astream(inputs, config, stream_mode=stream_mode):
+            if mode == 'messages':
+                token, _metadata = chunk
+                if isinstance(token, AIMessageChunk) and isinstance(token.content, str) and token.content:
+                    yield {
+                        'is_task_complete': False,
+                        'require_user_input': False,
+                        'is_partial': True,
+                        'content': token.content,
+                    }
+                continue
+
+            values = chunk
+            message = chunk['messages'][-1]
+            if (
+                isinstance(message, AIMessage)
+                and message.tool_calls
+                and len(message.tool_calls) > 0
+            ):
+                yield {
+                    'is_task_complete': False,
+                    'require_user_input': False,
+                    'content': 'Calling a tool...',
+                }
+            elif isinstance(message, ToolMessage):
+                yield {
+                    'is_task_complete': False,
+                    'require_user_input': False,
+                    'content': 'Processing tool result...',
+                }
+
+        # The last 'values' chunk is the final graph state; no need to read the checkpoint again
+        yield self._final_response(values) if values else await self.get_agent_response(config)
+
+    async def get_agent_response(self, config):
+        current_state = await self.graph.aget_state(config)
+        return self._final_response(current_state.values)
+
+    def _final_response(self, values: dict[str, Any]) -> dict[str, Any]:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("state keys=%s", list(values.keys()))
+            logger.debug("structured_response raw=%r", values.get("structured_response"))
+
+        structured_response = values.get('structured_response')
+        if isinstance(structured_response, ResponseFormat):
+            return {
+                'is_task_complete': structured_response.status != 'input_required',
+                'require_user_input': structured_response.status == 'input_required',
+                'content': structured_response.message,
+            }
+
+        msgs = values.get("messages", [])
+
+        # 末尾から「contentが空じゃない」ものを拾う
+        final_text = None
+        for m in reversed(msgs):
+            content = getattr(m, "content", None)
+            if content:
+                final_text = content
+                break
+
+        if final_text:
+            return {
+                "is_task_complete": True,
+                "require_user_input": False,
+                "content": final_text,
+            }
+
+        # ToolMessageしか無い/AIMessageが空など、期待外のとき
+        return {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": "Error: agent produced no final text.",
+        }
+
+    SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
\ No newline at end of file
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .metrics import percentile
+
+DEFAULT_MAX_QUEUE = 100
+DEFAULT_KNOWN_CONTEXTS = 10000  # context ids remembered to recognize continuations
+
+# Lower runs first
+PRIORITY_CONTINUATION = 0
+PRIORITY_NEW = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when a run is not admitted: the wait queue is full or the wait timed out."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason  # "queue_full" or "queue_timeout"
+
+
+class AdmissionController:
+    """Concurrency limit for agent runs with a bounded, prioritized wait queue."""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float | None = None,
+        prioritize_continuations: bool = True,
+        window: int = 1000,
+    ):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_concurrent: Runs allowed at the same time
+            max_queue: Runs allowed to wait for a slot; more are rejected at once
+            queue_timeout: Seconds a run may wait before it is rejected (None to wait indefinitely)
+            prioritize_continuations: Admit runs for known contexts (follow-up messages,
+                input-required replies) before new conversations
+            window: Number of recent wait times kept for the wait-time percentiles
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.prioritize_continuations = prioritize_continuations
+        self._running = 0
+        self._queued = 0
+        # Heap of (priority, arrival, future); abandoned entries stay until popped
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._known_contexts: OrderedDict[str, None] = OrderedDict()
+        self._waits: deque[float] = deque(maxlen=window)
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queued = 0
+
+
+    def _priority(self, context_id: str, continuing: bool) -> int:
+        known = context_id in self._known_contexts
+        self._known_contexts[context_id] = None
+        self._known_contexts.move_to_end(context_id)
+        if len(self._known_contexts) > DEFAULT_KNOWN_CONTEXTS:
+            self._known_contexts.popitem(last=False)
+
+        if self.prioritize_continuations and (continuing or known):
+            return PRIORITY_CONTINUATION
+        return PRIORITY_NEW
+
+
+    @asynccontextmanager
+    async def admit(self, context_id: str, continuing: bool = False) -> AsyncIterator[float]:
+        """
+        Hold a run slot for the duration of the block.
+
+        Args:
+            context_id: Context of the run (used to recognize continuations)
+            continuing: The run continues an existing task
+
+        Yields:
+            float: Seconds the run waited for its slot
+
+        Raises:
+            AdmissionRejected: The queue is full or the wait timed out
+        """
+        waited = await self._acquire(self._priority(context_id, continuing))
+        try:
+            yield waited
+        finally:
+            self._release()
+
+
+    async def _acquire(self, priority: int) -> float:
+        started = time.monotonic()
+        if self._running < self.max_concurrent and not self._queued:
+            self._running += 1
+            return self._admitted(started)
+
+        if self._queued >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self._queued += 1
+        self.max_queued = max(self.max_queued, self._queued)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release()
+            else:
+                future.cancel()
+                self._queued -= 1
+            if isinstance(e, TimeoutError):
+                self.rejected += 1
+                self.timed_out += 1
+                raise AdmissionRejected("queue_timeout") from None
+            raise
+
+        return self._admitted(started)
+
+
+    def _admitted(self, started: float) -> float:
+        waited = time.monotonic() - started
+        self._waits.append(waited)
+        self.admitted += 1
+        return waited
+
+
+    def _release(self) -> None:
+        # Hand the slot straight to the best live waiter so it cannot be taken out of order
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._queued -= 1
+                future.set_result(None)
+                return
+        self._running -= 1
+
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return admission metrics.
+
+        Returns:
+            dict: Metrics including:
+                - running: Runs holding a slot
+                - queued: Runs waiting for a slot (queue depth)
+                - max_queued: Deepest the queue has been
+                - admitted / rejected / timed_out: Totals (timed_out is included in rejected)
+                - wait_avg / wait_p50 / wait_p99: Seconds admitted runs waited, over recent runs
+        """
+        waits = sorted(self._waits)
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "max_queued": self.max_queued,
+            "max_concurrent": self.max_concurrent,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_p50": percentile(waits, 0.50),
+            "wait_p99": percentile(waits, 0.99),
+        }
+
+
+def create_admission_controller() -> AdmissionController | None:
+    """
+    Build an admission controller from the environment, or None when runs are unlimited.
+
+    AGENT_MAX_CONCURRENCY enables the limit (0 or unset: unlimited). AGENT_MAX_QUEUE
+    (default 100) bounds the wait queue, AGENT_QUEUE_TIMEOUT (seconds, 0 for none)
+    bounds the wait, and AGENT_PRIORITIZE_CONTINUATIONS=false disables prioritization.
+
+    Returns:
+        AdmissionController | None: The configured controller
+    """
+    max_concurrent = int(os.getenv("AGENT_MAX_CONCURRENCY", "0"))
+    if max_concurrent <= 0:
+        return None
+    return AdmissionController(
+        max_concurrent=max_concurrent,
+        max_queue=int(os.getenv("AGENT_MAX_QUEUE", str(DEFAULT_MAX_QUEUE))),
+        queue_timeout=float(os.getenv("AGENT_QUEUE_TIMEOUT", "0")) or None,
+        prioritize_continuations=os.getenv("AGENT_PRIORITIZE_CONTINUATIONS", "true").lower() == "true",
+    )
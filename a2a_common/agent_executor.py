@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, nullcontext
+from uuid import uuid4
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import (
+    InternalError,
+    Part,
+    Task,
+    TaskState,
+    TextPart,
+)
+from a2a.utils import (
+    new_agent_text_message,
+    new_task,
+)
+from a2a.utils.errors import ServerError
+from opentelemetry.trace import Span, SpanKind
+
+from .adapter import LangGraphAgentAdapter
+from .admission import AdmissionController, AdmissionRejected
+from .tracing import extract_trace_context, tracer
+from .update_policy import StatusUpdatePolicy
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LangGraphAgentExecutor(AgentExecutor):
+    """LangGraph AgentExecutor Example."""
+
+    def __init__(
+        self,
+        adapter: LangGraphAgentAdapter,
+        admission: AdmissionController | None = None,
+        update_policy: StatusUpdatePolicy | None = None,
+    ):
+        """
+        Args:
+            adapter: Adapter running the LangGraph agent
+            admission: Optional concurrency limit for graph runs (None for unlimited)
+            update_policy: Which intermediate status updates to send (None sends all)
+        """
+        self.adapter = adapter
+        self.admission = admission
+        self.update_policy = update_policy or StatusUpdatePolicy()
+        # Task id -> (asyncio task running execute() for it, its event queue), so cancel() can
+        # stop the graph run and report it to the run's subscribers
+        self._running: dict[str, tuple[asyncio.Task, EventQueue]] = {}
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        # Continue the caller's trace from the W3C context in the message metadata
+        parent = extract_trace_context(context.message.metadata if context.message else None)
+        with tracer.start_as_current_span("a2a.execute", context=parent, kind=SpanKind.SERVER) as span:
+            await self._execute(context, event_queue, span)
+
+    async def _execute(self, context: RequestContext, event_queue: EventQueue, span: Span) -> None:
+        # error = self._validate_request(context)
+        # if error:
+        #     raise ServerError(error=InvalidParamsError())
+
+        query = context.get_user_input()
+        task = context.current_task
+        if not task:
+            task = new_task(context.message)  # type: ignore
+            await event_queue.enqueue_event(task)
+        span.set_attribute("a2a.task_id", task.id)
+        span.set_attribute("a2a.context_id", task.context_id)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        # Token chunks are appended to this artifact; the final answer replaces it.
+        artifact_id = uuid4().hex
+        streamed = False
+        updates = self.update_policy.gate()
+        self._running[task.id] = (asyncio.current_task(), event_queue)
+        try:
+            async with AsyncExitStack() as admitted:
+                # Time spent waiting for a run slot
+                with tracer.start_as_current_span("a2a.queue"):
+                    await admitted.enter_async_context(self._admit(context, task))
+                async for item in self.adapter.stream(query, task.context_id):
+                    is_task_complete = item['is_task_complete']
+                    require_user_input = item['require_user_input']
+
+                    if item.get('is_partial'):
+                        await updater.add_artifact(
+                            [Part(root=TextPart(text=item['content']))],
+                            artifact_id=artifact_id,
+                            name='tool_result',
+                            append=streamed,
+                            last_chunk=False,
+                        )
+                        streamed = True
+                    elif not is_task_complete and not require_user_input:
+                        if not updates.allow(item['content']):
+                            continue
+                        await updater.update_status(
+                            TaskState.working,
+                            new_agent_text_message(
+                                item['content'],
+                                task.context_id,
+                                task.id,
+                            ),
+                        )
+                    elif require_user_input:
+                        await updater.update_status(
+                            TaskState.input_required,
+                            new_agent_text_message(
+                                item['content'],
+                                task.context_id,
+                                task.id,
+                            ),
+                            final=True,
+                        )
+                        break
+                    else:
+                        await updater.add_artifact(
+                            [Part(root=TextPart(text=item['content']))],
+                            artifact_id=artifact_id,
+                            name='tool_result',
+                            last_chunk=True if streamed else None,
+                        )
+                        await updater.complete()
+                        break
+
+        except AdmissionRejected as e:
+            # Fail fast instead of queueing without bound; the client may retry later
+            logger.warning(f'Rejected task {task.id}: {e.reason}')
+            await updater.reject(
+                new_agent_text_message(
+                    'The agent is busy. Please retry later.',
+                    task.context_id,
+                    task.id,
+                )
+            )
+
+        except asyncio.CancelledError:
+            # The graph run (and any in-flight LLM call) stops here; cancel() reports the
+            # canceled state, so only the cleanup in finally remains
+            logger.info(f'Task {task.id} was canceled')
+            raise
+
+        except Exception as e:
+            logger.error(f'An error occurred while streaming the response: {e}')
+            raise ServerError(error=InternalError()) from e
+
+        finally:
+            self._running.pop(task.id, None)
+
+    def _admit(self, context: RequestContext, task: Task) -> AbstractAsyncContextManager:
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(task.context_id, continuing=context.current_task is not None)
+
+    # def _validate_request(self, context: RequestContext) -> bool:
+    #     return False
+
+    async def cancel(
+        self, context: RequestContext, event_queue: EventQueue
+    ) -> None:
+        """Stop the task's graph run, if it is running in this process, and mark it canceled."""
+        running, run_queue = self._running.get(context.task_id, (None, None))
+        if running is not None and not running.done() and not run_queue.is_closed():
+            # The run's queue reaches its stream subscribers and, through its taps, this request;
+            # report before stopping the run, while the queue is still open
+            await TaskUpdater(run_queue, context.task_id, context.context_id).cancel()
+            running.cancel()
+            return
+        # Tasks that are not running (e.g. waiting for input) or run elsewhere
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.cancel()
\ No newline at end of file
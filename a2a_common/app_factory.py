@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import uvicorn
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import AgentCard
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from .adapter import LangGraphAgentAdapter
+from .admission import create_admission_controller
+from .agent_executor import LangGraphAgentExecutor
+from .model_backend import create_chat_model
+from .push_sender import create_push_sender
+from .state_backend import create_state_backend
+from .tracing import TraceContextMiddleware, create_tracing_handler, setup_tracing
+from .update_policy import create_update_policy
+
+DEFAULT_GRACEFUL_TIMEOUT = 30  # seconds in-flight requests (e.g. SSE streams) get to finish on shutdown
+DEFAULT_SWEEP_INTERVAL = 60  # seconds between evictions of idle state in the background
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentSpec:
+    """Everything needed to build a remote agent's A2A application."""
+
+    name: str
+    default_port: int
+    default_public_host: str
+    model: str
+    build_agent: Callable[[str | BaseChatModel, BaseCheckpointSaver], Runnable]  # (model, checkpointer) -> compiled agent
+    build_card: Callable[[str], AgentCard]  # public URL -> agent card
+    script: list[dict[str, Any]] | None = None  # steps of the stand-in model when MODEL_BACKEND=scripted
+
+
+def build_app(
+    spec: AgentSpec,
+    url: str | None = None,
+    model: str | BaseChatModel | None = None,
+    httpx_client: httpx.AsyncClient | None = None,
+) -> Starlette:
+    """
+    Build the ASGI application for an agent spec.
+
+    Reads PUBLIC_HOST, PORT and STREAM_TOKENS from the environment, selects the model
+    with create_chat_model() (MODEL_BACKEND) and takes task,
+    push config and conversation state from create_state_backend(spec.name), the run limit
+    from create_admission_controller() and the status update policy from
+    create_update_policy(). Push notifications are delivered in the background by
+    create_push_sender(). With TRACING set (see setup_tracing()), requests continue the
+    caller's trace and graph steps and model calls become spans. Resources are released
+    in the application's lifespan, so the app can run in any worker process; the lifespan
+    also evicts idle state every STATE_SWEEP_INTERVAL seconds (default 60). GET /stats
+    reports the task store, admission, status update and push delivery metrics of the
+    worker that answers.
+
+    Args:
+        spec: The agent to serve
+        url: Public URL for the agent card (defaults to http://PUBLIC_HOST:PORT/)
+        model: Model to use instead of the one selected for spec.model, e.g. a chat model
+            shared with other agents
+        httpx_client: Client for push notifications, e.g. one shared with other agents
+            (defaults to one owned by the app)
+
+    Returns:
+        Starlette: The A2A application
+    """
+    if url is None:
+        public_host = os.getenv("PUBLIC_HOST", spec.default_public_host)
+        port = int(os.getenv("PORT", str(spec.default_port)))
+        url = f'http://{public_host}:{port}/'
+    state = create_state_backend(spec.name)
+    tracing = setup_tracing(spec.name)
+
+    agent = spec.build_agent(model or create_chat_model(spec.model, spec.name, spec.script), state.checkpointer)
+    agent_card = spec.build_card(url)
+
+    push_sender = create_push_sender(state.push_config_store, httpx_client=httpx_client)
+    tracing_handler = create_tracing_handler()
+    adapter = LangGraphAgentAdapter(
+        agent=agent,
+        stream_tokens=os.getenv("STREAM_TOKENS", "false").lower() == "true",
+        callbacks=[tracing_handler] if tracing_handler is not None else None,
+    )
+    admission = create_admission_controller()
+    update_policy = create_update_policy()
+    request_handler = DefaultRequestHandler(
+        agent_executor=LangGraphAgentExecutor(adapter=adapter, admission=admission, update_policy=update_policy),
+        task_store=state.task_store,
+        push_config_store=state.push_config_store,
+        push_sender=push_sender,
+    )
+
+    sweep_interval = float(os.getenv("STATE_SWEEP_INTERVAL", str(DEFAULT_SWEEP_INTERVAL)))
+
+    async def sweep_periodically() -> None:
+        while True:
+            await asyncio.sleep(sweep_interval)
+            try:
+                await state.sweep()
+            except Exception:
+                logger.exception(f"Sweeping the state of {spec.name} failed")
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        sweeper = asyncio.create_task(sweep_periodically()) if sweep_interval > 0 else None
+        yield
+        if sweeper is not None:
+            sweeper.cancel()
+        logger.info(f"Shutting down {spec.name} (pid {os.getpid()})")
+        await push_sender.aclose()  # delivers queued notifications first
+        state.close()  # persists resident conversations when they are backed by SQLite
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse({
+            "pid": os.getpid(),
+            "tasks": await state.task_store.stats(),
+            "admission": admission.stats() if admission is not None else None,
+            "status_updates": update_policy.stats(),
+            "push": push_sender.stats(),
+        })
+
+    app = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).build(lifespan=lifespan)
+    app.add_route("/stats", stats, methods=["GET"])
+    if tracing:
+        # Callers that send the trace context only in the HTTP headers
+        app.add_middleware(TraceContextMiddleware)
+    return app
+
+
+def serve(spec: AgentSpec, app_factory: str) -> None:
+    """
+    Run an agent from the command line, optionally with several worker processes.
+
+    Args:
+        spec: The agent to serve
+        app_factory: Import string of a zero-argument function returning build_app(spec),
+            e.g. "weather_agent:create_app" (worker processes import the app by this name)
+    """
+    serve_app(spec.name, spec.default_port, app_factory)
+
+
+def serve_app(name: str, default_port: int, app_factory: str) -> None:
+    """
+    Run an A2A application from the command line, optionally with several worker processes.
+
+    Args:
+        name: Name shown in the command line help
+        default_port: Port used unless --port or PORT is given
+        app_factory: Import string of a zero-argument function returning the application
+    """
+    parser = argparse.ArgumentParser(description=f"Serve {name} over A2A")
+    parser.add_argument("--host", default=os.getenv("BIND_HOST", "0.0.0.0"), help="Address to listen on")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", str(default_port))), help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "1")), help="Worker processes")
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", str(DEFAULT_GRACEFUL_TIMEOUT))),
+        help="Seconds in-flight requests get to finish on shutdown",
+    )
+    args = parser.parse_args()
+
+    # Workers are separate processes; they read the port for the agent card from the environment
+    os.environ["PORT"] = str(args.port)
+    if args.workers > 1 and os.getenv("A2A_STATE_BACKEND", "memory").lower() == "memory":
+        logger.warning(
+            "Running several workers with A2A_STATE_BACKEND=memory: tasks and conversations are "
+            "per worker, so tasks/get or follow-up messages may reach a worker that does not know them. "
+            "Set A2A_STATE_BACKEND=sqlite to share them."
+        )
+
+    uvicorn.run(
+        app_factory,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
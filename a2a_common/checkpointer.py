@@ -0,0 +1,423 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from typing import Any, TypeVar
+
+import ormsgpack
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import WRITES_IDX_MAP, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+DEFAULT_MAX_THREADS = 1000
+DEFAULT_IDLE_TTL = 3600  # seconds a thread may stay unused before it leaves memory
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SqliteThreadStore:
+    """SQLite table of serialized thread deltas (the checkpoints, writes and blobs added since the previous row)."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS thread_deltas ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, thread_id TEXT NOT NULL, data BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS thread_deltas_thread_id ON thread_deltas (thread_id, seq)")
+        # Stores written before deltas held one whole thread per row, which is a valid first delta
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'threads'").fetchone():
+            self._conn.execute("INSERT INTO thread_deltas (thread_id, data) SELECT thread_id, data FROM threads")
+            self._conn.execute("DROP TABLE threads")
+        self._conn.commit()
+
+
+    def append(self, thread_id: str, data: bytes) -> int:
+        """Store a delta of a thread. Returns the thread's new version (the delta's sequence number)."""
+        seq = self._conn.execute("INSERT INTO thread_deltas (thread_id, data) VALUES (?, ?)", (thread_id, data)).lastrowid
+        self._conn.commit()
+        return seq
+
+
+    def load(self, thread_id: str) -> tuple[list[bytes], int] | None:
+        """Return a thread's deltas, oldest first, and its version, or None if it is not stored."""
+        rows = self._conn.execute(
+            "SELECT seq, data FROM thread_deltas WHERE thread_id = ? ORDER BY seq", (thread_id,)
+        ).fetchall()
+        return ([data for _, data in rows], rows[-1][0]) if rows else None
+
+
+    def version(self, thread_id: str) -> int | None:
+        return self._conn.execute("SELECT MAX(seq) FROM thread_deltas WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+    def delete(self, thread_id: str) -> None:
+        self._conn.execute("DELETE FROM thread_deltas WHERE thread_id = ?", (thread_id,))
+        self._conn.commit()
+
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(DISTINCT thread_id) FROM thread_deltas").fetchone()[0]
+
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class BoundedCheckpointer(InMemorySaver):
+    """
+    InMemorySaver that keeps at most max_threads threads (LRU) and drops threads idle for idle_ttl.
+
+    With a spill store, threads leaving memory are written to SQLite (msgpack + zlib) and
+    transparently restored on their next access. Only what changed since a thread was last
+    persisted is written, as a delta row, so conversations also survive a restart
+    once close() (or flush()) has persisted the resident threads. With write_through, every
+    checkpoint (and every interrupt or error write) is persisted, and loading a thread's
+    latest checkpoint, which starts each run, picks up a newer version stored by another
+    process, so several processes can share one database. With a spill store the async methods run in a worker thread, so SQLite
+    and compression never block the event loop.
+
+    Idle threads are evicted when threads are read or written; sweep() evicts them
+    without waiting for traffic.
+    """
+
+    def __init__(
+        self,
+        max_threads: int | None = DEFAULT_MAX_THREADS,
+        idle_ttl: float | None = DEFAULT_IDLE_TTL,
+        spill_store: SqliteThreadStore | None = None,
+        write_through: bool = False,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            max_threads: Maximum threads kept in memory (None for no limit)
+            idle_ttl: Seconds since last use after which a thread leaves memory (None to keep)
+            spill_store: Where threads leaving memory are persisted (None to discard them)
+            write_through: Persist threads at every checkpoint and reload them at the start
+                of a run when another process has stored a newer version (requires spill_store)
+            **kwargs: Passed to InMemorySaver (serde)
+        """
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        self.spill_store = spill_store
+        self.write_through = write_through and spill_store is not None
+        self._last_access: OrderedDict[str, float] = OrderedDict()  # thread_id -> monotonic time, LRU first
+        self._blob_keys: dict[str, set[tuple]] = defaultdict(set)
+        self._write_keys: dict[str, set[tuple]] = defaultdict(set)
+        self._dirty: set[str] = set()  # threads changed since they were last persisted
+        # Items added since the thread was last persisted: the next delta
+        self._unsaved_checkpoints: dict[str, set[tuple]] = defaultdict(set)  # (checkpoint_ns, checkpoint_id)
+        self._unsaved_writes: dict[str, set[tuple]] = defaultdict(set)  # (writes key, (task_id, idx))
+        self._unsaved_blobs: dict[str, set[tuple]] = defaultdict(set)  # blobs key
+        self._versions: dict[str, int] = {}  # thread_id -> stored version the memory copy reflects
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.expirations = 0
+        self.spills = 0
+        self.restores = 0
+
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            # A run starts by loading the thread: the point to pick up another process's writes
+            self._touch(thread_id, check_version=True)
+            self._enforce_limits(keep=thread_id)
+            return super().get_tuple(config)
+
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config and (thread_id := config["configurable"].get("thread_id")):
+                self._touch(thread_id, check_version=True)
+            # Materialize while holding the lock; eviction must not mutate storage mid-iteration
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+        yield from items
+
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            self._touch(thread_id)
+            result = super().put(config, checkpoint, metadata, new_versions)
+            blob_keys = {(thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()}
+            self._blob_keys[thread_id].update(blob_keys)
+            self._unsaved_blobs[thread_id].update(blob_keys)
+            self._unsaved_checkpoints[thread_id].add((checkpoint_ns, checkpoint["id"]))
+            self._dirty.add(thread_id)
+            if self.write_through:
+                self._spill(thread_id)
+            self._enforce_limits(keep=thread_id)
+            return result
+
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._touch(thread_id)
+            super().put_writes(config, writes, task_id, task_path)
+            outer_key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+            self._write_keys[thread_id].add(outer_key)
+            self._unsaved_writes[thread_id].update(
+                (outer_key, (task_id, WRITES_IDX_MAP.get(channel, idx))) for idx, (channel, _) in enumerate(writes)
+            )
+            self._dirty.add(thread_id)
+            # Ordinary task writes are folded into the next checkpoint; interrupts and errors
+            # may be the last write of a run, so another process must see them now
+            if self.write_through and any(channel in WRITES_IDX_MAP for channel, _ in writes):
+                self._spill(thread_id)
+
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop(thread_id)
+            self._last_access.pop(thread_id, None)
+            if self.spill_store is not None:
+                self.spill_store.delete(thread_id)
+
+
+    async def _offload(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # Only the spill store does blocking work (SQLite, msgpack + zlib); memory-only calls stay inline
+        if self.spill_store is None:
+            return func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await self._offload(self.get_tuple, config)
+
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await self._offload(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await self._offload(self.put, config, checkpoint, metadata, new_versions)
+
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._offload(self.put_writes, config, writes, task_id, task_path)
+
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._offload(self.delete_thread, thread_id)
+
+
+    def _touch(self, thread_id: str, check_version: bool = False) -> None:
+        if check_version and self.write_through and thread_id in self._last_access:
+            # Another process may have written this thread since we last saw it
+            if self.spill_store.version(thread_id) != self._versions.get(thread_id):
+                self._drop(thread_id)
+                del self._last_access[thread_id]
+        if thread_id not in self._last_access and self.spill_store is not None:
+            self._restore(thread_id)
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+
+    def _enforce_limits(self, keep: str | None = None) -> None:
+        now = time.monotonic()
+        for thread_id, last_access in list(self._last_access.items()):
+            if thread_id == keep:
+                continue
+            if self.idle_ttl is not None and now - last_access > self.idle_ttl:
+                self._evict(thread_id)
+                self.expirations += 1
+            elif self.max_threads is not None and len(self._last_access) > self.max_threads:
+                self._evict(thread_id)
+                self.evictions += 1
+            else:
+                # Oldest first: once a thread is neither idle nor over the cap, the rest are not either
+                break
+
+
+    def sweep(self) -> None:
+        """Evict idle threads now (they are otherwise evicted when another thread is read or written)."""
+        with self._lock:
+            self._enforce_limits()
+
+
+    def _evict(self, thread_id: str) -> None:
+        if self.spill_store is not None and thread_id in self._dirty:
+            self._spill(thread_id)
+        self._drop(thread_id)
+        del self._last_access[thread_id]
+
+
+    def _drop(self, thread_id: str) -> None:
+        self.storage.pop(thread_id, None)
+        for key in self._write_keys.pop(thread_id, ()):
+            self.writes.pop(key, None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        self._dirty.discard(thread_id)
+        self._unsaved_checkpoints.pop(thread_id, None)
+        self._unsaved_writes.pop(thread_id, None)
+        self._unsaved_blobs.pop(thread_id, None)
+        self._versions.pop(thread_id, None)
+
+
+    def _spill(self, thread_id: str) -> None:
+        saved = self.storage.get(thread_id, {})
+        checkpoints = []
+        for checkpoint_ns, checkpoint_id in self._unsaved_checkpoints.pop(thread_id, ()):
+            if (stored := saved.get(checkpoint_ns, {}).get(checkpoint_id)) is not None:
+                checkpoint, metadata, parent_id = stored
+                checkpoints.append([checkpoint_ns, checkpoint_id, *checkpoint, *metadata, parent_id])
+        writes = []
+        for outer_key, inner_key in self._unsaved_writes.pop(thread_id, ()):
+            if (write := self.writes.get(outer_key, {}).get(inner_key)) is not None:
+                task_id, channel, value, task_path = write
+                _, checkpoint_ns, checkpoint_id = outer_key
+                writes.append([checkpoint_ns, checkpoint_id, task_id, inner_key[1], channel, *value, task_path])
+        blobs = [
+            [*key[1:], *self.blobs[key]]  # checkpoint_ns, channel, version, type, bytes
+            for key in self._unsaved_blobs.pop(thread_id, ())
+            if key in self.blobs
+        ]
+        data = zlib.compress(ormsgpack.packb([checkpoints, writes, blobs]))
+        self._versions[thread_id] = self.spill_store.append(thread_id, data)
+        self._dirty.discard(thread_id)
+        self.spills += 1
+
+
+    def _restore(self, thread_id: str) -> None:
+        stored = self.spill_store.load(thread_id)
+        if stored is None:
+            return
+
+        deltas, self._versions[thread_id] = stored
+        for data in deltas:
+            checkpoints, writes, blobs = ormsgpack.unpackb(zlib.decompress(data))
+            for checkpoint_ns, checkpoint_id, c_type, c_bytes, m_type, m_bytes, parent_id in checkpoints:
+                self.storage[thread_id][checkpoint_ns][checkpoint_id] = ((c_type, c_bytes), (m_type, m_bytes), parent_id)
+            for checkpoint_ns, checkpoint_id, task_id, idx, channel, v_type, v_bytes, task_path in writes:
+                outer_key = (thread_id, checkpoint_ns, checkpoint_id)
+                self.writes[outer_key][(task_id, idx)] = (task_id, channel, (v_type, v_bytes), task_path)
+                self._write_keys[thread_id].add(outer_key)
+            for checkpoint_ns, channel, version, b_type, b_bytes in blobs:
+                key = (thread_id, checkpoint_ns, channel, version)
+                self.blobs[key] = (b_type, b_bytes)
+                self._blob_keys[thread_id].add(key)
+        self.restores += 1
+
+
+    def flush(self) -> None:
+        """Persist every resident thread changed since it was last persisted."""
+        if self.spill_store is None:
+            return
+        with self._lock:
+            for thread_id in list(self._dirty):
+                self._spill(thread_id)
+
+
+    def close(self) -> None:
+        """Flush resident threads and close the spill store."""
+        if self.spill_store is None:
+            return
+        with self._lock:
+            self.flush()
+            self.spill_store.close()
+            self.spill_store = None
+
+
+    def stats(self) -> dict[str, Any]:
+        """Return eviction/spill counters and the number of resident and persisted threads."""
+        with self._lock:
+            return {
+                "resident_threads": len(self._last_access),
+                "persisted_threads": self.spill_store.count() if self.spill_store is not None else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "spills": self.spills,
+                "restores": self.restores,
+            }
+
+
+def create_checkpointer(db_path: str | None = None, write_through: bool = False) -> BoundedCheckpointer:
+    """
+    Build a checkpointer from the environment.
+
+    CHECKPOINT_MAX_THREADS (default 1000) and CHECKPOINT_IDLE_TTL (seconds, default 3600)
+    bound memory use; 0 disables the respective limit. CHECKPOINT_DB_PATH enables the SQLite
+    spill store so evicted threads are kept on disk and survive restarts.
+
+    Args:
+        db_path: SQLite database to use instead of CHECKPOINT_DB_PATH
+        write_through: Persist every checkpoint (for processes sharing db_path)
+
+    Returns:
+        BoundedCheckpointer: The configured checkpointer
+    """
+    max_threads = int(os.getenv("CHECKPOINT_MAX_THREADS", str(DEFAULT_MAX_THREADS)))
+    idle_ttl = float(os.getenv("CHECKPOINT_IDLE_TTL", str(DEFAULT_IDLE_TTL)))
+    db_path = db_path or os.getenv("CHECKPOINT_DB_PATH")
+    if db_path:
+        logger.info(f"Persisting checkpoints to {db_path}")
+    return BoundedCheckpointer(
+        max_threads=max_threads or None,
+        idle_ttl=idle_ttl or None,
+        spill_store=SqliteThreadStore(db_path) if db_path else None,
+        write_through=write_through,
+    )
@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+# Identifiers that differ between otherwise identical runs (tasks, contexts, tool calls)
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+_ID_KEYS = {"id", "tool_call_id", "toolUseId", "taskId", "task_id", "contextId", "context_id", "messageId", "message_id"}
+
+
+@dataclass(frozen=True)
+class Latency:
+    """
+    Distribution of model call latencies in seconds.
+
+    Parsed from "0.5" (constant), "uniform:0.2,0.8" (low, high) or
+    "lognormal:0.8,0.5" (median, sigma; long right tail like real LLM calls).
+    """
+
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+
+    @classmethod
+    def parse(cls, spec: "str | float | Latency") -> "Latency":
+        if isinstance(spec, Latency):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls(a=float(spec))
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls(a=float(kind))
+        values = [float(value) for value in params.split(",")]
+        if kind not in {"uniform", "lognormal"} or len(values) != 2:
+            raise ValueError(f"Unknown latency {spec!r}: use '0.5', 'uniform:LOW,HIGH' or 'lognormal:MEDIAN,SIGMA'")
+        return cls(kind, *values)
+
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        return self.a
+
+
+def script_step(script: list[dict[str, Any]], step_index: int, user_text: str, last_text: str) -> dict[str, Any]:
+    """
+    Pick and fill in the script step for a model call.
+
+    Args:
+        script: Tool call ({"tool": name, "args": {...}}) and answer ({"text": "..."}) steps
+        step_index: Number of model replies since the latest user message
+        user_text: The latest user message, substituted for "{input}"
+        last_text: Content of the last message (e.g. the tool result), substituted for "{last}"
+
+    Returns:
+        dict: {"tool": name, "args": {...}} or {"text": "..."}; after the script, {"text": last_text}
+    """
+    values = {"{input}": user_text, "{last}": last_text}
+
+    def fill(value: Any) -> Any:
+        if isinstance(value, str):
+            for placeholder, text in values.items():
+                value = value.replace(placeholder, text)
+            return value
+        if isinstance(value, dict):
+            return {key: fill(item) for key, item in value.items()}
+        return value
+
+    step = script[step_index] if step_index < len(script) else {"text": "{last}"}
+    if "tool" in step:
+        return {"tool": step["tool"], "args": fill(step.get("args", {}))}
+    return {"text": fill(step.get("text", "{last}"))}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic chat model that replays a script, for load tests and offline runs.
+
+    Each step is either a tool call ({"tool": name, "args": {...}}) or an answer
+    ({"text": "..."}). The step is chosen by how many model replies follow the latest
+    user message, so every turn of a conversation replays the script from the start.
+    In strings, "{input}" is replaced by the latest user message and "{last}" by the
+    content of the last message (e.g. the tool result). After the script, the model
+    answers with "{last}".
+    """
+
+    script: list[dict[str, Any]] = []
+    latency: float | str = 0.0  # seconds per call, or a distribution (see Latency)
+    seed: int | None = None  # seed of the latency samples
+
+    _rng: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"script": self.script, "latency": self.latency}
+
+    def bind_tools(self, tools, **kwargs):
+        # Tool calls come from the script, so there is nothing to bind
+        return self
+
+    def _delay(self) -> float:
+        return Latency.parse(self.latency).sample(self._rng)
+
+    def _reply(self, messages: list[BaseMessage]) -> AIMessage:
+        turn_start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1) + 1
+        step_index = sum(isinstance(m, AIMessage) for m in messages[turn_start:])
+        step = script_step(
+            self.script,
+            step_index,
+            user_text=messages[turn_start - 1].text if turn_start else "",
+            last_text=messages[-1].text if messages else "",
+        )
+        if "tool" in step:
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": step["tool"], "args": step["args"], "id": f"call_{step_index}"}],
+            )
+        return AIMessage(content=step["text"])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+class ResponseRecording:
+    """
+    Model responses recorded from live runs, keyed by the prompt, in a JSON-lines file.
+
+    Ids that change between runs (UUIDs, tool call ids) are left out of the key, so a
+    replayed conversation finds the responses recorded for the same conversation.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the recording.
+
+        Args:
+            path: JSON-lines file; one {"key", "response", "latency"} entry per model call
+        """
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+
+    @staticmethod
+    def key(prompt: Any) -> str:
+        def strip(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {k: strip(v) for k, v in value.items() if k not in _ID_KEYS}
+            if isinstance(value, list):
+                return [strip(item) for item in value]
+            if isinstance(value, str):
+                return _UUID.sub("<id>", value)
+            return value
+
+        data = json.dumps(strip(prompt), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._entries.get(key)
+
+
+    def add(self, key: str, response: Any, latency: float) -> None:
+        entry = {"key": key, "response": response, "latency": round(latency, 6)}
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RecordedChatModel(BaseChatModel):
+    """
+    Chat model that records the responses of a live model, or replays them offline.
+
+    With `inner` set, every call goes to the inner model and its response and latency
+    are added to the recording. Without it, responses come from the recording after
+    the recorded latency (or one sampled from `latency`); a prompt that was never
+    recorded raises LookupError.
+    """
+
+    recording: Any  # ResponseRecording
+    inner: Any = None  # live chat model (or one with tools bound) to record from
+    latency: float | str | None = None  # overrides the recorded latencies (see Latency)
+    seed: int | None = None
+
+    _rng: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "recorded"
+
+    def bind_tools(self, tools, **kwargs):
+        if self.inner is None:
+            return self
+        return self.model_copy(update={"inner": self.inner.bind_tools(tools, **kwargs)})
+
+    def _key(self, messages: list[BaseMessage]) -> str:
+        return self.recording.key([
+            {"type": m.type, "content": m.content, "tool_calls": getattr(m, "tool_calls", None) or []}
+            for m in messages
+        ])
+
+    def _replay(self, key: str) -> tuple[AIMessage, float]:
+        entry = self.recording.get(key)
+        if entry is None:
+            raise LookupError(
+                f"No recorded response for this prompt in {self.recording.path}; record it with MODEL_BACKEND=record"
+            )
+        delay = entry["latency"] if self.latency is None else Latency.parse(self.latency).sample(self._rng)
+        return messages_from_dict([entry["response"]])[0], delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages)
+        if self.inner is not None:
+            start = time.perf_counter()
+            message = self.inner.invoke(messages, stop=stop)
+            self.recording.add(key, message_to_dict(message), time.perf_counter() - start)
+        else:
+            message, delay = self._replay(key)
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages)
+        if self.inner is not None:
+            start = time.perf_counter()
+            message = await self.inner.ainvoke(messages, stop=stop)
+            self.recording.add(key, message_to_dict(message), time.perf_counter() - start)
+        else:
+            message, delay = self._replay(key)
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
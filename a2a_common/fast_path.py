@@ -0,0 +1,202 @@
+import logging
+import os
+import re
+import unicodedata
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from langchain.agents.middleware import AgentMiddleware, AgentState, hook_config
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import BaseTool
+from langgraph.runtime import Runtime
+
+# Building blocks for route patterns (matched case-insensitively against NFKC-normalized text)
+QUESTION_PREFIX = r"(?:(?:what(?:'s| is)|how(?:'s| is)|tell me|show me) )?(?:the )?(?:current )?"
+# Time words and conjunctions end an argument: "Paris and London" or "Paris tomorrow" is not a city
+_TIME_WORDS = r"(?:today|tonight|tomorrow|yesterday|now|right now|(?:last|next|this|coming) \w+)"
+_JA_TIME_WORDS = r"(?:今日|今夜|今晩|今朝|明日|あした|明後日|昨日|きのう|一昨日|(?:今|先|来|再来)(?:週|月)|今年|去年|昨年|来年|週末)"
+# Pronouns, prepositions, articles and units: "my city", "Tokyo in fahrenheit please" are not cities
+_NOT_CITY_WORDS = (
+    r"(?:and|or|in|at|on|for|of|to|from|with|by|please|thanks|the|a|an|my|your|our|his|her|their|its"
+    r"|this|that|these|those|here|there|where|what|which|me|us|it|you|i|we|they|current|local|fahrenheit|celsius)"
+)
+# One to four words, none of them a conjunction, time word or any of the words above
+_NOT_IN_CITY = rf"(?!(?:{_NOT_CITY_WORDS}|{_TIME_WORDS})\b)"
+CITY_NAME = rf"(?P<city_name>{_NOT_IN_CITY}[^\W\d_]+(?:[ '-]{_NOT_IN_CITY}[^\W\d_]+){{0,3}})"
+JA_CITY_NAME = rf"(?P<city_name>(?:(?!{_JA_TIME_WORDS})[^\s\dの、。?!とや]){{1,10}})"
+SENTENCE_END = r"(?:\s*[?.!。]+|\s*$)"
+
+# The tools answer for the present; questions about another time go to the model
+_NOT_PRESENT = re.compile(
+    r"\b(?:was|were|did|had|will|would|going to|gonna|yesterday|tomorrow|(?:last|next) \w+)\b"
+    r"|でした|だった|かった|昨日|きのう|一昨日|明日|あした|明後日|(?:先|来|再来)(?:週|月)|去年|昨年|来年",
+    re.IGNORECASE,
+)
+# Checked on every captured argument, whatever pattern captured it
+_NOT_IN_ARGUMENT = re.compile(rf"\b(?:{_NOT_CITY_WORDS}|{_TIME_WORDS})\b|{_JA_TIME_WORDS}|[とや、]", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).strip()
+
+
+@dataclass
+class FastPathRoute:
+    """
+    A request shape that can be answered by calling one tool directly.
+
+    Each pattern captures the tool's arguments as named groups. Only a message matched by
+    a pattern in full is a hit: anything around the match (a second question, "in
+    fahrenheit", a greeting) may change what is asked, so such messages go to the model.
+    Messages about another time than now, and arguments that contain a time word,
+    conjunction or pronoun, never match.
+    """
+
+    tool: BaseTool
+    patterns: Sequence[str]
+    parsers: dict[str, Callable[[str], Any]] = field(default_factory=dict)  # argument -> value parser
+
+    def __post_init__(self):
+        self._patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+
+
+    def match(self, text: str) -> dict[str, Any] | None:
+        """
+        Match a (normalized) message.
+
+        Args:
+            text: The user's message
+
+        Returns:
+            dict | None: The tool arguments, or None
+        """
+        if _NOT_PRESENT.search(text):
+            return None
+
+        for pattern in self._patterns:
+            match = pattern.fullmatch(text)
+            if match is None:
+                continue
+            captured = {name: value for name, value in match.groupdict().items() if value is not None}
+            if any(_NOT_IN_ARGUMENT.search(value) for value in captured.values()):
+                continue
+            try:
+                return {name: self.parsers.get(name, str.strip)(value) for name, value in captured.items()}
+            except ValueError:
+                continue
+        return None
+
+
+class FastPathMiddleware(AgentMiddleware):
+    """
+    Answer requests that clearly map to a tool call without calling the model.
+
+    The tool is called with the arguments extracted from the request and its result is
+    the answer. The tool call and result are still recorded in the conversation, so later
+    turns that do go to the model see them. Requests no route matches go to the model.
+    """
+
+    def __init__(self, routes: Sequence[FastPathRoute]):
+        """
+        Args:
+            routes: Request shapes to answer directly, tried in order
+        """
+        super().__init__()
+        self.routes = list(routes)
+        self.hits = 0
+        self.misses = 0
+
+
+    def _route(self, state: AgentState) -> tuple[FastPathRoute, dict[str, Any]] | None:
+        if not state["messages"]:
+            return None
+
+        last_message = state["messages"][-1]
+        if not isinstance(last_message, HumanMessage) or not isinstance(last_message.content, str):
+            return None
+
+        text = _normalize(last_message.content)
+        for route in self.routes:
+            args = route.match(text)
+            if args is not None:
+                self.hits += 1
+                logger.debug(f"Fast path: {route.tool.name}({args})")
+                return route, args
+
+        self.misses += 1
+        return None
+
+
+    @staticmethod
+    def _answer(route: FastPathRoute, args: dict[str, Any], result: Any) -> dict[str, Any]:
+        call_id = f"fast_path_{uuid4().hex}"
+        content = result if isinstance(result, str) else str(result)
+        return {
+            "messages": [
+                AIMessage(content="", tool_calls=[{"name": route.tool.name, "args": args, "id": call_id}]),
+                ToolMessage(content=content, name=route.tool.name, tool_call_id=call_id),
+                AIMessage(content=content),
+            ],
+            "jump_to": "end",
+        }
+
+
+    @hook_config(can_jump_to=["end"])
+    def before_agent(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        routed = self._route(state)
+        if routed is None:
+            return None
+        route, args = routed
+        try:
+            result = route.tool.invoke(args)
+        except Exception as e:
+            logger.warning(f"Fast path call to {route.tool.name} failed, falling back to the model: {e}")
+            return None
+        return self._answer(route, args, result)
+
+
+    @hook_config(can_jump_to=["end"])
+    async def abefore_agent(self, state: AgentState, runtime: Runtime) -> dict[str, Any] | None:
+        routed = self._route(state)
+        if routed is None:
+            return None
+        route, args = routed
+        try:
+            result = await route.tool.ainvoke(args)
+        except Exception as e:
+            logger.warning(f"Fast path call to {route.tool.name} failed, falling back to the model: {e}")
+            return None
+        return self._answer(route, args, result)
+
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return routing counters.
+
+        Returns:
+            dict: hits (answered without the model), misses and hit_rate
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+
+def create_fast_path(routes: Sequence[FastPathRoute]) -> list[AgentMiddleware]:
+    """
+    Build the fast path middleware list for create_agent(middleware=...) from the environment.
+
+    FAST_PATH=true enables it (off by default, since direct answers are the raw tool
+    result rather than model-written text).
+
+    Args:
+        routes: Request shapes to answer directly
+
+    Returns:
+        list[AgentMiddleware]: [FastPathMiddleware] if enabled, else []
+    """
+    if os.getenv("FAST_PATH", "false").lower() != "true":
+        return []
+    return [FastPathMiddleware(routes)]
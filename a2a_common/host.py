@@ -0,0 +1,78 @@
+import logging
+import os
+from collections.abc import Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from .app_factory import AgentSpec, build_app
+from .model_backend import create_chat_model
+from .push_sender import DEFAULT_WEBHOOK_TIMEOUT
+from .tracing import setup_tracing
+
+DEFAULT_HOST_PORT = 8000
+DEFAULT_HOST_PUBLIC_HOST = "127.0.0.1"
+
+logger = logging.getLogger(__name__)
+
+
+def build_host_app(specs: Sequence[AgentSpec]) -> Starlette:
+    """
+    Mount several agents in one ASGI application, each under /<spec.name>/.
+
+    The agents share the process, its event loop, one HTTP client for push notifications
+    and one chat model (with its connection pool) per distinct live spec.model; each keeps its
+    own state, limits and agent card, whose URL is http://PUBLIC_HOST:PORT/<spec.name>/.
+    GET / lists the mounted agents.
+
+    Args:
+        specs: The agents to serve (names must be unique)
+
+    Returns:
+        Starlette: The host application
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Agent names must be unique: {names}")
+
+    public_host = os.getenv("PUBLIC_HOST", DEFAULT_HOST_PUBLIC_HOST)
+    port = int(os.getenv("PORT", str(DEFAULT_HOST_PORT)))
+    setup_tracing("agent_host")  # before the agents, so the spans are named after the host process
+    httpx_client = httpx.AsyncClient(timeout=DEFAULT_WEBHOOK_TIMEOUT)
+    models: dict[str, BaseChatModel] = {}
+    agent_apps: list[Starlette] = []
+    agent_urls: dict[str, str] = {}
+    for spec in specs:
+        model = create_chat_model(spec.model, spec.name, spec.script)
+        if isinstance(model, str):
+            # Live models are shared; offline stand-ins are per agent (each has its own script)
+            if model not in models:
+                models[model] = init_chat_model(model)
+            model = models[model]
+        agent_urls[spec.name] = f'http://{public_host}:{port}/{spec.name}/'
+        agent_apps.append(
+            build_app(spec, url=agent_urls[spec.name], model=model, httpx_client=httpx_client)
+        )
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        # Mounted applications do not get lifespan events of their own
+        async with AsyncExitStack() as stack:
+            for agent_app in agent_apps:
+                await stack.enter_async_context(agent_app.router.lifespan_context(agent_app))
+            logger.info(f"Hosting {', '.join(names)} (pid {os.getpid()})")
+            yield
+        await httpx_client.aclose()
+
+    async def index(request: Request) -> JSONResponse:
+        return JSONResponse({"agents": agent_urls})
+
+    routes = [Route("/", index, methods=["GET"])]
+    routes.extend(Mount(f"/{spec.name}", app=agent_app) for spec, agent_app in zip(specs, agent_apps))
+    return Starlette(routes=routes, lifespan=lifespan)
@@ -0,0 +1,18 @@
+import math
+from collections.abc import Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order
+        q: Quantile between 0 and 1, e.g. 0.99
+
+    Returns:
+        float: The smallest value with at least q of the values at or below it (0.0 when empty)
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(max(math.ceil(q * len(sorted_values)) - 1, 0), len(sorted_values) - 1)]
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+
+from .fake_model import Latency, RecordedChatModel, ResponseRecording, ScriptedChatModel
+
+MODEL_BACKENDS = ("live", "scripted", "record", "replay")
+DEFAULT_MODEL_BACKEND = "live"
+DEFAULT_RECORDING_PATH = "model_recording.jsonl"
+DEFAULT_SCRIPTED_LATENCY = "lognormal:0.8,0.5"  # median 0.8 s with a long tail, roughly a small hosted model
+
+logger = logging.getLogger(__name__)
+
+# One recording per file, shared by all agents of the process
+_recordings: dict[str, ResponseRecording] = {}
+
+
+def model_backend() -> str:
+    """
+    Return the model backend selected by MODEL_BACKEND.
+
+    - live: the configured model (default)
+    - scripted: a ScriptedChatModel replaying the agent's script, no network access
+    - record: the configured model, with every response written to MODEL_RECORDING_PATH
+    - replay: the responses of MODEL_RECORDING_PATH, no network access
+    """
+    backend = os.getenv("MODEL_BACKEND", DEFAULT_MODEL_BACKEND).lower()
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown MODEL_BACKEND {backend!r} (use one of {', '.join(MODEL_BACKENDS)})")
+    return backend
+
+
+def _recording() -> ResponseRecording:
+    path = os.getenv("MODEL_RECORDING_PATH", DEFAULT_RECORDING_PATH)
+    if path not in _recordings:
+        _recordings[path] = ResponseRecording(path)
+        logger.info(f"Model recording {path}: {len(_recordings[path])} responses")
+    return _recordings[path]
+
+
+def _script(name: str, default: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    # MODEL_SCRIPT_PATH: JSON object of agent name -> steps, overriding the agents' own scripts
+    path = os.getenv("MODEL_SCRIPT_PATH")
+    if path:
+        with open(path, encoding="utf-8") as file:
+            scripts = json.load(file)
+        if name in scripts:
+            return scripts[name]
+    return default or []
+
+
+def _latency(default: str | None) -> str | None:
+    latency = os.getenv("MODEL_LATENCY", default)
+    if latency is not None:
+        Latency.parse(latency)  # fail on startup rather than on the first call
+    return latency
+
+
+def _seed() -> int | None:
+    seed = os.getenv("MODEL_SEED")
+    return int(seed) if seed else None
+
+
+def create_chat_model(
+    model: str,
+    name: str,
+    script: list[dict[str, Any]] | None = None,
+) -> str | BaseChatModel:
+    """
+    Select the chat model of a LangGraph agent according to MODEL_BACKEND.
+
+    MODEL_LATENCY sets the latency distribution of offline models (see Latency):
+    scripted models default to DEFAULT_SCRIPTED_LATENCY, replayed ones to the
+    recorded latencies. MODEL_SEED makes the samples reproducible.
+
+    Args:
+        model: The live model, e.g. "openai:gpt-4.1-nano"
+        name: Agent name, used to look up its script in MODEL_SCRIPT_PATH
+        script: Steps of the scripted model when MODEL_SCRIPT_PATH has none for this agent
+
+    Returns:
+        str | BaseChatModel: The model string itself for the live backend, otherwise a chat model
+    """
+    backend = model_backend()
+    if backend == "live":
+        return model
+    if backend == "scripted":
+        return ScriptedChatModel(
+            script=_script(name, script),
+            latency=_latency(DEFAULT_SCRIPTED_LATENCY),
+            seed=_seed(),
+        )
+    if backend == "record":
+        return RecordedChatModel(recording=_recording(), inner=init_chat_model(model))
+    return RecordedChatModel(recording=_recording(), latency=_latency(None), seed=_seed())
+
+
+def create_strands_model(
+    name: str,
+    live: Callable[[], Any],
+    script: list[dict[str, Any]] | None = None,
+):
+    """
+    Select the model of a Strands agent according to MODEL_BACKEND (see create_chat_model).
+
+    Args:
+        name: Agent name, used to look up its script in MODEL_SCRIPT_PATH
+        live: Builds the live model, e.g. OpenAIModel(...); not called when running offline
+        script: Steps of the scripted model when MODEL_SCRIPT_PATH has none for this agent
+
+    Returns:
+        strands.models.Model: The selected model
+    """
+    # Imported here so LangGraph-only deployments do not need Strands
+    from .strands_models import RecordedStrandsModel, ScriptedStrandsModel
+
+    backend = model_backend()
+    if backend == "live":
+        return live()
+    if backend == "scripted":
+        return ScriptedStrandsModel(
+            script=_script(name, script),
+            latency=_latency(DEFAULT_SCRIPTED_LATENCY),
+            seed=_seed(),
+        )
+    if backend == "record":
+        return RecordedStrandsModel(recording=_recording(), inner=live())
+    return RecordedStrandsModel(recording=_recording(), latency=_latency(None), seed=_seed())
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+import httpx
+from a2a.server.tasks import PushNotificationConfigStore, PushNotificationSender
+from a2a.types import PushNotificationConfig, Task
+
+from .metrics import percentile
+from .task_store import TERMINAL_STATES
+
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_DELIVERY_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_BASE = 0.5  # seconds; doubled per attempt, with full jitter
+DEFAULT_BACKOFF_MAX = 10.0
+DEFAULT_WEBHOOK_TIMEOUT = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """Latest undelivered snapshot of one task."""
+
+    __slots__ = ("payload", "terminal", "enqueued_at")
+
+    def __init__(self, payload: dict[str, Any], terminal: bool, enqueued_at: float):
+        self.payload = payload
+        self.terminal = terminal
+        self.enqueued_at = enqueued_at
+
+
+class QueuedPushNotificationSender(PushNotificationSender):
+    """
+    PushNotificationSender that delivers from a background queue instead of inline.
+
+    Tasks without a push notification config are skipped before anything is copied or queued.
+    Each task has at most one pending notification: a newer snapshot replaces an
+    undelivered older one (the webhook always receives the full, latest task). A task's
+    notifications are delivered in order, one at a time, over a shared pooled client,
+    and failed deliveries are retried with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        config_store: PushNotificationConfigStore,
+        httpx_client: httpx.AsyncClient | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        workers: int = DEFAULT_DELIVERY_WORKERS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        window: int = 1000,
+    ):
+        """
+        Initialize the sender.
+
+        Args:
+            config_store: Where the push notification configs of tasks are stored
+            httpx_client: Client for webhook requests (defaults to an owned pooled client)
+            max_pending: Maximum tasks with an undelivered notification. When full, the oldest
+                non-final notification is dropped; final ones make the caller wait for room.
+            workers: Concurrent deliveries
+            max_attempts: Delivery attempts per notification and webhook
+            backoff_base: Initial retry delay in seconds
+            backoff_max: Maximum retry delay in seconds
+            window: Number of recent deliveries kept for the latency percentiles
+        """
+        self._config_store = config_store
+        self._owns_client = httpx_client is None
+        self._client = httpx_client or httpx.AsyncClient(
+            timeout=DEFAULT_WEBHOOK_TIMEOUT,
+            limits=httpx.Limits(max_connections=workers * 2, max_keepalive_connections=workers * 2),
+        )
+        self.max_pending = max_pending
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._pending: OrderedDict[str, _Pending] = OrderedDict()  # task id -> latest snapshot, oldest first
+        self._in_flight: set[str] = set()
+        self._changed = asyncio.Condition()
+        self._worker_tasks: list[asyncio.Task] = []
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.skipped = 0
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+
+
+    async def send_notification(self, task: Task) -> None:
+        """Queue the task's current state for delivery and return without waiting for it."""
+        # Most tasks have no webhook; do not pay for a snapshot and a queue slot for them
+        if not await self._config_store.get_info(task.id):
+            self.skipped += 1
+            return
+
+        self._ensure_workers()
+        # Tasks are mutated in place after this call, so snapshot them now
+        pending = _Pending(
+            task.model_dump(mode='json', exclude_none=True),
+            task.status.state in TERMINAL_STATES,
+            time.monotonic(),
+        )
+        async with self._changed:
+            if task.id in self._pending:
+                # Superseded before it was sent; keep the original enqueue time for latency
+                pending.enqueued_at = self._pending[task.id].enqueued_at
+                self._pending[task.id] = pending
+                self.coalesced += 1
+                return
+
+            while len(self._pending) >= self.max_pending:
+                victim = next((task_id for task_id, item in self._pending.items() if not item.terminal), None)
+                if victim is None:
+                    await self._changed.wait()
+                    continue
+                del self._pending[victim]
+                self.dropped += 1
+
+            self._pending[task.id] = pending
+            self.enqueued += 1
+            self._changed.notify_all()
+
+
+    def _ensure_workers(self) -> None:
+        if not self._worker_tasks:
+            self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+
+    async def _work(self) -> None:
+        while True:
+            async with self._changed:
+                task_id = None
+                while task_id is None:
+                    task_id = next((task_id for task_id in self._pending if task_id not in self._in_flight), None)
+                    if task_id is None:
+                        await self._changed.wait()
+                pending = self._pending.pop(task_id)
+                self._in_flight.add(task_id)
+                self._changed.notify_all()  # room for waiting senders
+
+            try:
+                await self._deliver(task_id, pending)
+            except Exception:
+                logger.exception(f'Unexpected error delivering push notification for task_id={task_id}')
+            finally:
+                async with self._changed:
+                    self._in_flight.discard(task_id)
+                    self._changed.notify_all()  # a newer snapshot of this task may be waiting
+
+
+    async def _deliver(self, task_id: str, pending: _Pending) -> None:
+        push_configs = await self._config_store.get_info(task_id)
+        if not push_configs:
+            return
+
+        results = await asyncio.gather(*(self._post(push_info, pending.payload) for push_info in push_configs))
+        if all(results):
+            self.delivered += 1
+            self._latencies.append(time.monotonic() - pending.enqueued_at)
+        else:
+            self.failed += 1
+            logger.warning(f'Some push notifications failed to send for task_id={task_id}')
+
+
+    async def _post(self, push_info: PushNotificationConfig, payload: dict[str, Any]) -> bool:
+        headers = {'X-A2A-Notification-Token': push_info.token} if push_info.token else None
+        for attempt in range(self.max_attempts):
+            try:
+                response = await self._client.post(push_info.url, json=payload, headers=headers)
+                if response.status_code < 400:
+                    return True
+                # Client errors other than throttling will not get better by retrying
+                if response.status_code < 500 and response.status_code != 429:
+                    logger.warning(f'Webhook {push_info.url} rejected a push notification: {response.status_code}')
+                    return False
+                error = f'HTTP {response.status_code}'
+            except httpx.HTTPError as e:
+                error = repr(e)
+
+            if attempt + 1 < self.max_attempts:
+                self.retries += 1
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                logger.info(f'Retrying push notification to {push_info.url} in {delay:.2f}s ({error})')
+                await asyncio.sleep(delay)
+
+        logger.warning(f'Giving up on push notification to {push_info.url} after {self.max_attempts} attempts')
+        return False
+
+
+    async def aclose(self, drain_timeout: float = 5.0) -> None:
+        """Deliver what is queued (up to drain_timeout seconds), then stop the workers."""
+        deadline = time.monotonic() + drain_timeout
+        while (self._pending or self._in_flight) and self._worker_tasks and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for worker in self._worker_tasks:
+            worker.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._owns_client:
+            await self._client.aclose()
+
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return delivery metrics.
+
+        Returns:
+            dict: Metrics including:
+                - pending / in_flight: Notifications waiting for and in delivery
+                - skipped: Notifications for tasks without a push notification config
+                - enqueued / coalesced / dropped: Notifications accepted, merged into a
+                  pending newer snapshot, and discarded because the queue was full
+                - delivered / failed / retries: Delivery outcomes and retry attempts
+                - latency_avg / latency_p50 / latency_p99: Seconds from queueing to delivery
+        """
+        latencies = sorted(self._latencies)
+        return {
+            "pending": len(self._pending),
+            "in_flight": len(self._in_flight),
+            "skipped": self.skipped,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retries": self.retries,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p50": percentile(latencies, 0.50),
+            "latency_p99": percentile(latencies, 0.99),
+        }
+
+
+def create_push_sender(
+    config_store: PushNotificationConfigStore,
+    httpx_client: httpx.AsyncClient | None = None,
+) -> QueuedPushNotificationSender:
+    """
+    Build a push sender from the environment.
+
+    PUSH_MAX_PENDING (default 1000), PUSH_WORKERS (default 4) and PUSH_MAX_ATTEMPTS
+    (default 4) size the delivery queue, its concurrency and the retries.
+
+    Args:
+        config_store: Where the push notification configs of tasks are stored
+        httpx_client: Client for webhook requests (defaults to one owned by the sender)
+
+    Returns:
+        QueuedPushNotificationSender: The configured sender
+    """
+    return QueuedPushNotificationSender(
+        config_store=config_store,
+        httpx_client=httpx_client,
+        max_pending=int(os.getenv("PUSH_MAX_PENDING", str(DEFAULT_MAX_PENDING))),
+        workers=int(os.getenv("PUSH_WORKERS", str(DEFAULT_DELIVERY_WORKERS))),
+        max_attempts=int(os.getenv("PUSH_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS))),
+    )
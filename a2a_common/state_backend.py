@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+
+from a2a.server.tasks import (
+    InMemoryPushNotificationConfigStore,
+    PushNotificationConfigStore,
+)
+from a2a.types import PushNotificationConfig
+
+from .checkpointer import BoundedCheckpointer, create_checkpointer
+from .task_store import EvictingTaskStore, create_task_store
+
+DEFAULT_STATE_DB_PATH = "a2a_state.sqlite"
+
+logger = logging.getLogger(__name__)
+
+
+class SqlitePushConfigStore(PushNotificationConfigStore):
+    """Push notification configs in SQLite, so every worker process sees the same webhooks."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS push_configs ("
+            "task_id TEXT NOT NULL, config_id TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (task_id, config_id))"
+        )
+        self._conn.commit()
+        self._lock = asyncio.Lock()
+
+
+    def _execute(self, sql: str, params: tuple) -> list[tuple]:
+        rows = self._conn.execute(sql, params).fetchall()
+        self._conn.commit()
+        return rows
+
+
+    async def set_info(self, task_id: str, notification_config: PushNotificationConfig) -> None:
+        if notification_config.id is None:
+            notification_config.id = task_id
+        async with self._lock:
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT OR REPLACE INTO push_configs (task_id, config_id, data) VALUES (?, ?, ?)",
+                (task_id, notification_config.id, notification_config.model_dump_json(exclude_none=True)),
+            )
+
+
+    async def get_info(self, task_id: str) -> list[PushNotificationConfig]:
+        async with self._lock:
+            rows = await asyncio.to_thread(
+                self._execute, "SELECT data FROM push_configs WHERE task_id = ? ORDER BY rowid", (task_id,)
+            )
+        return [PushNotificationConfig.model_validate_json(row[0]) for row in rows]
+
+
+    async def delete_info(self, task_id: str, config_id: str | None = None) -> None:
+        async with self._lock:
+            await asyncio.to_thread(
+                self._execute,
+                "DELETE FROM push_configs WHERE task_id = ? AND config_id = ?",
+                (task_id, config_id or task_id),
+            )
+
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+@dataclass
+class StateBackend:
+    """Where a remote agent keeps tasks, push notification configs and conversations."""
+
+    task_store: EvictingTaskStore
+    push_config_store: PushNotificationConfigStore
+    checkpointer: BoundedCheckpointer
+    shared: bool  # True if several processes can serve the same agent from this state
+
+
+    async def sweep(self) -> None:
+        """Evict expired tasks and idle conversations, also when no request touches them."""
+        await self.task_store.sweep()
+        # Eviction may spill conversations to SQLite; keep it off the event loop
+        await asyncio.to_thread(self.checkpointer.sweep)
+
+
+    def close(self) -> None:
+        """Persist conversations and close the SQLite connections."""
+        self.checkpointer.close()
+        if self.task_store.table is not None:
+            self.task_store.table.close()
+        if isinstance(self.push_config_store, SqlitePushConfigStore):
+            self.push_config_store.close()
+
+
+def agent_db_path(db_path: str | None, agent_name: str | None) -> str | None:
+    """
+    The SQLite file of one agent: "a2a_state.sqlite" -> "a2a_state.weather_agent.sqlite".
+
+    Args:
+        db_path: The configured database path, or None if none is configured
+        agent_name: The agent whose state goes there, or None for db_path itself
+
+    Returns:
+        str | None: The agent's database path (None without db_path)
+    """
+    if db_path is None or agent_name is None:
+        return db_path
+    root, ext = os.path.splitext(db_path)
+    return f"{root}.{agent_name}{ext}"
+
+
+def create_state_backend(agent_name: str | None = None) -> StateBackend:
+    """
+    Build the state backend selected by A2A_STATE_BACKEND.
+
+    "memory" (default) keeps state per process (see create_task_store/create_checkpointer).
+    "sqlite" writes tasks, push configs and conversations through to the SQLite file
+    A2A_STATE_DB_PATH, so any worker process can serve any task or context. The tables
+    are keyed by task and context id only, so each agent gets files of its own next to
+    A2A_STATE_DB_PATH, TASK_DB_PATH and CHECKPOINT_DB_PATH (see agent_db_path()); agents
+    hosted in one process, or sharing these settings, never see each other's tasks and
+    conversations.
+
+    Args:
+        agent_name: Name of the agent the state belongs to
+
+    Returns:
+        StateBackend: The configured backend
+    """
+    backend = os.getenv("A2A_STATE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return StateBackend(
+            task_store=create_task_store(agent_db_path(os.getenv("TASK_DB_PATH"), agent_name)),
+            push_config_store=InMemoryPushNotificationConfigStore(),
+            checkpointer=create_checkpointer(agent_db_path(os.getenv("CHECKPOINT_DB_PATH"), agent_name)),
+            shared=False,
+        )
+
+    if backend == "sqlite":
+        db_path = agent_db_path(os.getenv("A2A_STATE_DB_PATH", DEFAULT_STATE_DB_PATH), agent_name)
+        logger.info(f"Sharing agent state through {db_path}")
+        return StateBackend(
+            task_store=create_task_store(db_path, write_through=True),
+            push_config_store=SqlitePushConfigStore(db_path),
+            checkpointer=create_checkpointer(db_path, write_through=True),
+            shared=True,
+        )
+
+    raise ValueError(f"Unknown A2A_STATE_BACKEND: {backend} (expected 'memory' or 'sqlite')")
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import random
+import time
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from strands.models import Model
+
+from .fake_model import Latency, ResponseRecording, script_step
+
+
+def _text(message: dict[str, Any]) -> str:
+    parts = []
+    for block in message.get("content", []):
+        if "text" in block:
+            parts.append(block["text"])
+        elif "toolResult" in block:
+            parts.extend(item.get("text", "") or json.dumps(item.get("json", "")) for item in block["toolResult"].get("content", []))
+    return "".join(parts)
+
+
+class ScriptedStrandsModel(Model):
+    """
+    Strands counterpart of ScriptedChatModel: replays a script of tool calls and answers.
+
+    Steps and placeholders are the same as for ScriptedChatModel. structured_output answers
+    with the script's last text step, which must be the JSON of the output model.
+    """
+
+    def __init__(self, script: list[dict[str, Any]], latency: float | str = 0.0, seed: int | None = None):
+        self.config = {"model_id": "scripted", "script": script, "latency": latency}
+        self._rng = random.Random(seed)
+
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+
+    def get_config(self) -> dict[str, Any]:
+        return self.config
+
+
+    def _step(self, messages, step_index: int | None = None) -> tuple[int, dict[str, Any]]:
+        # User messages that only carry tool results continue the turn
+        turn_start = max(
+            (i for i, m in enumerate(messages) if m["role"] == "user" and any("text" in block for block in m["content"])),
+            default=-1,
+        ) + 1
+        if step_index is None:
+            step_index = sum(m["role"] == "assistant" for m in messages[turn_start:])
+        step = script_step(
+            self.config["script"],
+            step_index,
+            user_text=_text(messages[turn_start - 1]) if turn_start else "",
+            last_text=_text(messages[-1]) if messages else "",
+        )
+        return step_index, step
+
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs) -> AsyncGenerator[dict[str, Any], None]:
+        await asyncio.sleep(Latency.parse(self.config["latency"]).sample(self._rng))
+
+        script = self.config["script"]
+        # The answer of the turn; past the script it is "{last}" as in stream()
+        answer_index = max((i for i, step in enumerate(script) if "tool" not in step), default=len(script))
+        _, step = self._step(prompt, answer_index)
+        # Raises pydantic's ValidationError (a ValueError) if the text does not fit output_model
+        yield {"output": output_model.model_validate_json(step["text"])}
+
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncGenerator[dict[str, Any], None]:
+        await asyncio.sleep(Latency.parse(self.config["latency"]).sample(self._rng))
+
+        step_index, step = self._step(messages)
+
+        yield {"messageStart": {"role": "assistant"}}
+        if "tool" in step:
+            yield {"contentBlockStart": {"start": {"toolUse": {"name": step["tool"], "toolUseId": f"tooluse_{step_index}"}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(step["args"])}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+        else:
+            yield {"contentBlockStart": {"start": {}}}
+            yield {"contentBlockDelta": {"delta": {"text": step["text"]}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": {"inputTokens": 0, "outputTokens": 0, "totalTokens": 0}, "metrics": {"latencyMs": 0}}}
+
+
+class RecordedStrandsModel(Model):
+    """
+    Strands counterpart of RecordedChatModel: records the stream events of a live model,
+    or replays them offline. Structured output is recorded as the JSON of the output model.
+    """
+
+    def __init__(
+        self,
+        recording: ResponseRecording,
+        inner: Model | None = None,
+        latency: float | str | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Initialize the model.
+
+        Args:
+            recording: Where responses are recorded and replayed from
+            inner: Live model to record from (None to replay)
+            latency: Overrides the recorded latencies (see Latency)
+            seed: Seed of the latency samples
+        """
+        self.recording = recording
+        self.inner = inner
+        self.latency = latency
+        self._rng = random.Random(seed)
+
+
+    def update_config(self, **model_config: Any) -> None:
+        if self.inner is not None:
+            self.inner.update_config(**model_config)
+
+
+    def get_config(self) -> Any:
+        return self.inner.get_config() if self.inner is not None else {"model_id": "recorded"}
+
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs) -> AsyncGenerator[dict[str, Any], None]:
+        # The output model is part of the key: the same prompt may ask for different shapes
+        key = self.recording.key({"system_prompt": system_prompt, "messages": prompt, "output_model": output_model.__name__})
+        if self.inner is not None:
+            start = time.perf_counter()
+            output = None
+            async for event in self.inner.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs):
+                output = event.get("output", output)
+                yield event
+            if output is not None:
+                self.recording.add(key, {"output": output.model_dump(mode="json")}, time.perf_counter() - start)
+            return
+
+        entry = self.recording.get(key)
+        if entry is None:
+            raise LookupError(
+                f"No recorded structured output for this prompt in {self.recording.path}; record it with MODEL_BACKEND=record"
+            )
+        await asyncio.sleep(entry["latency"] if self.latency is None else Latency.parse(self.latency).sample(self._rng))
+        yield {"output": output_model.model_validate(entry["response"]["output"])}
+
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncGenerator[dict[str, Any], None]:
+        key = self.recording.key({"system_prompt": system_prompt, "messages": messages})
+        if self.inner is not None:
+            start = time.perf_counter()
+            events = []
+            async for event in self.inner.stream(messages, tool_specs, system_prompt, **kwargs):
+                events.append(event)
+                yield event
+            self.recording.add(key, events, time.perf_counter() - start)
+            return
+
+        entry = self.recording.get(key)
+        if entry is None:
+            raise LookupError(
+                f"No recorded response for this prompt in {self.recording.path}; record it with MODEL_BACKEND=record"
+            )
+        await asyncio.sleep(entry["latency"] if self.latency is None else Latency.parse(self.latency).sample(self._rng))
+        for event in entry["response"]:
+            yield event
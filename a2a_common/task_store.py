@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+DEFAULT_MAX_TASKS = 10000
+DEFAULT_TERMINAL_TTL = 600  # seconds a finished task stays in memory
+
+TERMINAL_STATES = frozenset({TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected})
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteTaskTable:
+    """SQLite table of tasks as JSON, indexed by context_id."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the table.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id TEXT PRIMARY KEY, context_id TEXT NOT NULL, state TEXT NOT NULL, "
+            "data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_context_id ON tasks (context_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)")
+        self._conn.commit()
+
+
+    def save(self, task: Task) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tasks (id, context_id, state, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (task.id, task.context_id, task.status.state.value, task.model_dump_json(exclude_none=True), time.time()),
+        )
+        self._conn.commit()
+
+
+    def get(self, task_id: str) -> Task | None:
+        row = self._conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return Task.model_validate_json(row[0]) if row else None
+
+
+    def list_by_context(self, context_id: str) -> list[Task]:
+        rows = self._conn.execute(
+            "SELECT data FROM tasks WHERE context_id = ? ORDER BY updated_at", (context_id,)
+        ).fetchall()
+        return [Task.model_validate_json(row[0]) for row in rows]
+
+
+    def delete(self, task_id: str) -> None:
+        self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self._conn.commit()
+
+
+    def delete_older_than(self, timestamp: float) -> int:
+        deleted = self._conn.execute("DELETE FROM tasks WHERE updated_at < ?", (timestamp,)).rowcount
+        self._conn.commit()
+        return deleted
+
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class EvictingTaskStore(TaskStore):
+    """
+    Drop-in replacement for InMemoryTaskStore that bounds memory.
+
+    Finished tasks leave memory terminal_ttl seconds after they finish, and at most
+    max_tasks tasks are kept (finished ones are evicted first, then least recently used).
+    Limits are enforced on save and get; sweep() enforces them without waiting for traffic.
+    With a SqliteTaskTable, tasks are persisted when they finish or leave memory, and
+    tasks/get falls back to the table by primary key.
+    """
+
+    def __init__(
+        self,
+        max_tasks: int | None = DEFAULT_MAX_TASKS,
+        terminal_ttl: float | None = DEFAULT_TERMINAL_TTL,
+        table: SqliteTaskTable | None = None,
+        write_through: bool = False,
+        persist_ttl: float | None = None,
+    ):
+        """
+        Initialize the task store.
+
+        Args:
+            max_tasks: Maximum tasks kept in memory (None for no limit)
+            terminal_ttl: Seconds a finished task stays in memory (None to keep until evicted by size)
+            table: SQLite table to persist tasks to (None for memory only)
+            write_through: Persist every save, not only finished or evicted tasks
+                (needed when several processes share the table)
+            persist_ttl: Seconds after their last update that persisted tasks are deleted (None to keep)
+        """
+        self.max_tasks = max_tasks
+        self.terminal_ttl = terminal_ttl
+        self.table = table
+        self.write_through = write_through
+        self.persist_ttl = persist_ttl
+        self._tasks: OrderedDict[str, Task] = OrderedDict()  # least recently used first
+        self._finished_at: OrderedDict[str, float] = OrderedDict()  # terminal task id -> monotonic time
+        self._lock = asyncio.Lock()
+        self._last_prune = time.monotonic()
+        self.evicted = 0
+        self.expired = 0
+        self.persisted = 0
+
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        """Save or update a task, then evict what exceeds the TTL or size limits."""
+        async with self._lock:
+            self._tasks[task.id] = task
+            self._tasks.move_to_end(task.id)
+
+            terminal = task.status.state in TERMINAL_STATES
+            if terminal:
+                self._finished_at.setdefault(task.id, time.monotonic())
+            else:
+                self._finished_at.pop(task.id, None)
+
+            if self.table is not None and (terminal or self.write_through):
+                await self._persist(task)
+
+            await self._evict()
+
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        """Return a task from memory, or from the SQLite table if it has left memory."""
+        async with self._lock:
+            await self._evict()
+            task = self._tasks.get(task_id)
+            if task is not None and not (self.write_through and self.table is not None):
+                self._tasks.move_to_end(task_id)
+                return task
+
+            if self.table is None:
+                return None
+
+            # With write-through another process may have updated the task, so read the table
+            stored = await asyncio.to_thread(self.table.get, task_id)
+            return stored if stored is not None else task
+
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        """Delete a task from memory and the SQLite table."""
+        async with self._lock:
+            self._tasks.pop(task_id, None)
+            self._finished_at.pop(task_id, None)
+            if self.table is not None:
+                await asyncio.to_thread(self.table.delete, task_id)
+
+
+    async def list_by_context(self, context_id: str) -> list[Task]:
+        """Return the tasks of a context, oldest first (memory and table)."""
+        async with self._lock:
+            tasks = {}
+            if self.table is not None:
+                tasks = {task.id: task for task in await asyncio.to_thread(self.table.list_by_context, context_id)}
+            if not self.write_through:
+                tasks.update({task.id: task for task in self._tasks.values() if task.context_id == context_id})
+            return list(tasks.values())
+
+
+    async def sweep(self) -> None:
+        """Evict finished tasks past their TTL (and prune the table) without a save or get."""
+        async with self._lock:
+            await self._evict()
+
+
+    async def _persist(self, task: Task) -> None:
+        await asyncio.to_thread(self.table.save, task)
+        self.persisted += 1
+
+
+    async def _evict(self) -> None:
+        now = time.monotonic()
+        # Finished tasks past their TTL, oldest first
+        while self._finished_at and self.terminal_ttl is not None:
+            task_id, finished_at = next(iter(self._finished_at.items()))
+            if now - finished_at <= self.terminal_ttl:
+                break
+            del self._finished_at[task_id]
+            self._tasks.pop(task_id, None)
+            self.expired += 1
+
+        # Over the size cap: finished tasks first, then the least recently used
+        while self.max_tasks is not None and len(self._tasks) > self.max_tasks:
+            if self._finished_at:
+                task_id, _ = self._finished_at.popitem(last=False)
+                task = self._tasks.pop(task_id)
+            else:
+                task_id, task = self._tasks.popitem(last=False)
+                if self.table is not None and not self.write_through:
+                    await self._persist(task)
+                else:
+                    logger.warning(f"Evicted unfinished task {task_id}; raise max_tasks or configure a task DB")
+            self.evicted += 1
+
+        if self.table is not None and self.persist_ttl is not None and now - self._last_prune > 60:
+            self._last_prune = now
+            await asyncio.to_thread(self.table.delete_older_than, time.time() - self.persist_ttl)
+
+
+    async def stats(self) -> dict[str, Any]:
+        """
+        Return task counters (the SQLite row count is read in a worker thread).
+
+        Returns:
+            dict: Counters including:
+                - live: Unfinished tasks in memory
+                - finished: Finished tasks still in memory
+                - evicted: Tasks removed from memory by the size cap
+                - expired: Finished tasks removed from memory by the TTL
+                - persisted: Writes to the SQLite table
+                - stored: Rows in the SQLite table
+        """
+        return {
+            "live": len(self._tasks) - len(self._finished_at),
+            "finished": len(self._finished_at),
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "persisted": self.persisted,
+            "stored": await asyncio.to_thread(self.table.count) if self.table is not None else 0,
+        }
+
+
+def create_task_store(db_path: str | None = None, write_through: bool = False) -> EvictingTaskStore:
+    """
+    Build a task store from the environment.
+
+    TASK_STORE_MAX_TASKS (default 10000) and TASK_TTL (seconds, default 600) bound memory
+    use; 0 disables the respective limit. TASK_DB_PATH persists tasks to SQLite and
+    TASK_DB_TTL (seconds) deletes persisted tasks that old.
+
+    Args:
+        db_path: SQLite database to use instead of TASK_DB_PATH
+        write_through: Persist every save (for processes sharing db_path)
+
+    Returns:
+        EvictingTaskStore: The configured task store
+    """
+    max_tasks = int(os.getenv("TASK_STORE_MAX_TASKS", str(DEFAULT_MAX_TASKS)))
+    terminal_ttl = float(os.getenv("TASK_TTL", str(DEFAULT_TERMINAL_TTL)))
+    persist_ttl = float(os.getenv("TASK_DB_TTL", "0"))
+    db_path = db_path or os.getenv("TASK_DB_PATH")
+    if db_path:
+        logger.info(f"Persisting tasks to {db_path}")
+    return EvictingTaskStore(
+        max_tasks=max_tasks or None,
+        terminal_ttl=terminal_ttl or None,
+        table=SqliteTaskTable(db_path) if db_path else None,
+        write_through=write_through,
+        persist_ttl=persist_ttl or None,
+    )
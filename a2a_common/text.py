@@ -0,0 +1,30 @@
+import re
+import unicodedata
+from collections.abc import Collection
+
+_WORD = re.compile(r"\w+")
+# Scripts written without spaces between words (kana, CJK ideographs, hangul)
+_UNSPACED = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+
+
+def terms(text: str, stopwords: Collection[str] = ()) -> list[str]:
+    """
+    Split text into match terms: words for spaced scripts, character bigrams for CJK.
+
+    The text is NFKC-normalized and case-folded first, so full-width and half-width
+    forms give the same terms.
+
+    Args:
+        text: Text to split
+        stopwords: Words of spaced scripts to leave out
+
+    Returns:
+        list[str]: The terms in text order
+    """
+    tokens = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if _UNSPACED.search(word):
+            tokens.extend(word[i:i + 2] for i in range(max(len(word) - 1, 1)))
+        elif word not in stopwords:
+            tokens.append(word)
+    return tokens
@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+TRACING_MODES = ("off", "memory", "file", "otlp")
+DEFAULT_TRACING_PATH = "traces.jsonl"
+
+logger = logging.getLogger(__name__)
+
+# Without setup_tracing() this is OpenTelemetry's no-op tracer, so spans cost next to nothing
+tracer = trace.get_tracer("a2a_langgraph")
+
+_setup_lock = threading.Lock()
+_mode: str | None = None
+_memory_exporter: InMemorySpanExporter | None = None
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends one JSON line per finished span to a file, for offline analysis."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = []
+        for span in spans:
+            parent = span.parent
+            lines.append(json.dumps({
+                "name": span.name,
+                "service": span.resource.attributes.get("service.name"),
+                "trace_id": f"{span.context.trace_id:032x}",
+                "span_id": f"{span.context.span_id:016x}",
+                "parent_span_id": f"{parent.span_id:016x}" if parent is not None else None,
+                "kind": span.kind.name,
+                "start": span.start_time / 1e9,
+                "duration_ms": (span.end_time - span.start_time) / 1e6,
+                "status": span.status.status_code.name,
+                "attributes": dict(span.attributes or {}),
+                "events": [{"name": event.name, "offset_ms": (event.timestamp - span.start_time) / 1e6} for event in span.events],
+            }, ensure_ascii=False, default=str))
+        with self._lock:
+            self._file.write("".join(line + "\n" for line in lines))
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def setup_tracing(service_name: str) -> bool:
+    """
+    Export spans as selected by TRACING; only the first call in a process takes effect.
+
+    - off: no tracing (default)
+    - memory: keep finished spans in memory (see memory_exporter())
+    - file: append them as JSON lines to TRACING_PATH
+    - otlp: send them to the OTLP endpoint of OTEL_EXPORTER_OTLP_ENDPOINT
+
+    When a tracer provider is already installed (e.g. by StrandsTelemetry), the exporter
+    is added to it, so its spans and ours end up in the same traces.
+
+    Args:
+        service_name: service.name of the spans when a new tracer provider is installed
+
+    Returns:
+        bool: Whether tracing is enabled
+    """
+    global _mode, _memory_exporter
+    with _setup_lock:
+        if _mode is not None:
+            return _mode != "off"
+        mode = os.getenv("TRACING", "off").lower()
+        if mode not in TRACING_MODES:
+            raise ValueError(f"Unknown TRACING {mode!r} (use one of {', '.join(TRACING_MODES)})")
+        _mode = mode
+        if mode == "off":
+            return False
+
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            trace.set_tracer_provider(provider)
+
+        if mode == "memory":
+            _memory_exporter = InMemorySpanExporter()
+            provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+        elif mode == "file":
+            provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(os.getenv("TRACING_PATH", DEFAULT_TRACING_PATH))))
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        logger.info(f"Tracing enabled ({mode}) for {service_name}")
+        return True
+
+
+def memory_exporter() -> InMemorySpanExporter | None:
+    """The exporter holding finished spans when TRACING=memory, else None."""
+    return _memory_exporter
+
+
+def inject_trace_context(carrier: dict[str, str] | None = None) -> dict[str, str]:
+    """
+    Write the current W3C trace context (traceparent, tracestate) into a carrier.
+
+    Args:
+        carrier: Dict to add the fields to, e.g. A2A message metadata (defaults to a new one)
+
+    Returns:
+        dict: The carrier (unchanged when no span is recording)
+    """
+    carrier = {} if carrier is None else carrier
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_trace_context(carrier: Mapping[str, Any] | None) -> otel_context.Context:
+    """
+    Read the W3C trace context of a carrier (A2A message metadata or HTTP headers).
+
+    Returns:
+        Context: The carrier's context, or the current one when the carrier has none
+            (e.g. set from the request headers by TraceContextMiddleware)
+    """
+    fields = {key: value for key, value in (carrier or {}).items() if isinstance(value, str)}
+    if "traceparent" not in fields:
+        return otel_context.get_current()
+    return propagate.extract(fields)
+
+
+async def inject_trace_headers(request) -> None:
+    """httpx request hook: send the current trace context in the request headers."""
+    propagate.inject(request.headers)
+
+
+class TraceContextMiddleware:
+    """ASGI middleware that continues the trace of the caller given in the request headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        token = otel_context.attach(propagate.extract(headers))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            otel_context.detach(token)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler that turns graph steps, model calls and tool calls into spans.
+
+    Spans are children of the nearest traced parent run, and top-level runs are children
+    of the span current when the graph starts (e.g. the A2A request being served).
+    """
+
+    run_inline = True  # start spans on the event loop, in the caller's context
+
+    def __init__(self):
+        # Run id -> (span or None, context for the run's children)
+        self._runs: dict[UUID, tuple[trace.Span | None, otel_context.Context]] = {}
+        # Run id -> token of a tool span made current while the tool runs
+        self._attached: dict[UUID, object] = {}
+
+
+    def _parent_context(self, parent_run_id: UUID | None) -> otel_context.Context:
+        run = self._runs.get(parent_run_id) if parent_run_id is not None else None
+        return run[1] if run is not None else otel_context.get_current()
+
+
+    def _start(self, run_id: UUID, parent_run_id: UUID | None, name: str | None, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any) -> None:
+        parent = self._parent_context(parent_run_id)
+        if name is None:
+            # Not traced itself (e.g. a chain inside a node); its children attach to our parent
+            self._runs[run_id] = (None, parent)
+            return
+        span = tracer.start_span(name, context=parent, kind=kind, attributes={k: v for k, v in attributes.items() if v is not None})
+        self._runs[run_id] = (span, trace.set_span_in_context(span, parent))
+
+
+    def _end(self, run_id: UUID, error: BaseException | None = None, **attributes: Any) -> None:
+        token = self._attached.pop(run_id, None)
+        if token is not None:
+            otel_context.detach(token)
+        run = self._runs.pop(run_id, None)
+        if run is None or run[0] is None:
+            return
+        span = run[0]
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end()
+
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        # Graph steps: middleware hooks ("ContentFilterMiddleware.before_agent"), "model", "tools"
+        name = kwargs.get("name")
+        metadata = metadata or {}
+        is_node = name is not None and name == metadata.get("langgraph_node")
+        self._start(
+            run_id,
+            parent_run_id,
+            f"graph.step {name}" if is_node else None,
+            **({"langgraph.node": name, "langgraph.step": metadata.get("langgraph_step")} if is_node else {}),
+        )
+
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        # LangGraph interrupts (e.g. human-in-the-loop) end a node without it failing
+        control_flow = type(error).__name__ in {"GraphInterrupt", "NodeInterrupt", "ParentCommand"}
+        self._end(run_id, error=None if control_flow else error)
+
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        model = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name") or "model"
+        self._start(
+            run_id,
+            parent_run_id,
+            f"chat {model}",
+            SpanKind.CLIENT,
+            **{"gen_ai.request.model": model, "gen_ai.system": (metadata or {}).get("ls_provider")},
+        )
+
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        model = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name") or "model"
+        self._start(run_id, parent_run_id, f"text_completion {model}", SpanKind.CLIENT, **{"gen_ai.request.model": model})
+
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+        self._end(
+            run_id,
+            **{
+                "gen_ai.usage.input_tokens": usage.get("input_tokens"),
+                "gen_ai.usage.output_tokens": usage.get("output_tokens"),
+            },
+        )
+
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
+
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, inputs=None, **kwargs) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        agent = inputs.get("target_agent_url") if isinstance(inputs, dict) else None
+        self._start(run_id, parent_run_id, f"execute_tool {name}", **{"gen_ai.tool.name": name, "a2a.agent_url": agent})
+        # LangChain runs the tool in a copy of the current context, so the span becomes the
+        # parent of what the tool traces itself (e.g. the A2A call) and the remote agent's spans
+        self._attached[run_id] = otel_context.attach(self._runs[run_id][1])
+
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
+
+
+def create_tracing_handler() -> TracingCallbackHandler | None:
+    """
+    Build a callback handler for the graph's run config, or None when tracing is off.
+
+    Call setup_tracing() first.
+
+    Returns:
+        TracingCallbackHandler | None: The handler
+    """
+    return TracingCallbackHandler() if _mode not in (None, "off") else None
@@ -0,0 +1,106 @@
+import os
+import time
+from typing import Any
+
+UPDATE_MODES = ("all", "dedupe", "final_only")
+
+
+class StatusUpdateGate:
+    """Decides which intermediate status updates of one task are sent."""
+
+    def __init__(self, policy: "StatusUpdatePolicy"):
+        self._policy = policy
+        self._sent_contents: set[str] = set()
+        self._last_sent_at: float | None = None
+
+
+    def allow(self, content: str) -> bool:
+        """
+        Record an intermediate (working) status update and decide whether to send it.
+
+        Args:
+            content: Text of the status message
+
+        Returns:
+            bool: True if the update should be sent
+        """
+        policy = self._policy
+        now = time.monotonic()
+        if policy.mode == "final_only":
+            allowed = False
+        elif policy.mode == "dedupe" and content in self._sent_contents:
+            allowed = False
+        elif self._last_sent_at is not None and now - self._last_sent_at < policy.min_interval:
+            allowed = False
+        else:
+            allowed = True
+
+        if allowed:
+            self._sent_contents.add(content)
+            self._last_sent_at = now
+            policy.sent += 1
+        else:
+            policy.suppressed += 1
+        return allowed
+
+
+class StatusUpdatePolicy:
+    """
+    Which intermediate "working" status updates the executor sends.
+
+    Final updates (completed, input required, failed, canceled) and streamed token
+    artifacts are always sent; the policy only thins out the progress messages in between.
+    """
+
+    def __init__(self, mode: str = "all", min_interval: float = 0.0):
+        """
+        Initialize the policy.
+
+        Args:
+            mode: "all" sends every update, "dedupe" skips an update whose text was already
+                sent for the task (e.g. the repeated "Calling a tool..." of an agent loop),
+                "final_only" sends no intermediate updates
+            min_interval: Minimum seconds between two updates sent for a task (0 for none)
+        """
+        if mode not in UPDATE_MODES:
+            raise ValueError(f"Unknown status update mode: {mode} (expected one of {', '.join(UPDATE_MODES)})")
+        self.mode = mode
+        self.min_interval = min_interval
+        self.sent = 0
+        self.suppressed = 0
+
+
+    def gate(self) -> StatusUpdateGate:
+        """Return the per-task state for one execution."""
+        return StatusUpdateGate(self)
+
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return update counters.
+
+        Returns:
+            dict: mode, min_interval, and the intermediate updates sent and suppressed
+        """
+        return {
+            "mode": self.mode,
+            "min_interval": self.min_interval,
+            "sent": self.sent,
+            "suppressed": self.suppressed,
+        }
+
+
+def create_update_policy() -> StatusUpdatePolicy:
+    """
+    Build the status update policy from the environment.
+
+    STATUS_UPDATES selects the mode ("all" by default, "dedupe" or "final_only") and
+    STATUS_UPDATE_INTERVAL (seconds, default 0) throttles the updates of each task.
+
+    Returns:
+        StatusUpdatePolicy: The configured policy
+    """
+    return StatusUpdatePolicy(
+        mode=os.getenv("STATUS_UPDATES", "all").lower(),
+        min_interval=float(os.getenv("STATUS_UPDATE_INTERVAL", "0")),
+    )
@@ -0,0 +1,9 @@
+"""
+Benchmarks behind the performance changes, runnable from the repository root:
+
+    uv run python -m benchmarks.<name> --help
+
+They use scripted models (a2a_common.fake_model) and local servers only, so no API
+key or network access is needed. Each prints a small table comparing the old and the
+new behaviour; the numbers depend on the machine, the ratios much less.
+"""
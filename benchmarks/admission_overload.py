@@ -0,0 +1,123 @@
+"""
+Overload: latency percentiles of the weather agent with and without admission control.
+
+Requests arrive open-loop at --rate per second for --duration seconds, more than the
+agent can serve. The stand-in upstream model takes --latency seconds per call up to
+--capacity concurrent calls and slows down proportionally beyond that, like a shared LLM
+endpoint. Without a limit every request piles onto the model and all of them get slow;
+with AGENT_MAX_CONCURRENCY the admitted ones stay fast and the excess is rejected at once.
+
+    uv run python -m benchmarks.admission_overload --rate 60 --duration 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from uuid import uuid4
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import Message, Part, Role, Task, TaskState, TextPart
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from a2a_common.metrics import percentile
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+
+DEFAULT_BASE_PORT = 19850
+
+
+class ContendedModel(ScriptedChatModel):
+    """Scripted model whose calls slow down once more than capacity of them run at once."""
+
+    capacity: int = 8
+
+    _in_flight: int = PrivateAttr(default=0)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._in_flight += 1
+        try:
+            await asyncio.sleep(self._delay() * max(1.0, self._in_flight / self.capacity))
+        finally:
+            self._in_flight -= 1
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+async def measure(limits: dict[str, str], rate: float, duration: float, latency: float, capacity: int, port: int) -> dict[str, float]:
+    # build_app reads the admission settings from the environment
+    for name in ("AGENT_MAX_CONCURRENCY", "AGENT_MAX_QUEUE", "AGENT_QUEUE_TIMEOUT"):
+        os.environ.pop(name, None)
+    os.environ.update(limits)
+    spec = load_spec("weather_agent")
+    url = f"http://127.0.0.1:{port}/"
+    model = ContendedModel(script=spec.script, latency=latency, capacity=capacity)
+    app = build_app(spec, url=url, model=model)
+
+    completed: list[float] = []
+    rejected: list[float] = []
+    pool = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with serve_apps({"weather_agent": app}, port), httpx.AsyncClient(timeout=120, limits=pool) as httpx_client:
+        client = await ClientFactory.connect(url, client_config=ClientConfig(httpx_client=httpx_client, streaming=False))
+
+        async def request(delay: float) -> None:
+            await asyncio.sleep(delay)
+            message = Message(role=Role.user, parts=[Part(TextPart(text=QUERIES["weather_agent"]))], message_id=uuid4().hex)
+            start = time.perf_counter()
+            async for event in client.send_message(message):
+                task = event[0] if isinstance(event, tuple) else None
+            elapsed = time.perf_counter() - start
+            if isinstance(task, Task) and task.status.state == TaskState.rejected:
+                rejected.append(elapsed)
+            else:
+                completed.append(elapsed)
+
+        await asyncio.gather(*(request(i / rate) for i in range(int(rate * duration))))
+
+    completed.sort()
+    rejected.sort()
+    return {
+        "completed": len(completed),
+        "rejected": len(rejected),
+        "p50": percentile(completed, 0.50),
+        "p99": percentile(completed, 0.99),
+        "reject_p99": percentile(rejected, 0.99),
+    }
+
+
+async def run(rate: float, duration: float, latency: float, capacity: int, base_port: int) -> None:
+    variants = {
+        "unlimited": {},
+        f"limit {capacity}, queue {2 * capacity}, 1s wait": {
+            "AGENT_MAX_CONCURRENCY": str(capacity),
+            "AGENT_MAX_QUEUE": str(2 * capacity),
+            "AGENT_QUEUE_TIMEOUT": "1",
+        },
+    }
+    print(f"{int(rate * duration)} requests at {rate:g}/s, model {latency}s per call up to {capacity} concurrent calls")
+    print(f"{'admission':<30}{'completed':>10}{'p50 s':>8}{'p99 s':>8}{'rejected':>10}{'reject p99 s':>14}")
+    for offset, (name, limits) in enumerate(variants.items()):
+        result = await measure(limits, rate, duration, latency, capacity, base_port + offset)
+        print(
+            f"{name:<30}{result['completed']:>10}{result['p50']:>8.2f}{result['p99']:>8.2f}"
+            f"{result['rejected']:>10}{result['reject_p99']:>14.3f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rate", type=float, default=60, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of arrivals")
+    parser.add_argument("--latency", type=float, default=0.25, help="Seconds per model call when not contended")
+    parser.add_argument("--capacity", type=int, default=8, help="Concurrent model calls before the model slows down")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the agent")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    logging.getLogger("a2a_common.agent_executor").setLevel(logging.ERROR)  # one warning per rejected task
+    asyncio.run(run(args.rate, args.duration, args.latency, args.capacity, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Startup time and memory of the remote agents: one process per agent against agent_host.
+
+The agents named in --agents are started as separate uvicorn processes (agent_host with
+one agent each, so every process loads LangChain, LangGraph, httpx and the a2a SDK on
+its own), then all of them together in a single agent_host process. Reported are the
+seconds until every agent card is served and the summed RSS and USS (private memory)
+of the processes. Live models are only constructed, never called, so a dummy
+OPENAI_API_KEY is enough.
+
+    uv run python -m benchmarks.agent_host --agents weather_agent,currency_agent,03_remote_agent,04_remote_agent
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from no_library.remote_agents.agent_host import DEFAULT_AGENTS
+
+DEFAULT_BASE_PORT = 19600
+# agent_host imports the agents by module name, as when started with `uv run agent_host.py`
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "no_library" / "remote_agents"
+
+
+def _memory_mb(pid: int) -> tuple[float, float]:
+    """RSS and USS of a process in MiB (Linux /proc)."""
+    rss = uss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            field, value = line.split(":", 1)
+            if field == "Rss":
+                rss = int(value.split()[0])
+            elif field in ("Private_Clean", "Private_Dirty"):
+                uss += int(value.split()[0])
+    return rss / 2**10, uss / 2**10
+
+
+def _start(agents: list[str], port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-dummy"),
+        "HOST_AGENTS": ",".join(agents),
+        "PUBLIC_HOST": "127.0.0.1",
+        "PORT": str(port),
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "agent_host:create_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=AGENTS_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_until_serving(server: subprocess.Popen, agents: list[str], port: int) -> None:
+    with httpx.Client() as client:
+        for _ in range(1200):
+            if server.poll() is not None:
+                raise RuntimeError(f"The agent host exited with {server.returncode} (is the port in use? try --base-port)")
+            try:
+                mounted = client.get(f"http://127.0.0.1:{port}/").json()["agents"]
+                if len(mounted) == len(agents) and all(
+                    client.get(f"{url}.well-known/agent-card.json").status_code == 200 for url in mounted.values()
+                ):
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+    raise RuntimeError("The agent host did not start")
+
+
+def measure(groups: list[list[str]], base_port: int) -> dict[str, float]:
+    """Start one process per group of agents at once; return seconds until all serve and the summed memory."""
+    start = time.perf_counter()
+    servers = [(_start(agents, base_port + offset), agents, base_port + offset) for offset, agents in enumerate(groups)]
+    try:
+        for server, agents, port in servers:
+            _wait_until_serving(server, agents, port)
+        ready = time.perf_counter() - start
+        memory = [_memory_mb(server.pid) for server, _agents, _port in servers]
+    finally:
+        for server, _agents, _port in servers:
+            server.terminate()
+        for server, _agents, _port in servers:
+            server.wait()
+    return {
+        "ready": ready,
+        "rss": sum(rss for rss, _uss in memory),
+        "uss": sum(uss for _rss, uss in memory),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--agents", default=DEFAULT_AGENTS, help="Comma-separated agents (as in HOST_AGENTS)")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the first process")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    agents = [name.strip() for name in args.agents.split(",") if name.strip()]
+    print(f"{len(agents)} agents: {', '.join(agents)}")
+    print(f"{'deployment':<26}{'ready s':>9}{'RSS MiB':>10}{'USS MiB':>10}")
+    for name, groups in [
+        (f"{len(agents)} separate processes", [[agent] for agent in agents]),
+        ("agent_host, 1 process", [agents]),
+    ]:
+        result = measure(groups, args.base_port)
+        print(f"{name:<26}{result['ready']:>9.1f}{result['rss']:>10.0f}{result['uss']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Checkpointer soak: resident memory against the number of conversations served.
+
+Each conversation (context) runs one turn of the weather agent's graph with its scripted
+model. The process RSS is sampled as the contexts accumulate. The unbounded InMemorySaver
+grows with every context; BoundedCheckpointer levels off at --max-threads resident threads,
+discarding or spilling the rest to SQLite. Each variant runs in a fresh process.
+
+    uv run python -m benchmarks.checkpointer_soak --contexts 10000 --max-threads 1000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from a2a_common.checkpointer import BoundedCheckpointer, SqliteThreadStore
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec
+
+VARIANTS = ("InMemorySaver", "bounded", "bounded + sqlite spill")
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+async def _soak(variant: str, contexts: int, samples: int, max_threads: int, db_dir: str) -> list[tuple[int, float]]:
+    if variant == "InMemorySaver":
+        checkpointer = InMemorySaver()
+    else:
+        spill_store = SqliteThreadStore(os.path.join(db_dir, "soak.sqlite")) if "sqlite" in variant else None
+        checkpointer = BoundedCheckpointer(max_threads=max_threads, idle_ttl=None, spill_store=spill_store)
+    spec = load_spec("weather_agent")
+    agent = spec.build_agent(ScriptedChatModel(script=spec.script), checkpointer)
+
+    step = max(contexts // samples, 1)
+    curve = [(0, rss_mb())]
+    for i in range(1, contexts + 1):
+        config = {"configurable": {"thread_id": f"context-{i}"}}
+        await agent.ainvoke({"messages": [("user", QUERIES["weather_agent"])]}, config)
+        if i % step == 0:
+            curve.append((i, rss_mb()))
+    return curve
+
+
+def soak(variant: str, contexts: int, samples: int, max_threads: int) -> tuple[list[tuple[int, float]], float]:
+    # Runs in a fresh process, so earlier variants do not inflate the RSS
+    logging.basicConfig(level=logging.WARNING, force=True)
+    with tempfile.TemporaryDirectory() as db_dir:
+        start = time.perf_counter()
+        curve = asyncio.run(_soak(variant, contexts, samples, max_threads, db_dir))
+        return curve, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--contexts", type=int, default=10000, help="Conversations to serve")
+    parser.add_argument("--samples", type=int, default=5, help="RSS samples along the run")
+    parser.add_argument("--max-threads", type=int, default=1000, help="BoundedCheckpointer max_threads")
+    args = parser.parse_args()
+
+    curves = {}
+    for variant in VARIANTS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            curves[variant] = pool.submit(soak, variant, args.contexts, args.samples, args.max_threads).result()
+
+    print(f"RSS (MiB) after N one-turn conversations, max_threads={args.max_threads}")
+    points = [n for n, _ in curves[VARIANTS[0]][0]]
+    print(f"{'checkpointer':<24}" + "".join(f"{n:>9}" for n in points) + f"{'turns/s':>9}")
+    for variant, (curve, seconds) in curves.items():
+        print(f"{variant:<24}" + "".join(f"{rss:>9.0f}" for _, rss in curve) + f"{args.contexts / seconds:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Messages per second through A2AClientToolProvider with and without per-agent client reuse.
+
+A local echo agent answers at once, so the supervisor side of each delegation is what is
+measured. "per message" builds a new a2a Client for every send, as the provider did before
+it kept one per agent URL and card digest.
+
+    uv run python -m benchmarks.client_reuse --messages 2000 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from a2a.client import Client
+from a2a.types import AgentCard
+
+from no_library.loadtest import serve_apps
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+
+from .stub_agent import build_stub_app
+
+DEFAULT_BASE_PORT = 19200
+
+
+class PerMessageClientProvider(A2AClientToolProvider):
+    """The provider before client reuse: a new Client for every message."""
+
+    async def _get_client(self, url: str, agent_card: AgentCard) -> Client:
+        client_factory = await self._ensure_client_factory()
+        return client_factory.create(agent_card)
+
+
+async def measure(provider_class: type[A2AClientToolProvider], url: str, messages: int, concurrency: int) -> float:
+    provider = provider_class(known_agent_urls=[url])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(i: int) -> None:
+        async with semaphore:
+            result = await provider.a2a_send_message(f"message {i}", url)
+            assert result["status"] == "success", result
+
+    try:
+        await send(-1)  # card discovery and connection setup
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(messages)))
+        return messages / (time.perf_counter() - start)
+    finally:
+        await provider.aclose()
+
+
+async def create_cost(url: str, calls: int) -> float:
+    """Seconds per ClientFactory.create call, the work reuse saves per message."""
+    provider = A2AClientToolProvider(known_agent_urls=[url])
+    try:
+        card = await provider._discover_agent_card(url)
+        factory = await provider._ensure_client_factory()
+        start = time.perf_counter()
+        for _ in range(calls):
+            factory.create(card)
+        return (time.perf_counter() - start) / calls
+    finally:
+        await provider.aclose()
+
+
+async def run(messages: int, concurrency: int, rounds: int, base_port: int) -> None:
+    async with serve_apps({"echo": build_stub_app(f"http://127.0.0.1:{base_port}/")}, base_port) as urls:
+        url = urls["echo"]
+        print(f"ClientFactory.create: {await create_cost(url, 10000) * 1e6:.1f} us per call")
+        print(f"{messages} messages, {concurrency} in flight, best of {rounds}")
+        for name, provider_class in [("per message (before)", PerMessageClientProvider), ("reused", A2AClientToolProvider)]:
+            rate = max([await measure(provider_class, url, messages, concurrency) for _ in range(rounds)])
+            print(f"{name:<22}{rate:>8.0f} msg/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--messages", type=int, default=2000, help="Messages per round")
+    parser.add_argument("--concurrency", type=int, default=8, help="Messages in flight")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per variant (the best is reported)")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the stub agent")
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.concurrency, args.rounds, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
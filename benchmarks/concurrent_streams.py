@@ -0,0 +1,75 @@
+"""
+Concurrent requests on one agent: async graph.astream against the old synchronous graph.stream.
+
+N requests stream the weather agent's graph at the same time on one event loop, with a
+scripted model that takes --latency seconds per call. With astream the requests overlap
+and finish in about one request's time; iterating the synchronous graph.stream inside the
+coroutine blocks the event loop, so they run one after another.
+
+    uv run python -m benchmarks.concurrent_streams --requests 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from a2a_common.adapter import LangGraphAgentAdapter
+from a2a_common.fake_model import ScriptedChatModel
+from a2a_common.metrics import percentile
+from no_library.loadtest import load_spec
+
+
+class BlockingAdapter(LangGraphAgentAdapter):
+    """The adapter before astream: the synchronous graph.stream runs inside the coroutine."""
+
+    async def stream(self, query, context_id):
+        config = {'configurable': {'thread_id': context_id}}
+        values: dict[str, Any] = {}
+        for values in self.graph.stream({'messages': [('user', query)]}, config, stream_mode='values'):
+            pass
+        yield self._final_response(values)
+
+
+async def _request(adapter: LangGraphAgentAdapter, context_id: str, start: float) -> float:
+    # Latency as the caller sees it: from the moment all requests arrived
+    async for _item in adapter.stream("What is the weather like in Tokyo?", context_id):
+        pass
+    return time.perf_counter() - start
+
+
+async def measure(adapter_class: type[LangGraphAgentAdapter], requests: int, latency: float) -> dict[str, float]:
+    spec = load_spec("weather_agent")
+    model = ScriptedChatModel(script=spec.script, latency=latency)
+    adapter = adapter_class(spec.build_agent(model, InMemorySaver()))
+    await _request(adapter, "warmup", time.perf_counter())
+
+    start = time.perf_counter()
+    durations = sorted(await asyncio.gather(*(_request(adapter, f"request-{i}", start) for i in range(requests))))
+    wall = time.perf_counter() - start
+    return {
+        "wall": wall,
+        "p50": percentile(durations, 0.50),
+        "max": durations[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=20, help="Simultaneous requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per scripted model call")
+    args = parser.parse_args()
+    # The agent modules configure INFO logging when imported; keep the report readable
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    print(f"{args.requests} simultaneous requests, 2 model calls of {args.latency}s each")
+    print(f"{'adapter':<28}{'wall s':>9}{'p50 s':>9}{'max s':>9}")
+    for name, adapter_class in [("sync graph.stream (before)", BlockingAdapter), ("graph.astream", LangGraphAgentAdapter)]:
+        result = asyncio.run(measure(adapter_class, args.requests, args.latency))
+        print(f"{name:<28}{result['wall']:>9.2f}{result['p50']:>9.2f}{result['max']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
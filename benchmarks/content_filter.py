@@ -0,0 +1,135 @@
+"""
+Cost of the supervisor's content filter with a large keyword list.
+
+--keywords random banned keywords (90% ASCII, 10% CJK) are compiled once into the
+Aho-Corasick KeywordMatcher. Clean messages of growing length are then checked with the
+matcher and with the old loop of one substring search per keyword. Finally a
+--turns turn conversation is checked turn by turn the way ContentFilterMiddleware does it
+(only the messages added since the last turn), against rescanning every message and the
+old first-message-only check, which let banned words in later turns through.
+
+    uv run python -m benchmarks.content_filter --keywords 10000
+"""
+import argparse
+import logging
+import random
+import string
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from no_library.middleware.content_filter_middleware import ContentFilterMiddleware, KeywordMatcher, normalize
+
+CJK = [chr(code) for code in range(0x4E00, 0x4E00 + 2000)]
+LENGTHS = [1_000, 10_000, 100_000]
+
+
+def _keywords(count: int, rng: random.Random) -> list[str]:
+    keywords = set()
+    while len(keywords) < count:
+        if len(keywords) % 10:
+            keywords.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12))))
+        else:
+            keywords.add("".join(rng.choices(CJK, k=rng.randint(3, 5))))
+    return sorted(keywords)
+
+
+def _clean_text(length: int, rng: random.Random) -> str:
+    """Prose-like text: short ASCII words with some CJK, too short to contain a keyword."""
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        if rng.random() < 0.1:
+            words.append("".join(rng.choices(CJK, k=2)))
+        else:
+            words.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 5))))
+    return " ".join(words)[:length]
+
+
+def _substring_search(keywords: list[str], text: str) -> str | None:
+    """The filter before: one substring search per keyword."""
+    for keyword in keywords:
+        if keyword in text:
+            return keyword
+    return None
+
+
+def _per_call_ms(func, *args, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(keyword_count: int, turns: int, seed: int) -> None:
+    rng = random.Random(seed)
+    keywords = _keywords(keyword_count, rng)
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{keyword_count} keywords, automaton built in {build_ms:.0f} ms")
+
+    print(f"{'message chars':<16}{'substring ms':>14}{'automaton ms':>14}")
+    for length in LENGTHS:
+        text = normalize(_clean_text(length, rng))
+        assert matcher.search(text) is None and _substring_search(keywords, text) is None
+        repeat = max(1, 100_000 // length)
+        before = _per_call_ms(_substring_search, keywords, text, repeat=repeat)
+        now = _per_call_ms(matcher.search, text, repeat=repeat * 10)
+        print(f"{length:<16,}{before:>14.2f}{now:>14.3f}")
+
+    # A long conversation: each turn adds a user message and an answer
+    middleware = ContentFilterMiddleware(keywords)
+    messages = []
+    for _ in range(turns):
+        messages.append(HumanMessage(content=_clean_text(500, rng)))
+        messages.append(AIMessage(content=_clean_text(500, rng)))
+    messages[-2] = HumanMessage(content=f"{messages[-2].content} {keywords[0]}")  # banned word in the last turn
+
+    def incremental() -> bool:
+        state = {"messages": [], "content_filter_checked": 0}
+        for turn in range(turns):
+            state["messages"] = messages[:2 * turn + 1]
+            update = middleware.before_agent(state, None)
+            state["content_filter_checked"] = update["content_filter_checked"]
+            if "jump_to" in update:
+                return True
+        return False
+
+    def rescan() -> bool:
+        for turn in range(turns):
+            state = {"messages": messages[:2 * turn + 1]}
+            if "jump_to" in middleware.before_agent(state, None):
+                return True
+        return False
+
+    def first_only() -> bool:
+        for _ in range(turns):
+            if _substring_search(middleware.banned_keywords, normalize(messages[0].content)) is not None:
+                return True
+        return False
+
+    print(f"{turns}-turn conversation, banned word in the last turn")
+    print(f"{'check':<30}{'ms per turn':>12}{'blocked':>9}")
+    for name, check in [
+        ("new messages only (now)", incremental),
+        ("every message", rescan),
+        ("first message only (before)", first_only),
+    ]:
+        start = time.perf_counter()
+        blocked = check()
+        print(f"{name:<30}{(time.perf_counter() - start) / turns * 1000:>12.2f}{'yes' if blocked else 'no':>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--keywords", type=int, default=10_000, help="Banned keywords")
+    parser.add_argument("--turns", type=int, default=200, help="Turns of the conversation")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for keywords and messages")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    run(args.keywords, args.turns, args.seed)
+
+
+if __name__ == "__main__":
+    main()
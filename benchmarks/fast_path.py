@@ -0,0 +1,123 @@
+"""
+Fast path (FAST_PATH=true): routing accuracy, the cost of a miss and end-to-end latency.
+
+A mixed set of requests to the weather, currency and yen-to-won agents (direct questions,
+questions about other times, several cities or requests in one message, malformed amounts,
+off-topic text) is routed with each agent's FastPathRoute and compared with the expected
+tool arguments. Then the weather agent's graph answers a direct question --requests times
+with the fast path off (the scripted model takes --latency seconds per call) and on.
+
+    uv run python -m benchmarks.fast_path --requests 20 --latency 0.4
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from a2a_common.fake_model import ScriptedChatModel
+from a2a_common.fast_path import FastPathRoute, _normalize
+from a2a_common.metrics import percentile
+from no_library.loadtest import QUERIES, load_spec
+from no_library.remote_agents import currency_agent, weather_agent
+
+yen2won_agent = importlib.import_module("with_library.04_remote_agent")
+
+ROUTES = {
+    "weather": FastPathRoute(weather_agent.get_weather, weather_agent.WEATHER_PATTERNS),
+    "currency": FastPathRoute(currency_agent.get_exchange_rate, currency_agent.EXCHANGE_RATE_PATTERNS),
+    "yen2won": FastPathRoute(
+        yen2won_agent.convert_yen_to_won,
+        yen2won_agent.YEN_TO_WON_PATTERNS,
+        parsers={"amount_yen": lambda amount: float(amount.replace(",", ""))},
+    ),
+}
+
+# (agent, message, expected tool arguments or None for "ask the model")
+CASES = [
+    ("weather", "What is the weather like in Tokyo?", {"city_name": "Tokyo"}),
+    ("weather", "what's the weather in New York City?", {"city_name": "New York City"}),
+    ("weather", "weather in Paris today", {"city_name": "Paris"}),
+    ("weather", "Tell me the weather in San Francisco", {"city_name": "San Francisco"}),
+    ("weather", "東京の天気は？", {"city_name": "東京"}),
+    ("weather", "大阪の天気を教えてください", {"city_name": "大阪"}),
+    ("weather", "what's the weather in New York City tomorrow?", None),
+    ("weather", "What was the weather in Tokyo last week?", None),
+    ("weather", "weather in Paris and London", None),
+    ("weather", "東京と大阪の天気は？", None),
+    ("weather", "明日の東京の天気は？", None),
+    ("weather", "weather in Tokyo in fahrenheit please", None),
+    ("weather", "What's the weather like in my city?", None),
+    ("weather", "What's the weather in Tokyo? Also book me a flight to Osaka.", None),
+    ("weather", "Should I bring an umbrella to Kyoto?", None),
+    ("currency", "What is the exchange rate between USD and JPY?", {}),
+    ("currency", "USD/JPY", {}),
+    ("currency", "ドル円は？", {}),
+    ("currency", "What is the exchange rate between USD and GBP?", None),
+    ("currency", "What was the USD to JPY rate yesterday?", None),
+    ("yen2won", "1000円は何ウォン？", {"amount_yen": 1000.0}),
+    ("yen2won", "Convert 2500 yen to won", {"amount_yen": 2500.0}),
+    ("yen2won", "1,000円は何ウォン？", {"amount_yen": 1000.0}),
+    ("yen2won", "1.2.3円は何ウォン？", None),
+    ("yen2won", "Convert -5 yen to won", None),
+    ("yen2won", "convert 1e9 yen to won", None),
+    ("yen2won", "1000円は何ウォン？ あと2000円は？", None),
+    ("yen2won", "Write me a poem about money", None),
+]
+
+
+def route_cases() -> None:
+    expected_hits = sum(args is not None for _agent, _message, args in CASES)
+    hits = correct = wrong = 0
+    for agent, message, expected in CASES:
+        args = ROUTES[agent].match(_normalize(message))
+        hits += args is not None
+        correct += args == expected
+        wrong += args is not None and args != expected
+
+    misses = [(ROUTES[agent], _normalize(message)) for agent, message, args in CASES if args is None]
+    repeat = 1000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for route, text in misses:
+            route.match(text)
+    miss_us = (time.perf_counter() - start) / (repeat * len(misses)) * 1e6
+
+    print(f"{len(CASES)} requests: {hits}/{expected_hits} direct questions answered on the fast path, "
+          f"{correct}/{len(CASES)} routed as expected, {wrong} wrong tool calls")
+    print(f"A miss costs {miss_us:.1f} us of routing before the request goes to the model")
+
+
+async def measure(fast_path: bool, requests: int, latency: float) -> list[float]:
+    # create_fast_path reads FAST_PATH when the graph is built
+    os.environ["FAST_PATH"] = "true" if fast_path else "false"
+    spec = load_spec("weather_agent")
+    agent = spec.build_agent(ScriptedChatModel(script=spec.script, latency=latency), InMemorySaver())
+    durations = []
+    for i in range(requests):
+        start = time.perf_counter()
+        await agent.ainvoke({"messages": [("user", QUERIES["weather_agent"])]}, {"configurable": {"thread_id": f"request-{i}"}})
+        durations.append(time.perf_counter() - start)
+    return sorted(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=20, help="Weather questions per variant")
+    parser.add_argument("--latency", type=float, default=0.4, help="Seconds per scripted model call")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    route_cases()
+    print(f'"{QUERIES["weather_agent"]}", {args.requests} requests, {args.latency}s per model call')
+    print(f"{'FAST_PATH':<12}{'p50 ms':>10}{'max ms':>10}")
+    for fast_path in (False, True):
+        durations = asyncio.run(measure(fast_path, args.requests, args.latency))
+        print(f"{str(fast_path).lower():<12}{percentile(durations, 0.50) * 1000:>10.1f}{durations[-1] * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
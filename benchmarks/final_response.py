@@ -0,0 +1,87 @@
+"""
+Cost of the adapter's final-response step: re-reading the checkpoint against the streamed state.
+
+A weather agent thread is filled with --messages messages by the scripted model. The step
+that turns the finished run into the A2A response is then timed --iterations times at the
+repo's default INFO log level: before, the adapter read the state again through aget_state
+and printed and INFO-logged repr dumps of it; now it builds the response from the last
+streamed 'values' chunk. Both run with the in-memory and the SQLite write-through
+checkpointer (A2A_STATE_BACKEND=memory / sqlite).
+
+    uv run python -m benchmarks.final_response --messages 80 --iterations 200
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+from a2a_common import adapter as adapter_module
+from a2a_common.adapter import LangGraphAgentAdapter
+from a2a_common.checkpointer import create_checkpointer
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec
+
+
+class RereadingAdapter(LangGraphAgentAdapter):
+    """The final-response step before: aget_state plus the print / INFO state dumps."""
+
+    async def get_agent_response(self, config):
+        current_state = await self.graph.aget_state(config)
+        print("STATE_KEYS:", list(current_state.values.keys()))
+        print("STRUCTURED_RAW:", repr(current_state.values.get("structured_response")))
+        print("STRUCTURED_TYPE:", type(current_state.values.get("structured_response")))
+        adapter_module.logger.info("state keys=%s", list(current_state.values.keys()))
+        adapter_module.logger.info("structured_response raw=%r", current_state.values.get("structured_response"))
+        return self._final_response(current_state.values)
+
+
+async def measure(db_path: str | None, messages: int, iterations: int) -> tuple[int, float, float]:
+    """Return the thread length and the microseconds per final response before and now."""
+    spec = load_spec("weather_agent")
+    checkpointer = create_checkpointer(db_path, write_through=db_path is not None)
+    adapter = RereadingAdapter(spec.build_agent(ScriptedChatModel(script=spec.script), checkpointer))
+    config = {'configurable': {'thread_id': "long-thread"}}
+    try:
+        values: dict = {}
+        while len(values.get("messages", [])) < messages:
+            async for _item in adapter.stream(QUERIES["weather_agent"], "long-thread"):
+                pass
+            values = (await adapter.graph.aget_state(config)).values
+
+        # stdout and the INFO records are formatted as before, then discarded
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await adapter.get_agent_response(config)
+            before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            adapter._final_response(values)
+        now = time.perf_counter() - start
+    finally:
+        checkpointer.close()
+    return len(values["messages"]), before / iterations * 1e6, now / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--messages", type=int, default=80, help="Messages in the thread")
+    parser.add_argument("--iterations", type=int, default=200, help="Final responses timed per variant")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, force=True, handlers=[logging.StreamHandler(io.StringIO())])
+
+    print(f"{'checkpointer':<24}{'messages':>9}{'before us':>11}{'now us':>9}")
+    with tempfile.TemporaryDirectory() as state_dir:
+        variants = {"memory": None, "sqlite write-through": os.path.join(state_dir, "a2a_state.sqlite")}
+        for name, db_path in variants.items():
+            length, before, now = asyncio.run(measure(db_path, args.messages, args.iterations))
+            print(f"{name:<24}{length:>9}{before:>11.0f}{now:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
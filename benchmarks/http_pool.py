@@ -0,0 +1,89 @@
+"""
+Connection pool sizing: concurrent streaming sends under different pool limits.
+
+A burst of streaming sends goes to local agents that each take --delay seconds. While
+it runs, the provider's pool_stats() is sampled to find the peak connections in use and
+the peak number of requests waiting for the pool or for a per-host slot. Total time shows
+what the waits cost.
+
+    uv run python -m benchmarks.http_pool --sends 16 --agents 2 --delay 0.5
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+
+from no_library.loadtest import serve_apps
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+
+from .stub_agent import build_stub_app
+
+DEFAULT_BASE_PORT = 19300
+
+# Name -> A2AClientToolProvider pool options
+VARIANTS = {
+    "uncapped": {"max_connections": None, "max_keepalive_connections": None},
+    "max_connections=4": {"max_connections": 4},
+    "per host cap 4": {"max_connections_per_host": 4},
+}
+
+
+async def measure(urls: list[str], sends: int, options: dict[str, Any]) -> dict[str, float]:
+    provider = A2AClientToolProvider(known_agent_urls=urls, streaming=True, **options)
+    peaks = {"in_use": 0, "waiters": 0, "host_waiters": 0}
+    done = asyncio.Event()
+
+    async def sample() -> None:
+        while not done.is_set():
+            stats = provider.pool_stats()
+            peaks["in_use"] = max(peaks["in_use"], stats["in_use"])
+            peaks["waiters"] = max(peaks["waiters"], stats["waiters"])
+            peaks["host_waiters"] = max(peaks["host_waiters"], sum(stats["host_waiters"].values()))
+            await asyncio.sleep(0.005)
+
+    try:
+        await provider.refresh_agent_cards()
+        sampler = asyncio.create_task(sample())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            provider.a2a_send_message(f"message {i}", urls[i % len(urls)]) for i in range(sends)
+        ))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await sampler
+        assert all(result["status"] == "success" for result in results), results
+        return {"seconds": elapsed, **peaks}
+    finally:
+        await provider.aclose()
+
+
+async def run(sends: int, agents: int, delay: float, base_port: int) -> None:
+    apps = {
+        f"agent{i}": build_stub_app(f"http://127.0.0.1:{base_port + i}/", delay=delay, streaming=True)
+        for i in range(agents)
+    }
+    async with serve_apps(apps, base_port) as urls:
+        print(f"{sends} streaming sends to {agents} agents, {delay}s each")
+        print(f"{'pool':<20}{'seconds':>9}{'in_use':>8}{'pool waiters':>14}{'host waiters':>14}")
+        for name, options in VARIANTS.items():
+            result = await measure(list(urls.values()), sends, options)
+            print(
+                f"{name:<20}{result['seconds']:>9.2f}{result['in_use']:>8}"
+                f"{result['waiters']:>14}{result['host_waiters']:>14}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sends", type=int, default=16, help="Concurrent sends")
+    parser.add_argument("--agents", type=int, default=2, help="Local agents (hosts) the sends are spread over")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds each agent takes per message")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the first agent")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run(args.sends, args.agents, args.delay, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
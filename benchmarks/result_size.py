@@ -0,0 +1,85 @@
+"""
+Tool result size per supervisor turn: full task/card dumps against the compact result mode.
+
+The weather agent runs on localhost with its scripted model. Each turn makes the tool calls
+a supervisor turn typically makes (list the discovered agents, send the question) and
+measures the JSON the supervisor model would read back, in bytes and tokens.
+
+    uv run python -m benchmarks.result_size --turns 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+from no_library.supervisor_agent.result_projection import ResultMode
+
+DEFAULT_BASE_PORT = 19400
+
+
+def _token_counter() -> tuple[Callable[[str], int], str]:
+    """Count tokens with tiktoken when its encoding is available, else estimate 4 characters per token."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text)), "tokens"
+    except Exception:
+        return lambda text: -(-len(text) // 4), "~tokens"
+
+
+async def measure(url: str, mode: ResultMode, turns: int, streaming: bool) -> list[str]:
+    """Return the serialized tool results of each turn, concatenated per turn."""
+    provider = A2AClientToolProvider(known_agent_urls=[url], result_mode=mode, streaming=streaming)
+    try:
+        results = []
+        for _ in range(turns):
+            listed = await provider.a2a_list_discovered_agents()
+            sent = await provider.a2a_send_message(QUERIES["weather_agent"], url)
+            assert sent["status"] == "success", sent
+            results.append(json.dumps(listed, ensure_ascii=False, default=str) + json.dumps(sent, ensure_ascii=False, default=str))
+        return results
+    finally:
+        await provider.aclose()
+
+
+async def run(turns: int, streaming: bool, base_port: int) -> None:
+    spec = load_spec("weather_agent")
+    url = f"http://127.0.0.1:{base_port}/"
+    app = build_app(spec, url=url, model=ScriptedChatModel(script=spec.script))
+    count_tokens, unit = _token_counter()
+    async with serve_apps({"weather_agent": app}, base_port) as urls:
+        sizes: dict[ResultMode, list[dict[str, Any]]] = {}
+        for mode in ResultMode:
+            sizes[mode] = [
+                {"bytes": len(text.encode()), "tokens": count_tokens(text)}
+                for text in await measure(urls["weather_agent"], mode, turns, streaming)
+            ]
+
+    print(f"{turns} turns of list + send against the weather agent{' (streaming)' if streaming else ''}")
+    print(f"{'mode':<10}{'bytes/turn':>12}{unit + '/turn':>14}")
+    for mode, turn_sizes in sizes.items():
+        print(
+            f"{mode.value:<10}{sum(s['bytes'] for s in turn_sizes) / turns:>12.0f}"
+            f"{sum(s['tokens'] for s in turn_sizes) / turns:>14.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--turns", type=int, default=5, help="Turns per mode")
+    parser.add_argument("--streaming", action="store_true", help="Call the agent with SSE streaming")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the weather agent")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run(args.turns, args.streaming, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Supervisor model calls per query: discovery by the model against local routing with a2a_route_message.
+
+The weather and currency agents run on localhost with their scripted models. The "model
+discovery" supervisor lists the discovered agents, then sends to the agent it picked and
+answers (three model calls). The "a2a_route_message" supervisor routes on the skill index
+and answers (two model calls). Every supervisor model call takes --latency seconds.
+
+    uv run python -m benchmarks.routing_calls --queries 10 --latency 0.5
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from a2a_common.metrics import percentile
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+from no_library.supervisor_agent.graph import SUPERVISOR_SCRIPT, build_supervisor
+
+DEFAULT_BASE_PORT = 19500
+
+
+class ModelCallCounter(BaseCallbackHandler):
+    def __init__(self):
+        self.calls = 0
+
+
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        self.calls += 1
+
+
+def _discovery_script(target_url: str) -> list[dict[str, Any]]:
+    # What a model without local routing does: read the agent list, pick one, send to it
+    return [
+        {"tool": "a2a_list_discovered_agents", "args": {}},
+        {"tool": "a2a_send_message", "args": {"message_text": "{input}", "target_agent_url": target_url}},
+        {"text": "{last}"},
+    ]
+
+
+async def measure(provider: A2AClientToolProvider, urls: dict[str, str], routed: bool, queries: int, latency: float) -> dict[str, float]:
+    counter = ModelCallCounter()
+    durations = []
+    for i in range(queries):
+        name = list(urls)[i % len(urls)]
+        script = SUPERVISOR_SCRIPT if routed else _discovery_script(urls[name])
+        supervisor = build_supervisor(provider, list(urls.values()), model=ScriptedChatModel(script=script, latency=latency))
+        config = {"configurable": {"thread_id": f"query-{i}"}, "callbacks": [counter]}
+        start = time.perf_counter()
+        result = await supervisor.ainvoke({"messages": [{"role": "user", "content": QUERIES[name]}]}, config)
+        durations.append(time.perf_counter() - start)
+        # The answer echoes the tool result, which names the agent that answered
+        answer = result["messages"][-1].text
+        assert urls[name] in answer and '"status": "error"' not in answer, answer
+    durations.sort()
+    return {"calls": counter.calls / queries, "p50": percentile(durations, 0.50), "max": durations[-1]}
+
+
+async def run(queries: int, latency: float, base_port: int) -> None:
+    apps = {}
+    for offset, name in enumerate(QUERIES):
+        spec = load_spec(name)
+        apps[name] = build_app(spec, url=f"http://127.0.0.1:{base_port + offset}/", model=ScriptedChatModel(script=spec.script))
+
+    async with serve_apps(apps, base_port) as urls:
+        provider = A2AClientToolProvider(known_agent_urls=list(urls.values()))
+        try:
+            await provider.refresh_agent_cards()
+            print(f"{queries} queries over {', '.join(urls)}, {latency}s per supervisor model call")
+            print(f"{'supervisor':<22}{'model calls':>13}{'p50 s':>9}{'max s':>9}")
+            for name, routed in [("model discovery", False), ("a2a_route_message", True)]:
+                result = await measure(provider, urls, routed, queries, latency)
+                print(f"{name:<22}{result['calls']:>13.1f}{result['p50']:>9.2f}{result['max']:>9.2f}")
+        finally:
+            await provider.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--queries", type=int, default=10, help="Queries per supervisor")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per supervisor model call")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the first agent")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run(args.queries, args.latency, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Throughput of the weather agent by state backend and number of worker processes.
+
+The agent runs as a separate server (uvicorn, MODEL_BACKEND=scripted with --latency seconds
+per model call). --sessions concurrent conversations each send --turns messages in their
+own context. "memory" keeps state per process, so it only runs with one worker; "sqlite"
+shares tasks and conversations through A2A_STATE_DB_PATH, so follow-up turns may land on
+any worker.
+
+    uv run python -m benchmarks.state_backend --sessions 16 --turns 5 --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import AgentCard, Message, Part, Role, Task, TaskState, TextPart
+
+from a2a_common.metrics import percentile
+from no_library.loadtest import QUERIES
+
+DEFAULT_PORT = 19800
+
+
+async def _wait_until_serving(url: str, server: subprocess.Popen) -> AgentCard:
+    async with httpx.AsyncClient() as client:
+        for _ in range(300):
+            if server.poll() is not None:
+                raise RuntimeError(f"The agent server exited with {server.returncode} (is the port in use? try --port)")
+            try:
+                response = await client.get(f"{url}.well-known/agent-card.json")
+                if response.status_code == 200:
+                    return AgentCard.model_validate(response.json())
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("The agent server did not start")
+
+
+async def _drive(card: AgentCard, sessions: int, turns: int) -> tuple[float, list[float]]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as httpx_client:
+        client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=False)).create(card)
+        durations: list[float] = []
+
+        async def session() -> None:
+            context_id = uuid4().hex
+            for _ in range(turns):
+                message = Message(
+                    role=Role.user,
+                    parts=[Part(TextPart(text=QUERIES["weather_agent"]))],
+                    message_id=uuid4().hex,
+                    context_id=context_id,
+                )
+                start = time.perf_counter()
+                async for event in client.send_message(message):
+                    task = event[0] if isinstance(event, tuple) else None
+                    if isinstance(task, Task) and task.status.state != TaskState.completed:
+                        raise RuntimeError(f"Turn ended {task.status.state.value}")
+                durations.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(session() for _ in range(sessions)))
+        return time.perf_counter() - start, sorted(durations)
+
+
+def measure(backend: str, workers: int, sessions: int, turns: int, latency: float, port: int) -> dict[str, float]:
+    url = f"http://127.0.0.1:{port}/"
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = {
+            **os.environ,
+            "MODEL_BACKEND": "scripted",
+            "MODEL_LATENCY": str(latency),
+            "A2A_STATE_BACKEND": backend,
+            "A2A_STATE_DB_PATH": os.path.join(state_dir, "a2a_state.sqlite"),
+            "PUBLIC_HOST": "127.0.0.1",
+            "PORT": str(port),
+        }
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "no_library.remote_agents.weather_agent:create_app", "--factory",
+                "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            async def run() -> tuple[float, list[float]]:
+                card = await _wait_until_serving(url, server)
+                await _drive(card, workers, 1)  # every worker imports and builds the agent
+                return await _drive(card, sessions, turns)
+
+            seconds, durations = asyncio.run(run())
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        "turns_per_second": sessions * turns / seconds,
+        "p50": percentile(durations, 0.50),
+        "p99": percentile(durations, 0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent conversations")
+    parser.add_argument("--turns", type=int, default=5, help="Turns per conversation")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes of the sqlite run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per scripted model call")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port of the agent server")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    print(f"{args.sessions} conversations x {args.turns} turns, {args.latency}s per model call")
+    print(f"{'backend':<10}{'workers':>8}{'turns/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for backend, workers in [("memory", 1), ("sqlite", 1), ("sqlite", args.workers)]:
+        result = measure(backend, workers, args.sessions, args.turns, args.latency, args.port)
+        print(
+            f"{backend:<10}{workers:>8}{result['turns_per_second']:>9.1f}"
+            f"{result['p50'] * 1000:>9.0f}{result['p99'] * 1000:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Streamed events and bytes per task for each status update policy (STATUS_UPDATES).
+
+The weather agent's scripted model looks up three cities before answering, so every task
+reports "Calling a tool..." and "Processing the tool result..." three times each. The
+tasks are streamed over SSE and every received event is counted with the size of its
+JSON payload.
+
+    uv run python -m benchmarks.status_updates --tasks 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+from uuid import uuid4
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import Message, Part, Role, TextPart
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+
+DEFAULT_BASE_PORT = 19900
+
+SCRIPT = [
+    {"tool": "get_weather", "args": {"city_name": "Tokyo"}},
+    {"tool": "get_weather", "args": {"city_name": "Osaka"}},
+    {"tool": "get_weather", "args": {"city_name": "Sapporo"}},
+    {"text": "{last}"},
+]
+
+# Name -> (STATUS_UPDATES, STATUS_UPDATE_INTERVAL)
+POLICIES = {
+    "all": ("all", "0"),
+    "dedupe": ("dedupe", "0"),
+    "all, 1 per 0.25s": ("all", "0.25"),
+    "final_only": ("final_only", "0"),
+}
+
+
+async def measure(mode: str, interval: str, tasks: int, latency: float, port: int) -> tuple[float, float]:
+    """Return the average events and payload bytes per task."""
+    # build_app reads the policy from the environment
+    os.environ["STATUS_UPDATES"] = mode
+    os.environ["STATUS_UPDATE_INTERVAL"] = interval
+    spec = load_spec("weather_agent")
+    url = f"http://127.0.0.1:{port}/"
+    app = build_app(spec, url=url, model=ScriptedChatModel(script=SCRIPT, latency=latency))
+
+    events = 0
+    size = 0
+    async with serve_apps({"weather_agent": app}, port), httpx.AsyncClient(timeout=60) as httpx_client:
+        client = await ClientFactory.connect(url, client_config=ClientConfig(httpx_client=httpx_client, streaming=True))
+        for _ in range(tasks):
+            message = Message(role=Role.user, parts=[Part(TextPart(text=QUERIES["weather_agent"]))], message_id=uuid4().hex)
+            async for event in client.send_message(message):
+                # The first event is the task itself, later ones are its updates
+                task, update = event if isinstance(event, tuple) else (event, None)
+                events += 1
+                size += len((update or task).model_dump_json(exclude_none=True))
+    return events / tasks, size / tasks
+
+
+async def run(tasks: int, latency: float, base_port: int) -> None:
+    print(f"{tasks} streamed tasks, 4 model calls of {latency}s each")
+    print(f"{'STATUS_UPDATES':<20}{'events/task':>13}{'bytes/task':>12}")
+    for offset, (name, (mode, interval)) in enumerate(POLICIES.items()):
+        events, size = await measure(mode, interval, tasks, latency, base_port + offset)
+        print(f"{name:<20}{events:>13.1f}{size:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks per policy")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per scripted model call")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the first agent")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run(args.tasks, args.latency, args.base_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill, UnsupportedOperationError
+from a2a.utils import new_agent_text_message
+from a2a.utils.errors import ServerError
+from starlette.applications import Starlette
+
+
+class EchoAgentExecutor(AgentExecutor):
+    """Answers every message with a direct message echoing it, after an optional delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        await event_queue.enqueue_event(new_agent_text_message(f"echo: {context.get_user_input()}", context.context_id))
+
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        raise ServerError(error=UnsupportedOperationError())
+
+
+def build_stub_app(url: str, delay: float = 0.0, streaming: bool = False) -> Starlette:
+    """
+    Build a minimal A2A agent, so the client side dominates what is measured.
+
+    Args:
+        url: Public URL for the agent card
+        delay: Seconds the agent takes per message
+        streaming: Advertise streaming in the agent card
+
+    Returns:
+        Starlette: The A2A application
+    """
+    card = AgentCard(
+        name="Echo Agent",
+        description="Echoes the message back",
+        url=url,
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=streaming),
+        skills=[AgentSkill(id="echo", name="Echo", description="Echo the message", tags=["echo"])],
+    )
+    handler = DefaultRequestHandler(agent_executor=EchoAgentExecutor(delay), task_store=InMemoryTaskStore())
+    return A2AStarletteApplication(agent_card=card, http_handler=handler).build()
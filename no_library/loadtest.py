@@ -0,0 +1,426 @@
+"""
+End-to-end load test of the supervisor and the remote agents with scripted models.
+
+The remote agents are served on localhost by uvicorn in this process and the supervisor
+graph calls them over A2A exactly as in production; only the LLM calls are replaced by
+ScriptedChatModel, so the numbers show the cost of everything around the model.
+Concurrent sessions each run several turns, and latency is reported per layer:
+
+- supervisor: one supervisor turn, as seen by the caller
+- a2a_hop: one a2a_send_message call, including HTTP and the remote agent
+- remote_graph: one run of a remote agent's graph
+- supervisor_model / remote_model: one (scripted) model call
+
+Results can be written to JSON and compared with an earlier run, e.g. of another commit:
+
+    uv run python -m no_library.loadtest --sessions 20 --turns 5 --output loadtest.json
+    uv run python -m no_library.loadtest --compare loadtest.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+
+from a2a_common.app_factory import AgentSpec, build_app
+from a2a_common.fake_model import Latency, ScriptedChatModel
+from a2a_common.metrics import percentile
+from a2a_common.tracing import create_tracing_handler, setup_tracing, tracer
+
+from .supervisor_agent.a2a_client import A2AClientToolProvider
+from .supervisor_agent.graph import build_supervisor
+from .supervisor_agent.timing import TimingCallbackHandler, TimingRecorder
+
+DEFAULT_SESSIONS = 10
+DEFAULT_TURNS = 3
+DEFAULT_BASE_PORT = 19100
+DEFAULT_MODEL_LATENCY = 0.05  # seconds per scripted model call
+
+# Question each session asks, by agent
+QUERIES = {
+    "weather_agent": "What is the weather like in Tokyo?",
+    "currency_agent": "What is the exchange rate between USD and JPY?",
+}
+
+LAYERS = ("supervisor", "a2a_hop", "remote_graph", "supervisor_model", "remote_model")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LayerSamples:
+    """Latencies of one layer, kept in full so percentiles are exact."""
+
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+    def add(self, duration: float, error: bool = False) -> None:
+        self.durations.append(duration)
+        self.errors += error
+
+
+    def summary(self) -> dict[str, Any]:
+        durations = sorted(self.durations)
+        return {
+            "count": len(durations),
+            "errors": self.errors,
+            "mean": sum(durations) / len(durations) if durations else 0.0,
+            "p50": percentile(durations, 0.50),
+            "p95": percentile(durations, 0.95),
+            "p99": percentile(durations, 0.99),
+            "max": durations[-1] if durations else 0.0,
+        }
+
+
+class LayerRecorder(TimingRecorder):
+    """Timing recorder that also keeps every model and tool span in a layer."""
+
+    def __init__(self, layers: dict[str, LayerSamples], model_layer: str):
+        super().__init__()
+        self.layers = layers
+        self.model_layer = model_layer
+
+
+    def record(self, kind, name, wall, cpu, thread_id=None, agent=None, error=False) -> None:
+        super().record(kind, name, wall, cpu, thread_id=thread_id, agent=agent, error=error)
+        if kind == "model":
+            self.layers[self.model_layer].add(wall, error)
+        elif kind == "tool" and name == "a2a_send_message":
+            self.layers["a2a_hop"].add(wall, error)
+
+
+class TimedGraph:
+    """Compiled graph proxy that times each run of the remote agent's graph."""
+
+    def __init__(self, graph, layers: dict[str, LayerSamples], handler: TimingCallbackHandler):
+        self._graph = graph
+        self._layers = layers
+        self._handler = handler
+
+
+    def __getattr__(self, name: str):
+        return getattr(self._graph, name)
+
+
+    async def astream(self, inputs, config=None, **kwargs):
+        config = {**(config or {})}
+        config["callbacks"] = [*(config.get("callbacks") or []), self._handler]
+        start = time.perf_counter()
+        error = True
+        try:
+            async for chunk in self._graph.astream(inputs, config, **kwargs):
+                yield chunk
+            error = False
+        finally:
+            self._layers["remote_graph"].add(time.perf_counter() - start, error)
+
+
+def load_spec(name: str) -> AgentSpec:
+    """Return the AgentSpec of a no_library remote agent module, e.g. "weather_agent"."""
+    return importlib.import_module(f"{__package__}.remote_agents.{name}").spec
+
+
+def _timed_spec(spec: AgentSpec, layers: dict[str, LayerSamples], handler: TimingCallbackHandler) -> AgentSpec:
+    return replace(spec, build_agent=lambda model, checkpointer: TimedGraph(spec.build_agent(model, checkpointer), layers, handler))
+
+
+def _tool_failed(message) -> bool:
+    # A2A tools report failures in their result instead of raising
+    if message.type != "tool":
+        return False
+    if message.status == "error":
+        return True
+    try:
+        return json.loads(message.text).get("status") == "error"
+    except (ValueError, AttributeError):
+        return "'status': 'error'" in message.text
+
+
+@asynccontextmanager
+async def serve_apps(apps: dict[str, Any], base_port: int) -> AsyncIterator[dict[str, str]]:
+    """
+    Serve ASGI applications on localhost in this process, on consecutive ports.
+
+    Args:
+        apps: Applications by name
+        base_port: Port of the first application; the others use the following ports
+
+    Yields:
+        dict[str, str]: URL of each application by name, once all of them accept connections
+    """
+    servers = []
+    try:
+        for offset, app in enumerate(apps.values()):
+            server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=base_port + offset, log_level="warning"))
+            servers.append((server, asyncio.create_task(server.serve())))
+        while not all(server.started for server, _ in servers):
+            if any(task.done() for _, task in servers):
+                raise RuntimeError("A server failed to start (is the port in use? try --base-port)")
+            await asyncio.sleep(0.05)
+        yield {name: f"http://127.0.0.1:{base_port + offset}/" for offset, name in enumerate(apps)}
+    finally:
+        for server, _ in servers:
+            server.should_exit = True
+        await asyncio.gather(*(task for _, task in servers), return_exceptions=True)
+
+
+async def _run_turns(supervisor, thread_id: str, query: str, turns: int, think_time: float, layers: dict[str, LayerSamples], handler) -> None:
+    tracing_handler = create_tracing_handler()
+    callbacks = [handler] if tracing_handler is None else [handler, tracing_handler]
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": callbacks}
+    for turn in range(turns):
+        start = time.perf_counter()
+        try:
+            with tracer.start_as_current_span("supervisor.turn", attributes={"thread_id": thread_id}):
+                result = await supervisor.ainvoke({"messages": [{"role": "user", "content": query}]}, config)
+        except Exception as e:
+            logger.warning(f"{thread_id} turn {turn} failed: {e}")
+            layers["supervisor"].add(time.perf_counter() - start, error=True)
+        else:
+            # Only the messages of this turn: everything after the last user message
+            messages = result["messages"]
+            turn_start = max(i for i, m in enumerate(messages) if m.type == "human")
+            failed = any(_tool_failed(m) for m in messages[turn_start:])
+            layers["supervisor"].add(time.perf_counter() - start, error=failed)
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+async def run(
+    agents: list[str],
+    sessions: int = DEFAULT_SESSIONS,
+    turns: int = DEFAULT_TURNS,
+    supervisor_latency: float | str = DEFAULT_MODEL_LATENCY,
+    remote_latency: float | str = DEFAULT_MODEL_LATENCY,
+    seed: int | None = None,
+    think_time: float = 0.0,
+    streaming: bool = False,
+    base_port: int = DEFAULT_BASE_PORT,
+) -> dict[str, Any]:
+    """
+    Serve the agents, drive concurrent supervisor sessions against them and collect latencies.
+
+    Session i asks agents[i % len(agents)] the same question on every turn. One warm-up
+    turn per agent (agent card fetch, connection setup) runs before measuring.
+
+    Args:
+        agents: Remote agent modules to serve (keys of QUERIES)
+        sessions: Concurrent sessions (conversations)
+        turns: Turns per session
+        supervisor_latency: Seconds per supervisor model call, or a distribution (see Latency)
+        remote_latency: Seconds per remote agent model call, or a distribution
+        seed: Seed of the latency samples
+        think_time: Seconds each session waits between turns
+        streaming: Call the remote agents with SSE streaming
+        base_port: Port of the first remote agent; the others use the following ports
+
+    Returns:
+        dict: Configuration, duration, throughput and per-layer latency summaries
+    """
+    setup_tracing("loadtest")  # TRACING=file writes the spans of every turn as well
+    layers = {name: LayerSamples() for name in LAYERS}
+    remote_handler = TimingCallbackHandler(LayerRecorder(layers, "remote_model"))
+    supervisor_handler = TimingCallbackHandler(LayerRecorder(layers, "supervisor_model"))
+
+    apps = {}
+    for offset, name in enumerate(agents):
+        spec = load_spec(name)
+        # The agent's own offline script: call its tool, then answer with the result
+        model = ScriptedChatModel(script=spec.script, latency=remote_latency, seed=seed)
+        apps[name] = build_app(_timed_spec(spec, layers, remote_handler), url=f"http://127.0.0.1:{base_port + offset}/", model=model)
+
+    async with serve_apps(apps, base_port) as urls:
+        provider = A2AClientToolProvider(known_agent_urls=list(urls.values()), streaming=streaming)
+        # One supervisor graph per target agent; they share the provider and its connection pool
+        supervisors = {
+            name: build_supervisor(
+                provider,
+                list(urls.values()),
+                model=ScriptedChatModel(
+                    script=[
+                        {"tool": "a2a_send_message", "args": {"message_text": "{input}", "target_agent_url": url}},
+                        {"text": "{last}"},
+                    ],
+                    latency=supervisor_latency,
+                    seed=seed,
+                ),
+            )
+            for name, url in urls.items()
+        }
+        try:
+            for name in agents:
+                await _run_turns(supervisors[name], f"loadtest-warmup-{name}", QUERIES[name], 1, 0.0, layers, supervisor_handler)
+            for samples in layers.values():
+                samples.durations.clear()
+                samples.errors = 0
+
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                _run_turns(
+                    supervisors[agents[session % len(agents)]],
+                    f"loadtest-{session}",
+                    QUERIES[agents[session % len(agents)]],
+                    turns,
+                    think_time,
+                    layers,
+                    supervisor_handler,
+                )
+                for session in range(sessions)
+            ))
+            duration = time.perf_counter() - start
+        finally:
+            await provider.aclose()
+
+    completed = len(layers["supervisor"].durations) - layers["supervisor"].errors
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "agents": agents,
+            "sessions": sessions,
+            "turns": turns,
+            "supervisor_latency": supervisor_latency,
+            "remote_latency": remote_latency,
+            "seed": seed,
+            "think_time": think_time,
+            "streaming": streaming,
+        },
+        "duration": duration,
+        "turns_completed": completed,
+        "throughput": completed / duration if duration else 0.0,
+        "layers": {name: samples.summary() for name, samples in layers.items()},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_report(result: dict[str, Any], baseline: dict[str, Any] | None = None) -> str:
+    lines = [
+        f"{result['turns_completed']} turns in {result['duration']:.2f}s: {result['throughput']:.1f} turns/s"
+        + (f" (baseline {baseline['throughput']:.1f})" if baseline else ""),
+        f"{'layer':<18}{'count':>7}{'errors':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for name, layer in result["layers"].items():
+        lines.append(
+            f"{name:<18}{layer['count']:>7}{layer['errors']:>7}"
+            + "".join(f"{layer[key] * 1000:>10.1f}" for key in ("mean", "p50", "p95", "p99"))
+        )
+        base = (baseline or {}).get("layers", {}).get(name)
+        if base:
+            lines.append(
+                f"{'  baseline':<32}"
+                + "".join(f"{base[key] * 1000:>10.1f}" for key in ("mean", "p50", "p95", "p99"))
+            )
+    return "\n".join(lines)
+
+
+def regressions(result: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    """
+    List the layers whose p95 latency grew by more than max_regression (0.2 = 20%).
+
+    Returns:
+        list[str]: One description per regressed layer (empty when there is none)
+    """
+    found = []
+    for name, layer in result["layers"].items():
+        base = baseline.get("layers", {}).get(name)
+        if base and base["p95"] and layer["p95"] > base["p95"] * (1 + max_regression):
+            found.append(f"{name}: p95 {base['p95'] * 1000:.1f} ms -> {layer['p95'] * 1000:.1f} ms")
+    if baseline.get("throughput") and result["throughput"] < baseline["throughput"] / (1 + max_regression):
+        found.append(f"throughput: {baseline['throughput']:.1f} -> {result['throughput']:.1f} turns/s")
+    return found
+
+
+def _latency(value: str) -> float | str:
+    Latency.parse(value)  # rejects malformed values with a usage error
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the supervisor and remote agents with scripted models")
+    parser.add_argument("--agents", default=",".join(QUERIES), help="Comma separated remote agents to serve")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS, help="Turns per session")
+    parser.add_argument(
+        "--supervisor-latency",
+        type=_latency,
+        default=DEFAULT_MODEL_LATENCY,
+        help="Seconds per supervisor model call, or a distribution such as lognormal:0.8,0.5",
+    )
+    parser.add_argument("--remote-latency", type=_latency, default=DEFAULT_MODEL_LATENCY, help="Same for remote model calls")
+    parser.add_argument("--seed", type=int, help="Seed of the latency samples")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between turns of a session")
+    parser.add_argument("--streaming", action="store_true", help="Call the remote agents with SSE streaming")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="Port of the first remote agent")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        help="With --compare, exit with status 1 when a layer's p95 (or throughput) is worse by more than this fraction",
+    )
+    args = parser.parse_args()
+
+    # The agent modules configure INFO logging when imported; keep the report readable
+    logging.basicConfig(level=logging.WARNING, force=True)
+    agents = [name.strip() for name in args.agents.split(",") if name.strip()]
+    unknown = [name for name in agents if name not in QUERIES]
+    if unknown:
+        parser.error(f"No script for {', '.join(unknown)} (known: {', '.join(QUERIES)})")
+
+    result = asyncio.run(run(
+        agents,
+        sessions=args.sessions,
+        turns=args.turns,
+        supervisor_latency=args.supervisor_latency,
+        remote_latency=args.remote_latency,
+        seed=args.seed,
+        think_time=args.think_time,
+        streaming=args.streaming,
+        base_port=args.base_port,
+    ))
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    print(format_report(result, baseline))
+    if baseline is not None and baseline.get("config") != result["config"]:
+        print(f"Note: the baseline ran with a different configuration: {baseline.get('config')}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    if baseline is not None and args.max_regression is not None:
+        found = regressions(result, baseline, args.max_regression)
+        if found:
+            print("Regressions:\n" + "\n".join(f"- {line}" for line in found))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
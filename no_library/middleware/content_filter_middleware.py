@@ -1,36 +1,127 @@
-from typing import Never
+import unicodedata
+from collections import deque
+from typing import Annotated, Any
+
 from langchain.agents.middleware import AgentMiddleware, AgentState, hook_config
+from langchain.agents.middleware.types import PrivateStateAttr
+from langchain_core.messages import AIMessage, RemoveMessage
 from langgraph.runtime import Runtime
+from typing_extensions import NotRequired
+
+
+def normalize(text: str) -> str:
+    """NFKC (full/half width, compatibility characters) plus case folding."""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton: finds any of many keywords in one pass over the text."""
+
+    def __init__(self, keywords: list[str]):
+        # Node 0 is the root; each node has its transitions, failure link and matched keyword
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[str | None] = [None]
+        for keyword in keywords:
+            self._add(normalize(keyword))
+        self._link()
+
+
+    def _add(self, keyword: str) -> None:
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        self._output[node] = keyword
+
+
+    def _link(self) -> None:
+        # Breadth first, so failure links always point at shallower, already linked nodes
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # A keyword ending at the failure target also ends here
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+                queue.append(child)
+
+
+    def search(self, text: str) -> str | None:
+        """Return the first keyword found in the (already normalized) text, or None."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node] is not None:
+                return output[node]
+        return None
+
+
+class ContentFilterState(AgentState):
+    # Number of messages already checked, so each turn only scans what was added
+    content_filter_checked: NotRequired[Annotated[int, PrivateStateAttr]]
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    # Content blocks: only text parts can contain keywords
+    return " ".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, str) or (isinstance(block, dict) and block.get("type") == "text")
+    )
+
 
 class ContentFilterMiddleware(AgentMiddleware):
     """Deterministic guardrail: Block requests containing banned keywords."""
 
+    state_schema = ContentFilterState
+
     def __init__(self, banned_keywords: list[str]):
         super().__init__()
-        self.banned_keywords = [kw.lower() for kw in banned_keywords]
+        self.banned_keywords = [normalize(kw) for kw in banned_keywords]
+        self._matcher = KeywordMatcher(self.banned_keywords)
 
     @hook_config(can_jump_to=["end"])
-    def before_agent(self, state: AgentState, runtime: Runtime) -> dict[str, Never] | None:
-        # Get the first user message
-        if not state["messages"]:
-            return None
-
-        first_message = state["messages"][0]
-        if first_message.type != "human":
-            return None
+    def before_agent(self, state: ContentFilterState, runtime: Runtime) -> dict[str, Any] | None:
+        messages = state["messages"]
+        checked = state.get("content_filter_checked", 0)
+        if checked > len(messages):
+            # The history was trimmed or replaced; check all of it again
+            checked = 0
 
-        content = first_message.content.lower()
-
-        # Check for banned keywords
-        for keyword in self.banned_keywords:
-            if keyword in content:
-                # Block execution before any processing
+        # Check every user message added since the last turn (not only the first one)
+        for message in messages[checked:]:
+            if message.type != "human":
+                continue
+            if self._matcher.search(normalize(_text(message.content))) is not None:
+                # Block execution before any processing. The blocked message leaves the
+                # history, so later turns (which only check new messages) never show it to the model.
                 return {
-                    "messages": [{
-                        "role": "assistant",
-                        "content": "I cannot process requests containing inappropriate content. Please rephrase your request."
-                    }],
+                    "messages": [
+                        RemoveMessage(id=message.id),
+                        AIMessage(
+                            content="I cannot process requests containing inappropriate content. Please rephrase your request."
+                        ),
+                    ],
+                    "content_filter_checked": len(messages),
                     "jump_to": "end"
                 }
 
-        return None
+        return {"content_filter_checked": len(messages)}
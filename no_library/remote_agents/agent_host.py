@@ -0,0 +1,48 @@
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Custom
+from a2a_common.app_factory import serve_app
+from a2a_common.host import DEFAULT_HOST_PORT, build_host_app
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENTS = "weather_agent,currency_agent,03_remote_agent,04_remote_agent"
+# The with_library LangGraph agents (03_remote_agent, 04_remote_agent) expose a spec as well
+WITH_LIBRARY_DIR = Path(__file__).resolve().parents[2] / "with_library"
+
+
+def _load_module(name: str):
+    # with_library holds scripts rather than a package, so its agents are loaded by path
+    path = WITH_LIBRARY_DIR / f"{name}.py"
+    if not path.exists():
+        return importlib.import_module(name)
+    module_spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[name] = module
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def load_specs():
+    names = [name.strip() for name in os.getenv("HOST_AGENTS", DEFAULT_AGENTS).split(",") if name.strip()]
+    return [_load_module(name).spec for name in names]
+
+
+def create_app():
+    return build_host_app(load_specs())
+
+
+if __name__ == '__main__':
+    serve_app('agent_host', DEFAULT_HOST_PORT, 'agent_host:create_app')
+
+# uv run agent_host.py
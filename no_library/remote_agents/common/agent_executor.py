@@ -1,90 +0,0 @@
-import logging
-
-from a2a.server.agent_execution import AgentExecutor, RequestContext
-from a2a.server.events import EventQueue
-from a2a.server.tasks import TaskUpdater
-from a2a.types import (
-    InternalError,
-    Part,
-    TaskState,
-    TextPart,
-    UnsupportedOperationError,
-)
-from a2a.utils import (
-    new_agent_text_message,
-    new_task,
-)
-from a2a.utils.errors import ServerError
-
-from .adapter import LangGraphAgentAdapter
-
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class LangGraphAgentExecutor(AgentExecutor):
-    """LangGraph AgentExecutor Example."""
-
-    def __init__(self, adapter: LangGraphAgentAdapter):
-        self.adapter = adapter
-
-    async def execute(
-        self,
-        context: RequestContext,
-        event_queue: EventQueue,
-    ) -> None:
-        # error = self._validate_request(context)
-        # if error:
-        #     raise ServerError(error=InvalidParamsError())
-
-        query = context.get_user_input()
-        task = context.current_task
-        if not task:
-            task = new_task(context.message)  # type: ignore
-            await event_queue.enqueue_event(task)
-        updater = TaskUpdater(event_queue, task.id, task.context_id)
-        try:
-            async for item in self.adapter.stream(query, task.context_id):
-                is_task_complete = item['is_task_complete']
-                require_user_input = item['require_user_input']
-
-                if not is_task_complete and not require_user_input:
-                    await updater.update_status(
-                        TaskState.working,
-                        new_agent_text_message(
-                            item['content'],
-                            task.context_id,
-                            task.id,
-                        ),
-                    )
-                elif require_user_input:
-                    await updater.update_status(
-                        TaskState.input_required,
-                        new_agent_text_message(
-                            item['content'],
-                            task.context_id,
-                            task.id,
-                        ),
-                        final=True,
-                    )
-                    break
-                else:
-                    await updater.add_artifact(
-                        [Part(root=TextPart(text=item['content']))],
-                        name='tool_result',
-                    )
-                    await updater.complete()
-                    break
-
-        except Exception as e:
-            logger.error(f'An error occurred while streaming the response: {e}')
-            raise ServerError(error=InternalError()) from e
-
-    # def _validate_request(self, context: RequestContext) -> bool:
-    #     return False
-
-    async def cancel(
-        self, context: RequestContext, event_queue: EventQueue
-    ) -> None:
-        raise ServerError(error=UnsupportedOperationError())
\ No newline at end of file
@@ -1,32 +1,22 @@
-import os
 import logging
 
-# client/server
-import httpx
-import uvicorn
-
 # A2A
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
+    AgentExtension,
     AgentSkill,
 )
 
 # LangChain/LangGraph
 from langchain_core.tools import tool
 from langchain.agents import create_agent
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 # Custom
-from common.agent_executor import LangGraphAgentExecutor
-from common.adapter import LangGraphAgentAdapter
+from a2a_common.adapter import LangGraphAgentAdapter
+from a2a_common.app_factory import AgentSpec, build_app, serve
+from a2a_common.fast_path import QUESTION_PREFIX, SENTENCE_END, FastPathRoute, create_fast_path
 
 from dotenv import load_dotenv
 
@@ -35,10 +25,6 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-PUBLIC_HOST = os.getenv("PUBLIC_HOST", "currency-agent")
-BIND_HOST = os.getenv("BIND_HOST", "0.0.0.0")
-port = int(os.getenv("PORT", "9000"))
-
 
 @tool
 def get_exchange_rate():
@@ -46,21 +32,34 @@ def get_exchange_rate():
     return "1 USD = 147円"
 
 
-agent = create_agent(
-    model="openai:gpt-4.1-nano",
-    tools=[get_exchange_rate],
-    checkpointer=InMemorySaver(),
-    system_prompt=(
-        'You are a specialized assistant for currency conversions. '
-        "Your sole purpose is to use the 'get_exchange_rate' tool to answer questions about currency exchange rates. "
-        'If the user asks about anything other than currency conversion or exchange rates, '
-        'politely state that you cannot help with that topic and can only assist with currency-related queries. '
-        'Do not attempt to answer unrelated questions or use tools for other purposes.'
-        'Set response status to input_required if the user needs to provide more information to complete the request.'
-        'Set response status to error if there is an error while processing the request.'
-        'Set response status to completed if the request is complete.'
-    ),
-)
+# Requests answered by calling get_exchange_rate directly when FAST_PATH=true (USD/JPY only)
+USD = r"(?:usd|us ?dollars?|dollars?|米?ドル)"
+JPY = r"(?:jpy|japanese yen|yen|日本円|円)"
+EXCHANGE_RATE_PATTERNS = [
+    rf"{QUESTION_PREFIX}(?:exchange )?rate (?:between |for |of |from )?(?:{USD} (?:and|to|vs\.?|/) {JPY}|{JPY} (?:and|to|vs\.?|/) {USD}){SENTENCE_END}",
+    rf"{USD} ?(?:/|to) ?{JPY}(?: (?:exchange )?rate)?{SENTENCE_END}",
+    rf"ドル円(?:の(?:為替)?レート)?(?:は|を教えて(?:ください)?)?{SENTENCE_END}",
+]
+
+
+def build_agent(model: str, checkpointer: BaseCheckpointSaver):
+    return create_agent(
+        model=model,
+        tools=[get_exchange_rate],
+        checkpointer=checkpointer,
+        middleware=create_fast_path([FastPathRoute(get_exchange_rate, EXCHANGE_RATE_PATTERNS)]),
+        system_prompt=(
+            'You are a specialized assistant for currency conversions. '
+            "Your sole purpose is to use the 'get_exchange_rate' tool to answer questions about currency exchange rates. "
+            'If the user asks about anything other than currency conversion or exchange rates, '
+            'politely state that you cannot help with that topic and can only assist with currency-related queries. '
+            'Do not attempt to answer unrelated questions or use tools for other purposes.'
+            'Set response status to input_required if the user needs to provide more information to complete the request.'
+            'Set response status to error if there is an error while processing the request.'
+            'Set response status to completed if the request is complete.'
+        ),
+    )
+
 
 skill = AgentSkill(
     id='convert_currency',
@@ -70,34 +69,48 @@ skill = AgentSkill(
     examples=['What is exchange rate between USD and GBP?'],
 )
 
-agent_card = AgentCard(
-    name='Currency Agent',
-    description='Helps with exchange rates for currencies',
-    url=f'http://{PUBLIC_HOST }:{port}/',
-    version='1.0.0',
-    default_input_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
-    default_output_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
-    capabilities=AgentCapabilities(streaming=True, push_notifications=True),
-    skills=[skill],
+
+def build_card(url: str) -> AgentCard:
+    return AgentCard(
+        name='Currency Agent',
+        description='Helps with exchange rates for currencies',
+        url=url,
+        version='1.0.0',
+        default_input_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
+        capabilities=AgentCapabilities(
+            streaming=True,
+            push_notifications=True,
+            extensions=[
+                # The rate is fixed, so supervisors may reuse answers for the same question
+                AgentExtension(
+                    uri='urn:a2a-git-samples:extensions:cacheable-responses/v1',
+                    description='Responses depend only on the request text',
+                    params={'ttl_seconds': 3600},
+                )
+            ],
+        ),
+        skills=[skill],
+    )
+
+
+spec = AgentSpec(
+    name='currency_agent',
+    default_port=9000,
+    default_public_host='currency-agent',
+    model='openai:gpt-4.1-nano',
+    build_agent=build_agent,
+    build_card=build_card,
+    # Offline stand-in for the model (MODEL_BACKEND=scripted): call the tool, answer with its result
+    script=[{"tool": "get_exchange_rate", "args": {}}, {"text": "{last}"}],
 )
 
-httpx_client = httpx.AsyncClient()
-push_config_store = InMemoryPushNotificationConfigStore()
-push_sender = BasePushNotificationSender(httpx_client=httpx_client,
-                config_store=push_config_store)
 
+def create_app():
+    return build_app(spec)
 
-adapter = LangGraphAgentAdapter(agent=agent)
-request_handler = DefaultRequestHandler(
-    agent_executor=LangGraphAgentExecutor(adapter=adapter),
-    task_store=InMemoryTaskStore(),
-    push_config_store=push_config_store,
-    push_sender=push_sender
-)
-server = A2AStarletteApplication(
-    agent_card=agent_card, http_handler=request_handler
-)
 
-uvicorn.run(server.build(), host=BIND_HOST, port=port)
+if __name__ == '__main__':
+    serve(spec, 'currency_agent:create_app')
 
-# uv run currency_agent.py
\ No newline at end of file
+# uv run currency_agent.py --workers 4
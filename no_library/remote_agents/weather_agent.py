@@ -1,18 +1,6 @@
-import os
 import logging
 
-# client/server
-import httpx
-import uvicorn
-
 # A2A
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
@@ -22,11 +10,19 @@ from a2a.types import (
 # LangChain/LangGraph
 from langchain_core.tools import tool
 from langchain.agents import create_agent
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 # Custom
-from common.agent_executor import LangGraphAgentExecutor
-from common.adapter import LangGraphAgentAdapter
+from a2a_common.adapter import LangGraphAgentAdapter
+from a2a_common.app_factory import AgentSpec, build_app, serve
+from a2a_common.fast_path import (
+    CITY_NAME,
+    JA_CITY_NAME,
+    QUESTION_PREFIX,
+    SENTENCE_END,
+    FastPathRoute,
+    create_fast_path,
+)
 
 from dotenv import load_dotenv
 
@@ -35,10 +31,6 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-PUBLIC_HOST = os.getenv("PUBLIC_HOST", "weather-agent")
-BIND_HOST = os.getenv("BIND_HOST", "0.0.0.0")
-port = int(os.getenv("PORT", "9001"))
-
 
 @tool
 def get_weather(city_name: str) -> str:
@@ -46,21 +38,31 @@ def get_weather(city_name: str) -> str:
     return f"{city_name} is Sunny"
 
 
-agent = create_agent(
-    model="openai:gpt-4.1-nano",
-    tools=[get_weather],
-    checkpointer=InMemorySaver(),
-    system_prompt=(
-        'You are a specialized assistant for weather information.'
-        "Your sole purpose is to use the 'get_weather' tool to answer questions about weather conditions. "
-        'If the user asks about anything other than weather information, '
-        'politely state that you cannot help with that topic and can only assist with weather-related queries. '
-        'Do not attempt to answer unrelated questions or use tools for other purposes.'
-        'Set response status to input_required if the user needs to provide more information to complete the request.'
-        'Set response status to error if there is an error while processing the request.'
-        'Set response status to completed if the request is complete.'
-    ),
-)
+# Requests answered by calling get_weather directly when FAST_PATH=true
+WEATHER_PATTERNS = [
+    rf"{QUESTION_PREFIX}weather(?: like)? (?:in|for|at) {CITY_NAME}(?: (?:today|now|right now))?{SENTENCE_END}",
+    rf"{JA_CITY_NAME}の天気(?:は|を教えて(?:ください)?)?{SENTENCE_END}",
+]
+
+
+def build_agent(model: str, checkpointer: BaseCheckpointSaver):
+    return create_agent(
+        model=model,
+        tools=[get_weather],
+        checkpointer=checkpointer,
+        middleware=create_fast_path([FastPathRoute(get_weather, WEATHER_PATTERNS)]),
+        system_prompt=(
+            'You are a specialized assistant for weather information.'
+            "Your sole purpose is to use the 'get_weather' tool to answer questions about weather conditions. "
+            'If the user asks about anything other than weather information, '
+            'politely state that you cannot help with that topic and can only assist with weather-related queries. '
+            'Do not attempt to answer unrelated questions or use tools for other purposes.'
+            'Set response status to input_required if the user needs to provide more information to complete the request.'
+            'Set response status to error if there is an error while processing the request.'
+            'Set response status to completed if the request is complete.'
+        ),
+    )
+
 
 skill = AgentSkill(
     id='get_weather',
@@ -70,33 +72,37 @@ skill = AgentSkill(
     examples=['What is the weather like in New York?', 'Tell me the weather in San Francisco'],
 )
 
-agent_card = AgentCard(
-    name='Weather Expert',
-    description='Fetch the current weather for a location',
-    url=f'http://{PUBLIC_HOST}:{port}/',
-    version='1.0.0',
-    default_input_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
-    default_output_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
-    capabilities=AgentCapabilities(streaming=True, push_notifications=True),
-    skills=[skill],
-)
 
-httpx_client = httpx.AsyncClient()
-push_config_store = InMemoryPushNotificationConfigStore()
-push_sender = BasePushNotificationSender(httpx_client=httpx_client,
-                config_store=push_config_store)
-
-adapter = LangGraphAgentAdapter(agent=agent)
-request_handler = DefaultRequestHandler(
-    agent_executor=LangGraphAgentExecutor(adapter=adapter),
-    task_store=InMemoryTaskStore(),
-    push_config_store=push_config_store,
-    push_sender=push_sender
-)
-server = A2AStarletteApplication(
-    agent_card=agent_card, http_handler=request_handler
+def build_card(url: str) -> AgentCard:
+    return AgentCard(
+        name='Weather Expert',
+        description='Fetch the current weather for a location',
+        url=url,
+        version='1.0.0',
+        default_input_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=LangGraphAgentAdapter.SUPPORTED_CONTENT_TYPES,
+        capabilities=AgentCapabilities(streaming=True, push_notifications=True),
+        skills=[skill],
+    )
+
+
+spec = AgentSpec(
+    name='weather_agent',
+    default_port=9001,
+    default_public_host='weather-agent',
+    model='openai:gpt-4.1-nano',
+    build_agent=build_agent,
+    build_card=build_card,
+    # Offline stand-in for the model (MODEL_BACKEND=scripted): call the tool, answer with its result
+    script=[{"tool": "get_weather", "args": {"city_name": "Tokyo"}}, {"text": "{last}"}],
 )
 
-uvicorn.run(server.build(), host=BIND_HOST, port=port)
 
-# uv run weather_agent.py
\ No newline at end of file
+def create_app():
+    return build_app(spec)
+
+
+if __name__ == '__main__':
+    serve(spec, 'weather_agent:create_app')
+
+# uv run weather_agent.py --workers 4
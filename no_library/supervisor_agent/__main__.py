@@ -1,12 +1,15 @@
 import asyncio
+import json
 import logging
 import os
-from langchain.agents import create_agent
 from .a2a_client import A2AClientToolProvider
-from langgraph.checkpoint.memory import InMemorySaver
-
-from ..middleware.content_filter_middleware import ContentFilterMiddleware
-
+from .card_cache import DEFAULT_CARD_TTL, AgentCardCache
+from .graph import DEFAULT_SUPERVISOR_MODEL, SUPERVISOR_SCRIPT, build_supervisor
+from .response_cache import ResponseCache
+from .result_projection import parse_result_mode
+from .timing import create_timing_handler
+from a2a_common.model_backend import create_chat_model
+from a2a_common.tracing import create_tracing_handler, setup_tracing, tracer
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -14,6 +17,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Opt-in: export spans of each turn, including the remote agents' (TRACING=memory / file / otlp)
+setup_tracing("supervisor")
+
 
 def _load_known_agent_urls() -> list[str]:
     raw_urls = os.getenv(
@@ -24,62 +30,98 @@ def _load_known_agent_urls() -> list[str]:
 
 
 known_agent_urls = _load_known_agent_urls()
-known_agent_url_lines = "\n".join(f"- Agent URL: \"{url}\"" for url in known_agent_urls)
-
-# Create A2A client tool provider with known agent URLs
-provider = A2AClientToolProvider(known_agent_urls=known_agent_urls)
 
-system_prompt = f"""
-You are a team supervisor. Use A2A tools to delegate tasks.
+# Serve agent cards from the last snapshot right away; they are refreshed in the background
+card_cache = AgentCardCache(
+    ttl=float(os.getenv("AGENT_CARD_TTL", DEFAULT_CARD_TTL)),
+    snapshot_path=os.getenv("AGENT_CARD_CACHE_PATH"),
+    serve_stale=True,
+)
+card_cache.load_snapshot()
 
-IMPORTANT:
-- When calling `a2a_send_message`, `target_agent_url` MUST be a full URL including scheme.
-{known_agent_url_lines}
-- Do NOT pass agent names like "currency agent" as `target_agent_url`.
-- If a tool call is rejected, do NOT propose the same tool call again in this conversation.
-- If all relevant tool calls are rejected, respond clearly that you cannot retrieve the information without tool execution.
-"""
+# Create A2A client tool provider with known agent URLs
+provider = A2AClientToolProvider(
+    known_agent_urls=known_agent_urls,
+    streaming=os.getenv("A2A_STREAMING", "false").lower() == "true",
+    card_cache=card_cache,
+    # Opt-in: reuse answers from agents that declare themselves cacheable
+    response_cache=ResponseCache() if os.getenv("A2A_RESPONSE_CACHE", "false").lower() == "true" else None,
+    # "compact" keeps only ids, state and answer text in tool results; unknown modes fail at startup
+    result_mode=parse_result_mode(os.getenv("A2A_RESULT_MODE", "full")),
+)
 
 # Create agent with A2A client tools
-supervisor = create_agent(
-    model="openai:gpt-4o-mini",
-    tools=provider.tools,
-    system_prompt=system_prompt,
-    checkpointer=InMemorySaver(),
-    middleware=[
-        ContentFilterMiddleware(
-            banned_keywords=["hack", "exploit", "malware","東京"]
-        ),
-    ],
+supervisor = build_supervisor(
+    provider,
+    known_agent_urls,
+    # MODEL_BACKEND=scripted / record / replay (see README)
+    model=create_chat_model(DEFAULT_SUPERVISOR_MODEL, "supervisor", SUPERVISOR_SCRIPT),
 )
 
+def _describe_a2a_event(event: dict) -> str | None:
+    """Pick the text of a streamed status/artifact update for progress output."""
+    response = event.get("response") or {}
+    if "text" in response:
+        # compact result mode
+        return response["text"] or None
+    update = response.get("update") or {}
+    if "artifact" in update:
+        parts = update["artifact"].get("parts", [])
+    else:
+        parts = ((update.get("status") or {}).get("message") or {}).get("parts", [])
+    text = "".join(part.get("text", "") for part in parts)
+    return text or None
+
+
 async def main():
 
     thread_id = "langgraph-a2a-demo"
 
     config = {"configurable": {"thread_id": thread_id}}
-
-
-
-    while True:
-        query = input("You> ").strip()
-        if not query:
-            continue
-        if query.lower() in {"exit", "quit", "q"}:
-            break
-
-        response = await supervisor.ainvoke({
-            "messages": [
-                {
-                    "role": "user",
-                    "content": query, 
-                }
-            ]
-        },config)
-
-        for message in response["messages"]:
-            if getattr(message, "content", None):
-                print(f"AI> {message.content}")
+    # Opt-in: time middleware hooks, model calls and tool calls (SUPERVISOR_TIMING=true)
+    timing = create_timing_handler()
+    callbacks = [handler for handler in (timing, create_tracing_handler()) if handler is not None]
+    if callbacks:
+        config["callbacks"] = callbacks
+
+    # Keep a reference so the background refresh is not garbage-collected
+    refresh_task = asyncio.create_task(provider.refresh_agent_cards())
+
+    try:
+        while True:
+            # Read input off the event loop so background work keeps running
+            query = (await asyncio.to_thread(input, "You> ")).strip()
+            if not query:
+                continue
+            if query.lower() in {"exit", "quit", "q"}:
+                break
+
+            response = None
+            # One trace per turn: supervisor steps, A2A calls and the remote agents' spans
+            with tracer.start_as_current_span("supervisor.turn", attributes={"thread_id": thread_id}):
+                async for mode, chunk in supervisor.astream({
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": query, 
+                        }
+                    ]
+                }, config, stream_mode=["custom", "values"]):
+                    if mode == "values":
+                        response = chunk
+                    elif text := _describe_a2a_event(chunk.get("a2a_event", {})):
+                        # Partial updates from remote agents (A2A_STREAMING=true)
+                        print(f"... {text}")
+
+            for message in response["messages"]:
+                if getattr(message, "content", None):
+                    print(f"AI> {message.content}")
+    finally:
+        refresh_task.cancel()
+        await provider.aclose()
+        if timing is not None:
+            logger.info(f"Timings:\n{json.dumps(timing.recorder.histograms(), indent=2)}")
+            timing.recorder.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
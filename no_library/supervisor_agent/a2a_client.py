@@ -1,18 +1,69 @@
 import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator, Callable
 from typing import Any
 from uuid import uuid4
 
 import httpx
-from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
-from a2a.types import AgentCard, Message, Part, PushNotificationConfig, Role, TextPart
+from a2a.client import Client, ClientConfig, ClientEvent, ClientFactory
+from a2a.types import (
+    AgentCard,
+    Message,
+    MessageSendConfiguration,
+    Part,
+    PushNotificationConfig,
+    Role,
+    TaskIdParams,
+    TaskQueryParams,
+    TaskState,
+    TextPart,
+)
 from langchain_core.tools import BaseTool as AgentTool, StructuredTool
+from langgraph.config import get_stream_writer
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from a2a_common.tracing import inject_trace_context, inject_trace_headers, tracer
+
+from .card_cache import AgentCardCache
+from .circuit_breaker import DEFAULT_FAILURE_THRESHOLD, DEFAULT_RECOVERY_TIMEOUT, CircuitBreaker, CircuitState
+from .http_pool import HostLimitedTransport
+from .response_cache import ResponseCache, response_ttl_for
+from .result_projection import (
+    DEFAULT_MAX_RESULT_CHARS,
+    ResultMode,
+    compact_card,
+    compact_message,
+    compact_task,
+    parse_result_mode,
+)
+from .skill_index import SkillIndex
 
 DEFAULT_TIMEOUT = 300  # set request timeout to 5 minutes
+DEFAULT_SEND_MESSAGES_TIMEOUT = 60  # per-agent deadline for a2a_send_messages
+DEFAULT_MAX_CONCURRENT_SENDS = 8
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_MIN_ROUTE_SCORE = 0.05  # below this a2a_route_message refuses to pick an agent
+# Non-streaming sends poll the task with tasks/get, starting at the first interval and doubling up to the second
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+RUNNING_STATES = (TaskState.submitted, TaskState.working)
+LOST_HEDGE = "lost hedge"  # cancel message for replicas abandoned because another one answered
 
 logger = logging.getLogger(__name__)
 
 
+def _get_stream_writer() -> Callable[[Any], None]:
+    """Return the LangGraph custom stream writer, or a no-op outside a graph run."""
+    try:
+        return get_stream_writer()
+    except (RuntimeError, KeyError):
+        # RuntimeError outside any runnable; KeyError inside one that is not a graph (e.g. tool.ainvoke)
+        return lambda _chunk: None
+
+
 class A2AClientToolProvider:
     """A2A Client tool provider that manages multiple A2A agents and exposes synchronous tools."""
 
@@ -22,6 +73,25 @@ class A2AClientToolProvider:
         timeout: int = DEFAULT_TIMEOUT,
         webhook_url: str | None = None,
         webhook_token: str | None = None,
+        streaming: bool = False,
+        max_concurrent_sends: int = DEFAULT_MAX_CONCURRENT_SENDS,
+        card_cache: AgentCardCache | None = None,
+        max_connections: int | None = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int | None = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections_per_host: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        pool_timeout: float | None = None,
+        http2: bool = False,
+        response_cache: ResponseCache | None = None,
+        result_mode: ResultMode | str = ResultMode.FULL,
+        max_result_chars: int = DEFAULT_MAX_RESULT_CHARS,
+        min_route_score: float = DEFAULT_MIN_ROUTE_SCORE,
+        failure_threshold: int | None = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        slow_call_threshold: float | None = None,
+        agent_replicas: dict[str, list[str]] | None = None,
+        hedge_delay: float | None = None,
     ):
         """
         Initialize A2A client tool provider.
@@ -31,13 +101,74 @@ class A2AClientToolProvider:
             timeout: Timeout for HTTP operations in seconds (defaults to 300)
             webhook_url: Optional webhook URL for push notifications
             webhook_token: Optional authentication token for webhook notifications
+            streaming: Use SSE streaming when the agent card advertises it. Intermediate
+                status/artifact updates are emitted as LangGraph custom stream events
+                (stream_mode="custom") while a2a_send_message runs. Without streaming the
+                message is sent non-blocking and the task is polled with tasks/get. Either
+                way, a task that is abandoned (deadline, lost hedge) is canceled on the
+                agent with tasks/cancel.
+            max_concurrent_sends: Maximum number of in-flight sends for a2a_send_messages
+            card_cache: Agent card cache to use (defaults to an in-memory AgentCardCache)
+            max_connections: Maximum pooled connections in total (None for no limit)
+            max_keepalive_connections: Maximum idle keep-alive connections (None for no limit)
+            max_connections_per_host: Maximum concurrent requests per agent host (None for no limit)
+            connect_timeout: Timeout for establishing a connection (defaults to timeout)
+            read_timeout: Timeout between received bytes (defaults to timeout)
+            pool_timeout: Timeout for waiting on a pooled connection (defaults to timeout)
+            http2: Enable HTTP/2 (requires the 'h2' package, e.g. httpx[http2])
+            response_cache: Optional cache for completed responses of agents that declare
+                themselves cacheable (see response_cache.CACHEABLE_EXTENSION_URI)
+            result_mode: "full" returns complete task/card dumps; "compact" returns only
+                ids, task state and answer text (and name/url/skills for cards). Unknown
+                modes raise ValueError
+            max_result_chars: Answer text budget per result in compact mode
+            min_route_score: Minimum skill match score for a2a_route_message to send
+            failure_threshold: Consecutive failures after which an agent URL fails fast
+                (None disables circuit breaking)
+            recovery_timeout: Seconds a tripped agent URL fails fast before a probe is allowed
+            slow_call_threshold: Calls slower than this many seconds count as failures.
+                Calls abandoned by a deadline always count; a replica that loses a hedge
+                only counts when it was slower than this
+            agent_replicas: Optional map of agent URL -> replica URLs serving the same agent
+            hedge_delay: Seconds to wait on a replica before also sending to the next one
+                (None only fails over after an error)
         """
         self.timeout = timeout
+        self.streaming = streaming
         self._known_agent_urls: list[str] = known_agent_urls or []
-        self._discovered_agents: dict[str, AgentCard] = {}
+        self._card_cache = card_cache or AgentCardCache()
         self._httpx_client: httpx.AsyncClient | None = None
+        self._transport: HostLimitedTransport | None = None
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._max_connections_per_host = max_connections_per_host
+        self._http2 = http2
+        # Unset phases fall back to the overall timeout
+        self._timeouts = {
+            phase: value
+            for phase, value in {"connect": connect_timeout, "read": read_timeout, "pool": pool_timeout}.items()
+            if value is not None
+        }
         self._client_factory: ClientFactory | None = None
+        # Agent URL -> (card digest, Client); a new card digest replaces the client
+        self._clients: dict[str, tuple[str, Client]] = {}
         self._initial_discovery_done: bool = False
+        self._send_semaphore = asyncio.Semaphore(max_concurrent_sends)
+        self._response_cache = response_cache
+        self.result_mode = parse_result_mode(result_mode)
+        self.max_result_chars = max_result_chars
+        self.min_route_score = min_route_score
+        self._skill_index = SkillIndex()
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._slow_call_threshold = slow_call_threshold
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._agent_replicas = agent_replicas or {}
+        self._hedge_delay = hedge_delay
+        # tasks/cancel requests for abandoned remote tasks, kept referenced until they finish
+        self._cancellations: set[asyncio.Task] = set()
 
         # Push notification configuration
         self._webhook_url = webhook_url
@@ -55,7 +186,9 @@ class A2AClientToolProvider:
         _tools = [
             self.a2a_discover_agent,
             self.a2a_list_discovered_agents,
-            self.a2a_send_message
+            self.a2a_send_message,
+            self.a2a_send_messages,
+            self.a2a_route_message,
         ]
 
         tools = [
@@ -68,28 +201,75 @@ class A2AClientToolProvider:
     async def _ensure_httpx_client(self) -> httpx.AsyncClient:
         """Ensure the shared HTTP client is initialized."""
         if self._httpx_client is None:
-            self._httpx_client = httpx.AsyncClient(timeout=self.timeout)
+            self._transport = HostLimitedTransport(
+                max_connections_per_host=self._max_connections_per_host,
+                limits=self._limits,
+                http2=self._http2,
+            )
+            self._httpx_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, **self._timeouts),
+                transport=self._transport,
+                # W3C trace context for agents that read it from the headers (e.g. Strands)
+                event_hooks={"request": [inject_trace_headers]},
+            )
         return self._httpx_client
 
 
+    def response_cache_stats(self) -> dict[str, Any] | None:
+        """Return response cache hit/miss metrics, or None when caching is disabled."""
+        return self._response_cache.stats() if self._response_cache is not None else None
+
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Return connection pool statistics (see HostLimitedTransport.pool_stats)."""
+        if self._transport is None:
+            return {"connections": 0, "in_use": 0, "idle": 0, "waiters": 0, "host_waiters": {}}
+        return self._transport.pool_stats()
+
+
     async def _ensure_client_factory(self) -> ClientFactory:
         """Ensure the ClientFactory is initialized."""
         if self._client_factory is None:
             httpx_client = await self._ensure_httpx_client()
             config = ClientConfig(
                 httpx_client=httpx_client,
-                streaming=False,  # Use non-streaming mode for simpler response handling
+                streaming=self.streaming,
                 push_notification_configs=[self._push_config] if self._push_config else [],
             )
             self._client_factory = ClientFactory(config)
         return self._client_factory
 
 
-    async def _create_a2a_card_resolver(self, url: str) -> A2ACardResolver:
-        """Create a new A2A card resolver for the given URL."""
-        httpx_client = await self._ensure_httpx_client()
-        logger.info(f"A2ACardResolver created for {url}")
-        return A2ACardResolver(httpx_client=httpx_client, base_url=url)
+    async def _get_client(self, url: str, agent_card: AgentCard) -> Client:
+        """Return the cached A2A client for an agent, recreating it when its card changed."""
+        entry = self._card_cache.entry(url)
+        card_version = entry.digest if entry is not None else agent_card.version
+
+        cached = self._clients.get(url)
+        if cached is not None and cached[0] == card_version:
+            return cached[1]
+
+        client_factory = await self._ensure_client_factory()
+        client = client_factory.create(agent_card)
+        self._clients[url] = (card_version, client)
+        if cached is not None:
+            logger.info(f"Agent card for {url} changed, replaced its A2A client")
+        return client
+
+
+    async def aclose(self) -> None:
+        """Drop cached A2A clients and close the shared HTTP client."""
+        if self._cancellations:
+            # Let pending tasks/cancel requests go out before their connections are closed
+            await asyncio.wait(self._cancellations, timeout=5)
+        # Every client transport shares self._httpx_client, so closing it once here
+        # releases their connections; Client.close() would close it per client.
+        self._clients.clear()
+        self._client_factory = None
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+            self._transport = None
 
 
     async def _discover_known_agents(self) -> None:
@@ -117,15 +297,20 @@ class A2AClientToolProvider:
 
     async def _discover_agent_card(self, url: str) -> AgentCard:
         """Internal method to discover and cache an agent card."""
-        if url in self._discovered_agents:
-            return self._discovered_agents[url]
+        httpx_client = await self._ensure_httpx_client()
+        with tracer.start_as_current_span("a2a.discover_card", attributes={"a2a.agent_url": url}):
+            return await self._card_cache.get(url, httpx_client)
 
-        resolver = await self._create_a2a_card_resolver(url)
-        agent_card = await resolver.get_agent_card()
-        self._discovered_agents[url] = agent_card
-        logger.info(f"Successfully discovered and cached agent card for {url}")
 
-        return agent_card
+    async def refresh_agent_cards(self) -> None:
+        """Revalidate the cards of all known agents, e.g. in the background at startup."""
+        httpx_client = await self._ensure_httpx_client()
+        # Failures are logged by the cache; stale cards stay usable
+        await asyncio.gather(
+            *(self._card_cache.revalidate(url, httpx_client) for url in self._known_agent_urls),
+            return_exceptions=True,
+        )
+        self._initial_discovery_done = True
 
 
     # @tool
@@ -156,7 +341,7 @@ class A2AClientToolProvider:
             agent_card = await self._discover_agent_card(url)
             return {
                 "status": "success",
-                "agent_card": agent_card.model_dump(mode="python", exclude_none=True),
+                "agent_card": self._project_card(agent_card),
                 "url": url,
             }
         except Exception as e:
@@ -187,8 +372,8 @@ class A2AClientToolProvider:
         try:
             await self._ensure_discovered_known_agents()
             agents = [
-                agent_card.model_dump(mode="python", exclude_none=True)
-                for agent_card in self._discovered_agents.values()
+                self._project_card(agent_card)
+                for agent_card in self._card_cache.cards().values()
             ]
             return {
                 "status": "success",
@@ -221,6 +406,9 @@ class A2AClientToolProvider:
                 - success: Whether the message was sent successfully
                 - response: The agent's response data (if successful)
                 - error: Error message (if failed)
+                - error_type: "circuit_open" if the agent is failing fast after repeated
+                  failures (retry_after_seconds says when it may be tried again, or
+                  probe_in_flight that a probe request is checking it now)
                 - message_id: The message ID used
                 - target_agent_url: The agent URL that was contacted
         """
@@ -232,72 +420,483 @@ class A2AClientToolProvider:
     ) -> dict[str, Any]:
         """Internal async implementation for send_message."""
 
+        if message_id is None:
+            message_id = uuid4().hex
+
         try:
-            await self._ensure_discovered_known_agents()
+            cache_ttl = await self._response_cache_ttl(target_agent_url)
+        except Exception as e:
+            logger.exception(f"Error sending message to {target_agent_url}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "message_id": message_id,
+                "target_agent_url": target_agent_url,
+            }
 
-            # Get the agent card and create client using factory
-            agent_card = await self._discover_agent_card(target_agent_url)
-            client_factory = await self._ensure_client_factory()
-            client = client_factory.create(agent_card)
+        if cache_ttl is not None:
+            cached = self._response_cache.get(target_agent_url, message_text)
+            if cached is not None:
+                return {**cached, "message_id": message_id, "cached": True}
 
-            if message_id is None:
-                message_id = uuid4().hex
+        replicas = self._agent_replicas.get(target_agent_url)
+        if replicas:
+            result = await self._send_hedged(message_text, [target_agent_url, *replicas], message_id)
+        else:
+            result = await self._send_to_agent(message_text, target_agent_url, message_id)
 
-            message = Message(
-                kind="message",
-                role=Role.user,
-                parts=[Part(TextPart(kind="text", text=message_text))],
-                message_id=message_id,
-            )
+        if cache_ttl is not None and self._is_complete_response(result):
+            self._response_cache.put(target_agent_url, message_text, result, cache_ttl)
+        return result
 
-            logger.info(f"Sending message to {target_agent_url}")
-
-            # With streaming=False, this will yield exactly one result
-            async for event in client.send_message(message):
-                if isinstance(event, Message):
-                    # Direct message response
-                    return {
-                        "status": "success",
-                        "response": event.model_dump(mode="python", exclude_none=True),
-                        "message_id": message_id,
-                        "target_agent_url": target_agent_url,
-                    }
-                elif isinstance(event, tuple) and len(event) == 2:
-                    # (Task, UpdateEvent) tuple - extract the task
-                    task, update_event = event
-                    return {
-                        "status": "success",
-                        "response": {
-                            "task": task.model_dump(mode="python", exclude_none=True),
-                            "update": (
-                                update_event.model_dump(mode="python", exclude_none=True) if update_event else None
-                            ),
-                        },
-                        "message_id": message_id,
-                        "target_agent_url": target_agent_url,
-                    }
-                else:
-                    # Fallback for unexpected response types
-                    return {
-                        "status": "success",
-                        "response": {"raw_response": str(event)},
-                        "message_id": message_id,
-                        "target_agent_url": target_agent_url,
-                    }
-
-            # This should never be reached with streaming=False
+
+    async def _send_to_agent(
+        self, message_text: str, target_agent_url: str, message_id: str
+    ) -> dict[str, Any]:
+        """Send to one agent URL through its circuit breaker. Errors are returned, not raised."""
+        breaker = self._get_breaker(target_agent_url)
+        if breaker is not None and not breaker.allow_request():
+            if breaker.probe_in_flight:
+                # Half-open: the probe's outcome, not a timer, decides when the agent is usable again
+                return {
+                    "status": "error",
+                    "error_type": "circuit_open",
+                    "error": (
+                        f"Agent {target_agent_url} is recovering from repeated failures and a probe "
+                        f"request is checking it now. Use another agent or tell the user."
+                    ),
+                    "probe_in_flight": True,
+                    "message_id": message_id,
+                    "target_agent_url": target_agent_url,
+                }
+            retry_after = breaker.retry_after()
             return {
                 "status": "error",
-                "error": "No response received from agent",
+                "error_type": "circuit_open",
+                "error": (
+                    f"Agent {target_agent_url} is unavailable after repeated failures. "
+                    f"Do not retry it for {retry_after:.0f} seconds; use another agent or tell the user."
+                ),
+                "retry_after_seconds": round(retry_after, 1),
                 "message_id": message_id,
                 "target_agent_url": target_agent_url,
             }
 
+        started = time.monotonic()
+        span = tracer.start_span(
+            "a2a.send_message",
+            kind=SpanKind.CLIENT,
+            attributes={"a2a.agent_url": target_agent_url, "a2a.message_id": message_id, "a2a.streaming": self.streaming},
+        )
+        try:
+            # Without streaming this yields exactly one result; with streaming the
+            # last event carries the aggregated task.
+            writer = _get_stream_writer() if self.streaming else None
+            result = None
+            events = 0
+            with trace.use_span(span, end_on_exit=False, record_exception=False, set_status_on_exception=False):
+                async for result in self.stream_message(message_text, target_agent_url, message_id):
+                    events += 1
+                    if events == 1:
+                        span.add_event("first_event")
+                    if writer is not None:
+                        writer({"a2a_event": result})
+
+            if result is None:
+                result = {
+                    "status": "error",
+                    "error": "No response received from agent",
+                    "message_id": message_id,
+                    "target_agent_url": target_agent_url,
+                }
+
+        except asyncio.CancelledError as e:
+            # Abandoned by the caller: a deadline counts against the agent, a lost hedge only when slow
+            lost_hedge = e.args == (LOST_HEDGE,)
+            span.set_status(Status(StatusCode.ERROR, "lost hedge" if lost_hedge else "canceled"))
+            span.end()
+            if breaker is not None:
+                elapsed = time.monotonic() - started
+                if not lost_hedge or (self._slow_call_threshold is not None and elapsed > self._slow_call_threshold):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            raise
+
         except Exception as e:
             logger.exception(f"Error sending message to {target_agent_url}")
+            span.record_exception(e)
+            result = {
+                "status": "error",
+                "error": str(e),
+                "message_id": message_id,
+                "target_agent_url": target_agent_url,
+            }
+
+        span.set_attribute("a2a.status", result["status"])
+        if result["status"] != "success":
+            span.set_status(Status(StatusCode.ERROR, str(result.get("error", result["status"]))))
+        span.end()
+
+        if breaker is not None:
+            if not self._is_failed_response(result):
+                breaker.record_success(time.monotonic() - started)
+            else:
+                breaker.record_failure()
+                if breaker.state == CircuitState.OPEN:
+                    logger.warning(f"Circuit opened for {target_agent_url}")
+        return result
+
+
+    async def _send_hedged(
+        self, message_text: str, agent_urls: list[str], message_id: str
+    ) -> dict[str, Any]:
+        """Send to replicas in order, starting the next one after hedge_delay or on failure (including failed or rejected tasks)."""
+        remaining = list(agent_urls)
+        pending: set[asyncio.Task] = set()
+        result: dict[str, Any] | None = None
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(asyncio.create_task(
+                        self._send_to_agent(message_text, remaining.pop(0), message_id)
+                    ))
+                wait_timeout = self._hedge_delay if remaining else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if not self._is_failed_response(result):
+                        return result
+            return result
+        finally:
+            # First success wins; abandon the slower replicas. Without a winner the caller
+            # gave up (deadline), which counts against every replica still running
+            won = result is not None and not self._is_failed_response(result)
+            for task in pending:
+                task.cancel(LOST_HEDGE if won else None)
+
+
+    def _get_breaker(self, agent_url: str) -> CircuitBreaker | None:
+        """Return the circuit breaker for an agent URL, or None when breaking is disabled."""
+        if self._failure_threshold is None:
+            return None
+        breaker = self._breakers.get(agent_url)
+        if breaker is None:
+            breaker = self._breakers[agent_url] = CircuitBreaker(
+                failure_threshold=self._failure_threshold,
+                recovery_timeout=self._recovery_timeout,
+                slow_call_threshold=self._slow_call_threshold,
+            )
+        return breaker
+
+
+    def circuit_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state per agent URL."""
+        return {url: breaker.snapshot() for url, breaker in self._breakers.items()}
+
+
+    # @tool
+    async def a2a_send_messages(
+        self, messages: list[dict[str, str]], timeout_seconds: float = DEFAULT_SEND_MESSAGES_TIMEOUT
+    ) -> dict[str, Any]:
+        """
+        Send messages to several A2A agents concurrently and return all responses.
+
+        Use this instead of repeated a2a_send_message calls when a question needs
+        more than one agent. Agents that miss the deadline are reported as timeouts
+        while the other responses are still returned.
+
+        Args:
+            messages: List of {"target_agent_url": <full agent URL>, "message_text": <message>}
+            timeout_seconds: Deadline for each agent in seconds (defaults to 60)
+
+        Returns:
+            dict: Response data including:
+                - status: "success" if all agents answered, "partial" if some did, "error" if none did
+                - results: One a2a_send_message style result per input, in input order
+                  (status is "timeout" for agents that missed the deadline)
+                - success_count: Number of agents that answered
+                - total_count: Number of messages sent
+        """
+        return await self._send_messages(messages, timeout_seconds)
+
+
+    async def _send_messages(
+        self, messages: list[dict[str, str]], timeout_seconds: float
+    ) -> dict[str, Any]:
+        """Internal async implementation for send_messages."""
+
+        async def _send_with_deadline(item: dict[str, str]) -> dict[str, Any]:
+            target_agent_url = item.get("target_agent_url")
+            message_text = item.get("message_text")
+            message_id = uuid4().hex
+            if not target_agent_url or message_text is None:
+                return {
+                    "status": "error",
+                    "error": "Each message needs 'target_agent_url' and 'message_text'",
+                    "message_id": message_id,
+                    "target_agent_url": target_agent_url,
+                }
+
+            try:
+                # The deadline also covers waiting for a free send slot
+                async with asyncio.timeout(timeout_seconds):
+                    async with self._send_semaphore:
+                        return await self._send_message(message_text, target_agent_url, message_id)
+            except TimeoutError:
+                logger.warning(f"No response from {target_agent_url} within {timeout_seconds} seconds")
+                return {
+                    "status": "timeout",
+                    "error": f"No response within {timeout_seconds} seconds",
+                    "message_id": message_id,
+                    "target_agent_url": target_agent_url,
+                }
+
+        results = await asyncio.gather(*(_send_with_deadline(item) for item in messages))
+        success_count = sum(1 for result in results if result["status"] == "success")
+
+        if success_count == len(results):
+            status = "success"
+        elif success_count:
+            status = "partial"
+        else:
+            status = "error"
+
+        return {
+            "status": status,
+            "results": list(results),
+            "success_count": success_count,
+            "total_count": len(results),
+        }
+
+
+    async def _response_cache_ttl(self, target_agent_url: str) -> float | None:
+        """TTL for caching this agent's responses, or None if caching does not apply."""
+        if self._response_cache is None:
+            return None
+        await self._ensure_discovered_known_agents()
+        agent_card = await self._discover_agent_card(target_agent_url)
+        return response_ttl_for(agent_card, self._response_cache.ttl)
+
+
+    @staticmethod
+    def _is_complete_response(result: dict[str, Any]) -> bool:
+        """Whether a send result is a final answer (direct message or completed task)."""
+        if result.get("status") != "success":
+            return False
+        state = A2AClientToolProvider._task_state(result)
+        if state is not None:
+            return state == TaskState.completed
+        return "raw_response" not in result["response"]
+
+
+    @staticmethod
+    def _is_failed_response(result: dict[str, Any]) -> bool:
+        """Whether a send result counts against the agent: an error, or a task that ended failed or rejected."""
+        if result.get("status") != "success":
+            return True
+        return A2AClientToolProvider._task_state(result) in (TaskState.failed, TaskState.rejected)
+
+
+    @staticmethod
+    def _task_state(result: dict[str, Any]) -> str | None:
+        """Task state of a successful send result (None for direct messages)."""
+        response = result["response"]
+        if "task" in response:
+            return response["task"]["status"]["state"]
+        if "state" in response:
+            # compact task projection
+            return response["state"]
+        return None
+
+
+    # @tool
+    async def a2a_route_message(self, message_text: str) -> dict[str, Any]:
+        """
+        Send a message to the known agent whose skills best match it.
+
+        Use this when it is not clear which agent should handle a request; the
+        agent is chosen from the discovered skills without reading agent cards.
+
+        Args:
+            message_text: The message content to send
+
+        Returns:
+            dict: The a2a_send_message result plus:
+                - routed_skill: The id of the skill that matched
+                - route_score: How well the skill matched (0-1)
+                If no agent matches well enough, status is "error" and
+                "candidates" lists the closest agents.
+        """
+        return await self._route_message(message_text)
+
+
+    async def _route_message(self, message_text: str) -> dict[str, Any]:
+        """Internal async implementation for route_message."""
+        try:
+            await self._ensure_discovered_known_agents()
+            # Only agents whose card changed since the last call are re-indexed
+            for url, entry in self._card_cache.entries().items():
+                self._skill_index.update(url, entry.card, entry.digest)
+
+            matches = self._skill_index.route(message_text)
+        except Exception as e:
+            logger.exception("Error routing message")
             return {
                 "status": "error",
                 "error": str(e),
+            }
+
+        if not matches or matches[0].score < self.min_route_score:
+            return {
+                "status": "error",
+                "error": "No agent skill matches this message. Pick an agent with a2a_send_message instead.",
+                "candidates": [
+                    {"target_agent_url": match.agent_url, "agent_name": match.agent_name, "score": round(match.score, 3)}
+                    for match in matches
+                ],
+            }
+
+        best = matches[0]
+        logger.info(f"Routed message to {best.agent_url} (skill={best.skill_id}, score={best.score:.3f})")
+        result = await self._send_message(message_text, best.agent_url)
+        return {**result, "routed_skill": best.skill_id, "route_score": round(best.score, 3)}
+
+
+    async def stream_message(
+        self, message_text: str, target_agent_url: str, message_id: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Send a message to an A2A agent and yield each response event as it arrives.
+
+        Events are yielded incrementally when the provider was created with
+        streaming=True and the agent card advertises streaming; otherwise the
+        single final response is yielded. Errors are raised, not wrapped.
+
+        Args:
+            message_text: The message content to send to the agent
+            target_agent_url: The URL of the target A2A agent
+            message_id: Optional message ID for tracking (generates UUID if not provided)
+
+        Yields:
+            dict: Response data in the same shape as a2a_send_message
+        """
+        await self._ensure_discovered_known_agents()
+
+        # Get the agent card and the (reused) client for it
+        agent_card = await self._discover_agent_card(target_agent_url)
+        client = await self._get_client(target_agent_url, agent_card)
+
+        if message_id is None:
+            message_id = uuid4().hex
+
+        message = Message(
+            kind="message",
+            role=Role.user,
+            parts=[Part(TextPart(kind="text", text=message_text))],
+            message_id=message_id,
+            # W3C trace context, so the agent's spans join the caller's trace
+            metadata=inject_trace_context() or None,
+        )
+
+        logger.info(f"Sending message to {target_agent_url}")
+
+        # The task id is known from the first event, so an abandoned run can be canceled
+        running_task_id: str | None = None
+        try:
+            if self.streaming and agent_card.capabilities.streaming:
+                async for event in client.send_message(message):
+                    if isinstance(event, tuple):
+                        task = event[0]
+                        running_task_id = task.id if task.status.state in RUNNING_STATES else None
+                    yield self._event_to_response(event, message_id, target_agent_url)
+                return
+
+            # A blocking send only names the task once it is done; send non-blocking and poll instead
+            async for event in client.send_message(message, configuration=MessageSendConfiguration(blocking=False)):
+                pass
+            interval = POLL_INTERVAL
+            while isinstance(event, tuple) and event[0].status.state in RUNNING_STATES:
+                running_task_id = event[0].id
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+                event = (await client.get_task(TaskQueryParams(id=running_task_id)), None)
+            running_task_id = None
+            yield self._event_to_response(event, message_id, target_agent_url)
+        except (asyncio.CancelledError, GeneratorExit):
+            if running_task_id is not None:
+                self._cancel_remote_task(client, running_task_id, target_agent_url)
+            raise
+
+
+    def _cancel_remote_task(self, client: Client, task_id: str, agent_url: str) -> None:
+        """Send tasks/cancel in the background so the agent stops working on an abandoned task."""
+
+        async def cancel() -> None:
+            try:
+                await client.cancel_task(TaskIdParams(id=task_id))
+                logger.info(f"Canceled abandoned task {task_id} on {agent_url}")
+            except Exception as e:
+                logger.warning(f"Failed to cancel task {task_id} on {agent_url}: {e}")
+
+        cancellation = asyncio.create_task(cancel())
+        self._cancellations.add(cancellation)
+        cancellation.add_done_callback(self._cancellations.discard)
+
+
+    def _project_card(self, agent_card: AgentCard) -> dict[str, Any]:
+        """Convert an agent card into the tool result form for the current result mode."""
+        if self.result_mode is ResultMode.COMPACT:
+            return compact_card(agent_card)
+        return agent_card.model_dump(mode="python", exclude_none=True)
+
+
+    def _event_to_response(
+        self, event: ClientEvent | Message, message_id: str, target_agent_url: str
+    ) -> dict[str, Any]:
+        """Convert a client event into the tool response dict."""
+        if self.result_mode is ResultMode.COMPACT and isinstance(event, (Message, tuple)):
+            response = (
+                compact_message(event, self.max_result_chars)
+                if isinstance(event, Message)
+                else compact_task(event[0], self.max_result_chars)
+            )
+            return {
+                "status": "success",
+                "response": response,
                 "message_id": message_id,
                 "target_agent_url": target_agent_url,
-            }
\ No newline at end of file
+            }
+
+        if isinstance(event, Message):
+            # Direct message response
+            return {
+                "status": "success",
+                "response": event.model_dump(mode="python", exclude_none=True),
+                "message_id": message_id,
+                "target_agent_url": target_agent_url,
+            }
+        elif isinstance(event, tuple) and len(event) == 2:
+            # (Task, UpdateEvent) tuple - extract the task
+            task, update_event = event
+            return {
+                "status": "success",
+                "response": {
+                    "task": task.model_dump(mode="python", exclude_none=True),
+                    "update": (
+                        update_event.model_dump(mode="python", exclude_none=True) if update_event else None
+                    ),
+                },
+                "message_id": message_id,
+                "target_agent_url": target_agent_url,
+            }
+        else:
+            # Fallback for unexpected response types
+            return {
+                "status": "success",
+                "response": {"raw_response": str(event)},
+                "message_id": message_id,
+                "target_agent_url": target_agent_url,
+            }
@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from a2a.client import A2AClientHTTPError, A2AClientJSONError
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from pydantic import ValidationError
+
+DEFAULT_CARD_TTL = 300  # revalidate cached agent cards after 5 minutes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAgentCard:
+    """An agent card together with the validators needed to revalidate it."""
+
+    card: AgentCard
+    digest: str  # sha256 of the card JSON; changes whenever the card content changes
+    fetched_at: float  # time.time() of the last successful fetch or revalidation
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class AgentCardCache:
+    """Agent card cache with TTL, conditional revalidation and single-flight fetches."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CARD_TTL,
+        snapshot_path: str | os.PathLike | None = None,
+        serve_stale: bool = False,
+    ):
+        """
+        Initialize the agent card cache.
+
+        Args:
+            ttl: Seconds a card is served without revalidation (defaults to 300)
+            snapshot_path: Optional JSON file used to persist cards across restarts
+            serve_stale: Return an expired card immediately and revalidate it in the
+                background instead of waiting for the agent
+        """
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.serve_stale = serve_stale
+        self._entries: dict[str, CachedAgentCard] = {}
+        self._inflight: dict[str, asyncio.Task[CachedAgentCard]] = {}
+        self._snapshot_lock = asyncio.Lock()
+
+
+    def entry(self, url: str) -> CachedAgentCard | None:
+        """Return the cached entry for a URL, fresh or not."""
+        return self._entries.get(url)
+
+
+    def entries(self) -> dict[str, CachedAgentCard]:
+        """Return all cached entries keyed by agent URL."""
+        return dict(self._entries)
+
+
+    def cards(self) -> dict[str, AgentCard]:
+        """Return all cached cards keyed by agent URL."""
+        return {url: entry.card for url, entry in self._entries.items()}
+
+
+    def is_fresh(self, entry: CachedAgentCard) -> bool:
+        """Whether an entry is still within its TTL."""
+        return time.time() - entry.fetched_at < self.ttl
+
+
+    async def get(self, url: str, httpx_client: httpx.AsyncClient) -> AgentCard:
+        """Return the card for a URL, fetching or revalidating it when needed."""
+        entry = self._entries.get(url)
+        if entry is not None and self.is_fresh(entry):
+            return entry.card
+
+        if entry is not None and self.serve_stale:
+            self._start_fetch(url, httpx_client)
+            return entry.card
+
+        return (await self.revalidate(url, httpx_client)).card
+
+
+    async def revalidate(self, url: str, httpx_client: httpx.AsyncClient) -> CachedAgentCard:
+        """Fetch or conditionally revalidate a card, joining any fetch already in flight."""
+        # Shield the shared fetch so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(self._start_fetch(url, httpx_client))
+
+
+    def _start_fetch(self, url: str, httpx_client: httpx.AsyncClient) -> asyncio.Task[CachedAgentCard]:
+        """Start a fetch for the URL unless one is already running."""
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(url, httpx_client))
+            self._inflight[url] = task
+            task.add_done_callback(lambda done: self._on_fetch_done(url, done))
+        return task
+
+
+    def _on_fetch_done(self, url: str, task: asyncio.Task[CachedAgentCard]) -> None:
+        self._inflight.pop(url, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to refresh agent card for {url}: {task.exception()}")
+
+
+    async def _fetch(self, url: str, httpx_client: httpx.AsyncClient) -> CachedAgentCard:
+        """Fetch a card, sending ETag/Last-Modified validators when a cached copy exists."""
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        card_url = f"{url.rstrip('/')}/{AGENT_CARD_WELL_KNOWN_PATH.lstrip('/')}"
+        try:
+            response = await httpx_client.get(card_url, headers=headers)
+            if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+                entry.fetched_at = time.time()
+                logger.info(f"Agent card for {url} not modified")
+                await self._save_snapshot()
+                return entry
+
+            response.raise_for_status()
+            card_data = response.json()
+            agent_card = AgentCard.model_validate(card_data)
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, f"Failed to fetch agent card from {card_url}: {e}") from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(503, f"Network communication error fetching agent card from {card_url}: {e}") from e
+        except (json.JSONDecodeError, ValidationError) as e:
+            raise A2AClientJSONError(f"Invalid agent card from {card_url}: {e}") from e
+
+        digest = hashlib.sha256(json.dumps(card_data, sort_keys=True).encode()).hexdigest()
+        if entry is not None and entry.digest == digest:
+            # Unchanged content: keep the same entry so its digest stays stable for dependents
+            entry.fetched_at = time.time()
+            entry.etag = response.headers.get("ETag")
+            entry.last_modified = response.headers.get("Last-Modified")
+        else:
+            entry = CachedAgentCard(
+                card=agent_card,
+                digest=digest,
+                fetched_at=time.time(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            self._entries[url] = entry
+            logger.info(f"Successfully discovered and cached agent card for {url}")
+
+        await self._save_snapshot()
+        return entry
+
+
+    def load_snapshot(self) -> int:
+        """Load cards from the snapshot file. Returns the number of cards loaded."""
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return 0
+
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable agent card snapshot {self.snapshot_path}: {e}")
+            return 0
+
+        for url, item in snapshot.items():
+            try:
+                self._entries[url] = CachedAgentCard(
+                    card=AgentCard.model_validate(item["card"]),
+                    digest=item["digest"],
+                    fetched_at=item["fetched_at"],
+                    etag=item.get("etag"),
+                    last_modified=item.get("last_modified"),
+                )
+            except (KeyError, ValidationError) as e:
+                logger.warning(f"Skipping invalid snapshot entry for {url}: {e}")
+
+        logger.info(f"Loaded {len(self._entries)} agent cards from {self.snapshot_path}")
+        return len(self._entries)
+
+
+    async def _save_snapshot(self) -> None:
+        """Write all cached cards to the snapshot file, if one is configured."""
+        if self.snapshot_path is None:
+            return
+
+        snapshot: dict[str, Any] = {
+            url: {
+                "card": entry.card.model_dump(mode="json", exclude_none=True),
+                "digest": entry.digest,
+                "fetched_at": entry.fetched_at,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+            }
+            for url, entry in self._entries.items()
+        }
+        try:
+            async with self._snapshot_lock:
+                await asyncio.to_thread(self._write_snapshot, snapshot)
+        except OSError as e:
+            logger.warning(f"Failed to write agent card snapshot {self.snapshot_path}: {e}")
+
+
+    def _write_snapshot(self, snapshot: dict[str, Any]) -> None:
+        # Write then rename so a crash never leaves a half-written snapshot behind
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.snapshot_path)
@@ -0,0 +1,106 @@
+import time
+from enum import StrEnum
+from typing import Any
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30  # seconds an open circuit waits before probing again
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"  # requests flow normally
+    OPEN = "open"  # requests fail fast
+    HALF_OPEN = "half_open"  # a limited number of probe requests decide whether to close
+
+
+class CircuitBreaker:
+    """Consecutive-failure and slow-call circuit breaker for one agent URL."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        slow_call_threshold: float | None = None,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before letting probe requests through
+            slow_call_threshold: Calls slower than this many seconds count as failures
+            half_open_max_calls: Concurrent probe requests allowed while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now. Each allowed request must be recorded or released."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                return False
+            self._probes_in_flight += 1
+
+        return True
+
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call; slow calls count as failures."""
+        if self.slow_call_threshold is not None and latency > self.slow_call_threshold:
+            self.record_failure()
+            return
+
+        self.consecutive_failures = 0
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            self._probes_in_flight = 0
+
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+            self._probes_in_flight = 0
+
+
+    def release(self) -> None:
+        """Give back an allowed request that ended without a verdict (e.g. cancelled)."""
+        if self.state == CircuitState.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+
+    @property
+    def probe_in_flight(self) -> bool:
+        """Whether a half-open circuit is waiting on its probe requests."""
+        return self.state == CircuitState.HALF_OPEN and self._probes_in_flight >= self.half_open_max_calls
+
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self.recovery_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "probe_in_flight": self.probe_in_flight,
+        }
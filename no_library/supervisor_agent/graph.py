@@ -0,0 +1,57 @@
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+from ..middleware.content_filter_middleware import ContentFilterMiddleware
+from .a2a_client import A2AClientToolProvider
+
+DEFAULT_SUPERVISOR_MODEL = "openai:gpt-4o-mini"
+BANNED_KEYWORDS = ["hack", "exploit", "malware", "東京"]
+# Offline stand-in for the model (MODEL_BACKEND=scripted): route the question, answer with the result
+SUPERVISOR_SCRIPT = [{"tool": "a2a_route_message", "args": {"message_text": "{input}"}}, {"text": "{last}"}]
+
+
+def build_system_prompt(known_agent_urls: list[str]) -> str:
+    known_agent_url_lines = "\n".join(f"- Agent URL: \"{url}\"" for url in known_agent_urls)
+    return f"""
+You are a team supervisor. Use A2A tools to delegate tasks.
+
+IMPORTANT:
+- When calling `a2a_send_message`, `target_agent_url` MUST be a full URL including scheme.
+{known_agent_url_lines}
+- If you are not sure which agent handles a request, call `a2a_route_message`; it picks the agent for you.
+- When a question needs several agents, call `a2a_send_messages` once with one entry per agent instead of calling `a2a_send_message` repeatedly.
+- Do NOT pass agent names like "currency agent" as `target_agent_url`.
+- If a tool call is rejected, do NOT propose the same tool call again in this conversation.
+- If all relevant tool calls are rejected, respond clearly that you cannot retrieve the information without tool execution.
+"""
+
+
+def build_supervisor(
+    provider: A2AClientToolProvider,
+    known_agent_urls: list[str],
+    model: str | BaseChatModel = DEFAULT_SUPERVISOR_MODEL,
+    checkpointer: BaseCheckpointSaver | None = None,
+):
+    """
+    Build the supervisor graph that delegates to remote agents with the provider's A2A tools.
+
+    Args:
+        provider: A2A client tool provider
+        known_agent_urls: Agent URLs listed in the system prompt
+        model: Model name or chat model instance
+        checkpointer: Conversation checkpointer (defaults to an InMemorySaver)
+
+    Returns:
+        The compiled supervisor agent
+    """
+    return create_agent(
+        model=model,
+        tools=provider.tools,
+        system_prompt=build_system_prompt(known_agent_urls),
+        checkpointer=checkpointer or InMemorySaver(),
+        middleware=[
+            ContentFilterMiddleware(banned_keywords=BANNED_KEYWORDS),
+        ],
+    )
@@ -0,0 +1,97 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees a per-host slot once the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport with an optional per-host cap and connection pool statistics."""
+
+    def __init__(self, *, max_connections_per_host: int | None = None, **kwargs: Any):
+        """
+        Initialize the transport.
+
+        Args:
+            max_connections_per_host: Maximum concurrent requests per scheme/host/port
+                (None for no per-host cap). Requests over the cap wait for a free slot.
+            **kwargs: Passed to httpx.AsyncHTTPTransport (limits, http2, ...)
+        """
+        super().__init__(**kwargs)
+        self.max_connections_per_host = max_connections_per_host
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_waiters: dict[str, int] = defaultdict(int)
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.max_connections_per_host is None:
+            return await super().handle_async_request(request)
+
+        host = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+
+        self._host_waiters[host] += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._host_waiters[host] -= 1
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            slots.release()
+            raise
+
+        # Hold the slot until the body (e.g. an SSE stream) has been consumed and closed
+        response.stream = _ReleasingStream(response.stream, slots.release)
+        return response
+
+
+    def pool_stats(self) -> dict[str, Any]:
+        """
+        Return a snapshot of the connection pool.
+
+        Returns:
+            dict: Pool statistics including:
+                - connections: Open (or opening) connections
+                - in_use: Connections currently serving a request
+                - idle: Keep-alive connections available for reuse
+                - waiters: Requests waiting for a pooled connection
+                - host_waiters: Requests waiting for a per-host slot, by host
+        """
+        pool = self._pool
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        # httpcore keeps queued requests in a private list; tolerate its absence
+        waiters = sum(1 for request in getattr(pool, "_requests", []) if request.is_queued())
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "waiters": waiters,
+            "host_waiters": {host: count for host, count in self._host_waiters.items() if count},
+        }
@@ -0,0 +1,103 @@
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+from a2a.types import AgentCard
+
+# Agents opt in by declaring this extension in AgentCapabilities.extensions,
+# optionally with params={"ttl_seconds": <seconds>}, or by tagging a skill "cacheable".
+CACHEABLE_EXTENSION_URI = "urn:a2a-git-samples:extensions:cacheable-responses/v1"
+CACHEABLE_SKILL_TAG = "cacheable"
+
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+DEFAULT_RESPONSE_TTL = 300  # seconds
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message_text(text: str) -> str:
+    """Normalize a message for cache lookups (NFKC, case-folded, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def response_ttl_for(agent_card: AgentCard, default_ttl: float) -> float | None:
+    """Return the TTL an agent declares for cached responses, or None if it is not cacheable."""
+    for extension in agent_card.capabilities.extensions or []:
+        if extension.uri == CACHEABLE_EXTENSION_URI:
+            return float((extension.params or {}).get("ttl_seconds", default_ttl))
+
+    if any(CACHEABLE_SKILL_TAG in (skill.tags or []) for skill in agent_card.skills):
+        return default_ttl
+
+    return None
+
+
+class ResponseCache:
+    """LRU + TTL cache of agent responses keyed by agent URL and normalized message text."""
+
+    def __init__(self, max_entries: int = DEFAULT_RESPONSE_CACHE_SIZE, ttl: float = DEFAULT_RESPONSE_TTL):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (least recently used are evicted)
+            ttl: Default seconds a response stays valid when the agent does not declare one
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # (agent URL, normalized text) -> (expires_at, response)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+    def get(self, agent_url: str, message_text: str) -> dict[str, Any] | None:
+        """Return the cached response, or None on a miss or expired entry."""
+        key = (agent_url, normalize_message_text(message_text))
+        item = self._entries.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = item
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+
+    def put(self, agent_url: str, message_text: str, response: dict[str, Any], ttl: float | None = None) -> None:
+        """Cache a response, evicting the least recently used entries beyond max_entries."""
+        key = (agent_url, normalize_message_text(message_text))
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def clear(self) -> None:
+        """Drop all cached responses (counters are kept)."""
+        self._entries.clear()
+
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss metrics and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,83 @@
+from enum import StrEnum
+from typing import Any
+
+from a2a.types import AgentCard, Message, Part, Task
+
+DEFAULT_MAX_RESULT_CHARS = 2000
+TRUNCATION_MARKER = "…[truncated]"
+
+
+class ResultMode(StrEnum):
+    FULL = "full"  # complete task/card dumps
+    COMPACT = "compact"  # ids, task state and answer text only
+
+
+def parse_result_mode(value: str) -> ResultMode:
+    """Parse a result mode name (e.g. A2A_RESULT_MODE), rejecting unknown values."""
+    try:
+        return ResultMode(value.strip().lower())
+    except ValueError:
+        raise ValueError(
+            f"Unknown result mode {value!r} (use one of {', '.join(mode.value for mode in ResultMode)})"
+        ) from None
+
+
+def truncate_text(text: str, max_chars: int) -> tuple[str, bool]:
+    """Cut text to at most max_chars characters. Returns (text, truncated)."""
+    if len(text) <= max_chars:
+        return text, False
+    keep = max(max_chars - len(TRUNCATION_MARKER), 0)
+    return text[:keep] + TRUNCATION_MARKER, True
+
+
+def _parts_text(parts: list[Part] | None) -> str:
+    return "".join(getattr(part.root, "text", "") for part in parts or [])
+
+
+def compact_task(task: Task, max_chars: int) -> dict[str, Any]:
+    """Project a task onto its ids, state and answer text (artifacts, else status message)."""
+    text = "\n".join(filter(None, (_parts_text(artifact.parts) for artifact in task.artifacts or [])))
+    if not text and task.status.message is not None:
+        text = _parts_text(task.status.message.parts)
+
+    text, truncated = truncate_text(text, max_chars)
+    result = {
+        "task_id": task.id,
+        "context_id": task.context_id,
+        "state": task.status.state.value,
+        "text": text,
+    }
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+def compact_message(message: Message, max_chars: int) -> dict[str, Any]:
+    """Project a direct message response onto its ids and text."""
+    text, truncated = truncate_text(_parts_text(message.parts), max_chars)
+    result = {
+        "context_id": message.context_id,
+        "task_id": message.task_id,
+        "text": text,
+    }
+    if truncated:
+        result["truncated"] = True
+    return {key: value for key, value in result.items() if value is not None}
+
+
+def compact_card(agent_card: AgentCard) -> dict[str, Any]:
+    """Project an agent card onto what is needed to pick and address an agent."""
+    return {
+        "name": agent_card.name,
+        "url": agent_card.url,
+        "description": agent_card.description,
+        "skills": [
+            {
+                "id": skill.id,
+                "name": skill.name,
+                "description": skill.description,
+                "tags": skill.tags,
+            }
+            for skill in agent_card.skills
+        ],
+    }
@@ -0,0 +1,127 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+from a2a.types import AgentCard
+
+from a2a_common.text import terms
+
+_STOPWORDS = frozenset(
+    "a an and are can do for how i in is it me of on please tell the to what whats with you".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into index terms, leaving out stopwords (see a2a_common.text.terms)."""
+    return terms(text, _STOPWORDS)
+
+
+@dataclass
+class SkillMatch:
+    """A skill that matched a message."""
+
+    agent_url: str
+    agent_name: str
+    skill_id: str
+    score: float
+
+
+@dataclass
+class _SkillDocument:
+    agent_url: str
+    agent_name: str
+    skill_id: str
+    term_counts: Counter
+    norm: float = 0.0
+
+
+class SkillIndex:
+    """TF-IDF index over the skills (ids, names, tags, descriptions, examples) of agent cards."""
+
+    def __init__(self):
+        self._documents: dict[str, list[_SkillDocument]] = {}  # agent URL -> skill documents
+        self._versions: dict[str, str] = {}  # agent URL -> indexed card version
+        self._document_frequency: Counter = Counter()
+        self._document_count = 0
+        self._norms_stale = False
+
+
+    def update(self, agent_url: str, agent_card: AgentCard, version: str) -> bool:
+        """Index an agent's card unless this version is already indexed. Returns True if re-indexed."""
+        if self._versions.get(agent_url) == version:
+            return False
+
+        self.remove(agent_url)
+        agent_text = f"{agent_card.name} {agent_card.description}"
+        documents = []
+        for skill in agent_card.skills:
+            skill_text = " ".join([
+                agent_text,
+                skill.id.replace("_", " "),
+                skill.name,
+                skill.description,
+                *skill.tags,
+                *(skill.examples or []),
+            ])
+            documents.append(_SkillDocument(agent_url, agent_card.name, skill.id, Counter(tokenize(skill_text))))
+
+        for document in documents:
+            self._document_frequency.update(document.term_counts.keys())
+        self._document_count += len(documents)
+        self._documents[agent_url] = documents
+        self._versions[agent_url] = version
+        self._norms_stale = True
+        return True
+
+
+    def remove(self, agent_url: str) -> None:
+        """Drop an agent from the index."""
+        for document in self._documents.pop(agent_url, []):
+            self._document_frequency.subtract(document.term_counts.keys())
+            self._document_count -= 1
+        self._versions.pop(agent_url, None)
+        self._document_frequency = +self._document_frequency  # drop zero counts
+        self._norms_stale = True
+
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + self._document_count) / (1 + self._document_frequency[term])) + 1
+
+
+    def _refresh_norms(self) -> None:
+        # IDF depends on every document, so norms are recomputed lazily after changes
+        for documents in self._documents.values():
+            for document in documents:
+                document.norm = math.sqrt(
+                    sum((count * self._idf(term)) ** 2 for term, count in document.term_counts.items())
+                )
+        self._norms_stale = False
+
+
+    def route(self, message_text: str, top_k: int = 3) -> list[SkillMatch]:
+        """Return the best matching skills (at most one per agent), by cosine similarity."""
+        if self._norms_stale:
+            self._refresh_norms()
+
+        query_counts = Counter(tokenize(message_text))
+        query_weights = {term: count * self._idf(term) for term, count in query_counts.items()}
+        query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+        if not query_norm:
+            return []
+
+        best_per_agent: dict[str, SkillMatch] = {}
+        for agent_url, documents in self._documents.items():
+            for document in documents:
+                if not document.norm:
+                    continue
+                dot = sum(
+                    weight * document.term_counts[term] * self._idf(term)
+                    for term, weight in query_weights.items()
+                    if term in document.term_counts
+                )
+                score = dot / (query_norm * document.norm)
+                best = best_per_agent.get(agent_url)
+                if score > 0 and (best is None or score > best.score):
+                    best_per_agent[agent_url] = SkillMatch(agent_url, document.agent_name, document.skill_id, score)
+
+        return sorted(best_per_agent.values(), key=lambda match: match.score, reverse=True)[:top_k]
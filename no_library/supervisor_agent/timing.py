@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import ToolMessage
+
+# Histogram bucket upper bounds in seconds: 1 ms doubling up to ~2 min, then overflow
+BUCKET_BOUNDS = tuple(0.001 * 2 ** i for i in range(18))
+
+
+@dataclass
+class Histogram:
+    """Wall and CPU time distribution of one kind of span."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS) + 1))
+    count: int = 0
+    errors: int = 0
+    wall_sum: float = 0.0
+    cpu_sum: float = 0.0
+    wall_max: float = 0.0
+
+
+    def add(self, wall: float, cpu: float, error: bool) -> None:
+        index = next((i for i, bound in enumerate(BUCKET_BOUNDS) if wall <= bound), len(BUCKET_BOUNDS))
+        self.buckets[index] += 1
+        self.count += 1
+        self.errors += error
+        self.wall_sum += wall
+        self.cpu_sum += cpu
+        self.wall_max = max(self.wall_max, wall)
+
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile of wall time."""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.wall_max
+        return 0.0
+
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "wall_avg": self.wall_sum / self.count if self.count else 0.0,
+            "wall_p50": self.quantile(0.50),
+            "wall_p99": self.quantile(0.99),
+            "wall_max": self.wall_max,
+            "cpu_avg": self.cpu_sum / self.count if self.count else 0.0,
+        }
+
+
+class TimingRecorder:
+    """Collects span timings into histograms and, optionally, a JSON-lines file."""
+
+    def __init__(self, sink_path: str | None = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            sink_path: File to append one JSON line per span to (None for histograms only)
+        """
+        self._histograms: dict[tuple[str, str, str | None], Histogram] = {}
+        self._lock = threading.Lock()
+        self._sink: TextIO | None = open(sink_path, "a", encoding="utf-8") if sink_path else None
+
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        wall: float,
+        cpu: float,
+        thread_id: str | None = None,
+        agent: str | None = None,
+        error: bool = False,
+    ) -> None:
+        """
+        Record one span.
+
+        Args:
+            kind: "hook" (middleware or graph node), "model" or "tool"
+            name: Hook, model or tool name
+            wall: Wall time in seconds
+            cpu: CPU time of the calling thread in seconds (with concurrent tool calls this
+                includes work of other coroutines on the event loop)
+            thread_id: Conversation the span belongs to
+            agent: Target agent URL of A2A tool calls (comma-separated when a call sends
+                to several agents)
+            error: The span raised
+        """
+        with self._lock:
+            key = (kind, name, agent)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(wall, cpu, error)
+
+            if self._sink is not None:
+                self._sink.write(json.dumps({
+                    "ts": time.time(),
+                    "kind": kind,
+                    "name": name,
+                    "agent": agent,
+                    "thread_id": thread_id,
+                    "wall": round(wall, 6),
+                    "cpu": round(cpu, 6),
+                    "error": error,
+                }, ensure_ascii=False) + "\n")
+
+
+    def histograms(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the histogram summaries.
+
+        Returns:
+            dict: "kind:name" (plus "@agent" for A2A tool calls) -> count, errors,
+                wall_avg / wall_p50 / wall_p99 / wall_max and cpu_avg in seconds
+        """
+        with self._lock:
+            return {
+                f"{kind}:{name}" + (f"@{agent}" if agent else ""): histogram.summary()
+                for (kind, name, agent), histogram in sorted(self._histograms.items(), key=lambda item: str(item[0]))
+            }
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
+
+
+class TimingCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler that times middleware hooks, model calls and tool calls.
+
+    Pass it in the run config (config["callbacks"]); when it is not attached, nothing is
+    measured and the graph runs exactly as before.
+    """
+
+    run_inline = True  # record on the event loop instead of a thread pool
+
+    def __init__(self, recorder: TimingRecorder):
+        self.recorder = recorder
+        # Run id -> (kind, name, thread id, agent, wall start, cpu start)
+        self._starts: dict[UUID, tuple[str, str, str | None, str | None, float, float]] = {}
+
+
+    def _start(self, run_id: UUID, kind: str, name: str, metadata: dict[str, Any] | None, agent: str | None = None) -> None:
+        thread_id = (metadata or {}).get("thread_id")
+        self._starts[run_id] = (kind, name, thread_id, agent, time.perf_counter(), time.thread_time())
+
+
+    def _end(self, run_id: UUID, error: bool = False, output: Any = None) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        kind, name, thread_id, agent, wall_start, cpu_start = started
+        if agent is None and output is not None:
+            # a2a_route_message only knows its agent once it has routed
+            agent = _result_agent(output)
+        self.recorder.record(
+            kind,
+            name,
+            time.perf_counter() - wall_start,
+            time.thread_time() - cpu_start,
+            thread_id=thread_id,
+            agent=agent,
+            error=error,
+        )
+
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs) -> None:
+        # Only graph nodes: middleware hooks ("ContentFilterMiddleware.before_agent"), "model", "tools"
+        name = kwargs.get("name")
+        if name is not None and name == (metadata or {}).get("langgraph_node"):
+            self._start(run_id, "hook", name, metadata)
+
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=not _is_control_flow(error))
+
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        name = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name") or "model"
+        self._start(run_id, "model", name, metadata)
+
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        name = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name") or "model"
+        self._start(run_id, "model", name, metadata)
+
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=True)
+
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, inputs=None, **kwargs) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, "tool", name, metadata, _input_agents(inputs))
+
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        self._end(run_id, output=output)
+
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=True)
+
+
+def _input_agents(inputs: Any) -> str | None:
+    # a2a_send_message names one target; a2a_send_messages a list of them
+    if not isinstance(inputs, dict):
+        return None
+    if inputs.get("target_agent_url"):
+        return inputs["target_agent_url"]
+    messages = inputs.get("messages")
+    if isinstance(messages, list):
+        urls = {item.get("target_agent_url") for item in messages if isinstance(item, dict)}
+        return ",".join(sorted(url for url in urls if url)) or None
+    return None
+
+
+def _result_agent(output: Any) -> str | None:
+    # Tool calls from the graph end with a ToolMessage whose content is the JSON result
+    if isinstance(output, ToolMessage):
+        try:
+            output = json.loads(output.content) if isinstance(output.content, str) else None
+        except ValueError:
+            return None
+    return output.get("target_agent_url") if isinstance(output, dict) else None
+
+
+def _is_control_flow(error: BaseException) -> bool:
+    # LangGraph interrupts (e.g. human-in-the-loop) end a node without it failing
+    return type(error).__name__ in {"GraphInterrupt", "NodeInterrupt", "ParentCommand"}
+
+
+def create_timing_handler() -> TimingCallbackHandler | None:
+    """
+    Build a timing handler from the environment, or None when timing is disabled.
+
+    SUPERVISOR_TIMING=true enables it; SUPERVISOR_TIMING_PATH also appends every span
+    to that JSON-lines file.
+
+    Returns:
+        TimingCallbackHandler | None: The configured handler
+    """
+    if os.getenv("SUPERVISOR_TIMING", "false").lower() != "true":
+        return None
+    return TimingCallbackHandler(TimingRecorder(sink_path=os.getenv("SUPERVISOR_TIMING_PATH")))
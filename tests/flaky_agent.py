@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill, TaskState, UnsupportedOperationError
+from a2a.utils import new_agent_text_message, new_task
+from a2a.utils.errors import ServerError
+
+from no_library.loadtest import serve_apps
+
+
+class FlakyAgentExecutor(AgentExecutor):
+    """
+    Local agent whose behaviour the test switches between calls.
+
+    mode "ok" answers with a direct message, "error" raises (the client sees a
+    transport-level error) and "failed" / "rejected" end a task in that state.
+    """
+
+    def __init__(self, mode: str = "ok", delay: float = 0.0):
+        self.mode = mode
+        self.delay = delay
+        self.calls = 0
+
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.mode == "error":
+            raise RuntimeError("flaky agent is down")
+        if self.mode in ("failed", "rejected"):
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+            updater = TaskUpdater(event_queue, task.id, task.context_id)
+            await updater.update_status(
+                TaskState(self.mode),
+                new_agent_text_message(f"task {self.mode}", task.context_id, task.id),
+                final=True,
+            )
+            return
+        await event_queue.enqueue_event(new_agent_text_message(f"ok: {context.get_user_input()}", context.context_id))
+
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        raise ServerError(error=UnsupportedOperationError())
+
+
+def build_flaky_app(url: str, executor: FlakyAgentExecutor):
+    card = AgentCard(
+        name="Flaky Agent",
+        description="Fails on demand",
+        url=url,
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=False),
+        skills=[AgentSkill(id="flaky", name="Flaky", description="Answer or fail", tags=["test"])],
+    )
+    handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+    return A2AStarletteApplication(agent_card=card, http_handler=handler).build()
+
+
+@asynccontextmanager
+async def serve_flaky_agents(executors: dict[str, FlakyAgentExecutor], base_port: int) -> AsyncIterator[dict[str, str]]:
+    """Serve one flaky agent per executor on localhost; yields their URLs by name."""
+    apps = {
+        name: build_flaky_app(f"http://127.0.0.1:{base_port + offset}/", executor)
+        for offset, (name, executor) in enumerate(executors.items())
+    }
+    async with serve_apps(apps, base_port) as urls:
+        yield urls
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+import re
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import TaskQueryParams, TaskState
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+
+BASE_PORT = 19760
+
+
+def test_abandoned_non_streaming_send_cancels_the_remote_task(caplog):
+    async def scenario():
+        spec = load_spec("weather_agent")
+        url = f"http://127.0.0.1:{BASE_PORT}/"
+        app = build_app(spec, url=url, model=ScriptedChatModel(script=spec.script, latency=2.0))
+        async with serve_apps({"weather": app}, BASE_PORT), httpx.AsyncClient(timeout=30) as httpx_client:
+            provider = A2AClientToolProvider(known_agent_urls=[url], streaming=False)
+            try:
+                # The deadline abandons the send while the agent is still working
+                try:
+                    await asyncio.wait_for(provider.a2a_send_message(QUERIES["weather_agent"], url), 0.5)
+                except TimeoutError:
+                    pass
+                while provider._cancellations:
+                    await asyncio.sleep(0.05)
+            finally:
+                await provider.aclose()
+
+            task_id = re.search(r"Canceled abandoned task (\S+)", caplog.text).group(1)
+            client = await ClientFactory.connect(url, client_config=ClientConfig(httpx_client=httpx_client))
+            return await client.get_task(TaskQueryParams(id=task_id))
+
+    with caplog.at_level(logging.INFO, logger="no_library.supervisor_agent.a2a_client"):
+        task = asyncio.run(asyncio.wait_for(scenario(), 30))
+
+    assert task.status.state == TaskState.canceled
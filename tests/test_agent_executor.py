@@ -0,0 +1,41 @@
+import asyncio
+import logging
+from uuid import uuid4
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import Message, Part, Role, TaskIdParams, TaskState, TextPart
+
+from a2a_common.app_factory import build_app
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+
+BASE_PORT = 19750
+
+
+def test_cancel_stops_the_run_and_reports_canceled_once(caplog):
+    async def scenario():
+        spec = load_spec("weather_agent")
+        url = f"http://127.0.0.1:{BASE_PORT}/"
+        app = build_app(spec, url=url, model=ScriptedChatModel(script=spec.script, latency=2.0))
+        async with serve_apps({"weather": app}, BASE_PORT), httpx.AsyncClient(timeout=30) as httpx_client:
+            client = await ClientFactory.connect(url, client_config=ClientConfig(httpx_client=httpx_client))
+            message = Message(
+                role=Role.user, parts=[Part(TextPart(text=QUERIES["weather_agent"]))], message_id=uuid4().hex
+            )
+            states = []
+            async for task, _update in client.send_message(message):
+                states.append(task.status.state)
+                if len(states) == 1:
+                    canceled = await client.cancel_task(TaskIdParams(id=task.id))
+                    assert canceled.status.state == TaskState.canceled
+            await asyncio.sleep(0.2)  # let the canceled run unwind
+            return states
+
+    with caplog.at_level(logging.WARNING):
+        # Without a final event on the run's own queue the stream would never end
+        states = asyncio.run(asyncio.wait_for(scenario(), 30))
+
+    assert states[-1] == TaskState.canceled
+    assert states.count(TaskState.canceled) == 1
+    assert "Queue is closed" not in caplog.text
@@ -0,0 +1,73 @@
+import asyncio
+import sqlite3
+import zlib
+
+import ormsgpack
+
+from a2a_common.checkpointer import BoundedCheckpointer, SqliteThreadStore
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.loadtest import QUERIES, load_spec
+
+
+def _turn(checkpointer: BoundedCheckpointer, thread_id: str) -> int:
+    """Run one weather agent turn on a thread; returns the number of messages in it."""
+    spec = load_spec("weather_agent")
+    agent = spec.build_agent(ScriptedChatModel(script=spec.script), checkpointer)
+    config = {"configurable": {"thread_id": thread_id}}
+    result = asyncio.run(agent.ainvoke({"messages": [("user", QUERIES["weather_agent"])]}, config))
+    return len(result["messages"])
+
+
+def test_evicted_threads_are_restored_from_deltas(tmp_path):
+    checkpointer = BoundedCheckpointer(max_threads=1, spill_store=SqliteThreadStore(str(tmp_path / "state.sqlite")))
+    lengths = [_turn(checkpointer, thread_id) for thread_id in ["a", "b", "a", "b", "a"]]
+
+    # Every turn adds the question, the tool call, the tool result and the answer
+    assert lengths == [4, 4, 8, 8, 12]
+    assert checkpointer.restores == 3
+
+
+def test_write_through_shares_threads_between_processes(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    workers = [
+        BoundedCheckpointer(spill_store=SqliteThreadStore(path), write_through=True),
+        BoundedCheckpointer(spill_store=SqliteThreadStore(path), write_through=True),
+    ]
+    lengths = [_turn(workers[turn % 2], "shared") for turn in range(4)]
+    assert lengths == [4, 8, 12, 16]
+
+
+def test_write_through_appends_only_new_items(tmp_path):
+    store = SqliteThreadStore(str(tmp_path / "state.sqlite"))
+    checkpointer = BoundedCheckpointer(spill_store=store, write_through=True)
+    _turn(checkpointer, "t")
+    first_turn = store.load("t")[0]
+    _turn(checkpointer, "t")
+    deltas = store.load("t")[0]
+
+    # Later deltas do not repeat the earlier checkpoints
+    assert len(deltas) > len(first_turn)
+    assert sum(map(len, deltas[len(first_turn):])) < 2 * sum(map(len, first_turn))
+
+
+def test_whole_thread_rows_are_migrated(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    store = SqliteThreadStore(path)
+    checkpointer = BoundedCheckpointer(spill_store=store)
+    _turn(checkpointer, "t")
+    checkpointer.flush()
+    # Rewrite the thread as the one-row-per-thread layout used before deltas
+    deltas, _ = store.load("t")
+    merged = [[], [], []]
+    for data in deltas:
+        for items, more in zip(merged, ormsgpack.unpackb(zlib.decompress(data))):
+            items.extend(more)
+    store.close()
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE thread_deltas")
+    conn.execute("CREATE TABLE threads (thread_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)")
+    conn.execute("INSERT INTO threads VALUES ('t', ?, 0)", (zlib.compress(ormsgpack.packb(merged)),))
+    conn.commit()
+    conn.close()
+
+    assert _turn(BoundedCheckpointer(spill_store=SqliteThreadStore(path)), "t") == 8
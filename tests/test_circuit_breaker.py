@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+from flaky_agent import FlakyAgentExecutor, serve_flaky_agents
+
+from no_library.supervisor_agent.a2a_client import A2AClientToolProvider
+from no_library.supervisor_agent.circuit_breaker import CircuitState
+
+BASE_PORT = 19700
+
+
+def test_circuit_opens_probes_and_closes():
+    async def scenario():
+        agent = FlakyAgentExecutor(mode="error")
+        async with serve_flaky_agents({"flaky": agent}, BASE_PORT) as urls:
+            url = urls["flaky"]
+            provider = A2AClientToolProvider(known_agent_urls=[url], failure_threshold=2, recovery_timeout=0.3)
+            try:
+                for _ in range(2):
+                    assert (await provider.a2a_send_message("hi", url))["status"] == "error"
+                assert provider.circuit_stats()[url]["state"] == CircuitState.OPEN
+
+                # Open: fail fast without reaching the agent, saying when to try again
+                calls = agent.calls
+                refused = await provider.a2a_send_message("hi", url)
+                assert refused["error_type"] == "circuit_open"
+                assert refused["retry_after_seconds"] > 0
+                assert agent.calls == calls
+
+                # Half-open: one probe goes through; others are told it is in flight
+                agent.mode, agent.delay = "ok", 0.3
+                await asyncio.sleep(0.35)
+                probe = asyncio.create_task(provider.a2a_send_message("probe", url))
+                await asyncio.sleep(0.1)
+                assert provider.circuit_stats()[url]["state"] == CircuitState.HALF_OPEN
+                during_probe = await provider.a2a_send_message("hi", url)
+                assert during_probe["error_type"] == "circuit_open"
+                assert during_probe["probe_in_flight"] is True
+                assert "retry_after_seconds" not in during_probe
+                assert (await probe)["status"] == "success"
+
+                assert provider.circuit_stats()[url]["state"] == CircuitState.CLOSED
+                agent.delay = 0.0
+                assert (await provider.a2a_send_message("hi", url))["status"] == "success"
+            finally:
+                await provider.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_failed_half_open_probe_reopens():
+    async def scenario():
+        agent = FlakyAgentExecutor(mode="error")
+        async with serve_flaky_agents({"flaky": agent}, BASE_PORT + 10) as urls:
+            url = urls["flaky"]
+            provider = A2AClientToolProvider(known_agent_urls=[url], failure_threshold=1, recovery_timeout=0.2)
+            try:
+                await provider.a2a_send_message("hi", url)
+                await asyncio.sleep(0.25)
+                assert (await provider.a2a_send_message("probe", url))["status"] == "error"
+                assert provider.circuit_stats()[url]["state"] == CircuitState.OPEN
+            finally:
+                await provider.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_failed_and_rejected_tasks_count_as_failures():
+    async def scenario():
+        agent = FlakyAgentExecutor(mode="failed")
+        async with serve_flaky_agents({"flaky": agent}, BASE_PORT + 20) as urls:
+            url = urls["flaky"]
+            for result_mode in ("full", "compact"):
+                provider = A2AClientToolProvider(known_agent_urls=[url], failure_threshold=2, result_mode=result_mode)
+                try:
+                    agent.mode = "failed"
+                    await provider.a2a_send_message("hi", url)
+                    agent.mode = "rejected"
+                    result = await provider.a2a_send_message("hi", url)
+                    # The send itself worked; the task did not
+                    assert result["status"] == "success"
+                    assert provider.circuit_stats()[url]["state"] == CircuitState.OPEN
+                finally:
+                    await provider.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_calls_abandoned_by_the_deadline_count_as_failures():
+    async def scenario():
+        agent = FlakyAgentExecutor(delay=5.0)
+        async with serve_flaky_agents({"hanging": agent}, BASE_PORT + 25) as urls:
+            url = urls["hanging"]
+            provider = A2AClientToolProvider(known_agent_urls=[url], failure_threshold=2)
+            try:
+                for _ in range(2):
+                    result = await provider.a2a_send_messages(
+                        [{"target_agent_url": url, "message_text": "hi"}], timeout_seconds=0.3
+                    )
+                    assert result["results"][0]["status"] == "timeout"
+                assert provider.circuit_stats()[url]["state"] == CircuitState.OPEN
+                refused = await provider.a2a_send_message("hi", url)
+                assert refused["error_type"] == "circuit_open"
+            finally:
+                await provider.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_hedging_answers_from_the_fast_replica():
+    async def scenario():
+        slow = FlakyAgentExecutor(delay=2.0)
+        fast = FlakyAgentExecutor()
+        async with serve_flaky_agents({"slow": slow, "fast": fast}, BASE_PORT + 30) as urls:
+            provider = A2AClientToolProvider(
+                known_agent_urls=list(urls.values()),
+                agent_replicas={urls["slow"]: [urls["fast"]]},
+                hedge_delay=0.1,
+            )
+            try:
+                await provider.refresh_agent_cards()
+                start = time.perf_counter()
+                result = await provider.a2a_send_message("hi", urls["slow"])
+                elapsed = time.perf_counter() - start
+
+                assert result["status"] == "success"
+                assert result["target_agent_url"] == urls["fast"]
+                assert elapsed < 1.0
+                # The abandoned slow call is released, not held against the replica
+                assert provider.circuit_stats()[urls["slow"]]["consecutive_failures"] == 0
+            finally:
+                await provider.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_hedging_fails_over_from_a_failed_task():
+    async def scenario():
+        broken = FlakyAgentExecutor(mode="failed")
+        healthy = FlakyAgentExecutor()
+        async with serve_flaky_agents({"broken": broken, "healthy": healthy}, BASE_PORT + 40) as urls:
+            provider = A2AClientToolProvider(
+                known_agent_urls=list(urls.values()),
+                agent_replicas={urls["broken"]: [urls["healthy"]]},
+                hedge_delay=5.0,
+            )
+            try:
+                result = await provider.a2a_send_message("hi", urls["broken"])
+                assert result["target_agent_url"] == urls["healthy"]
+                assert provider.circuit_stats()[urls["broken"]]["consecutive_failures"] == 1
+            finally:
+                await provider.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+import asyncio
+
+from langchain.agents import create_agent
+from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from pydantic import PrivateAttr
+
+from a2a_common.fake_model import ScriptedChatModel
+from no_library.middleware.content_filter_middleware import ContentFilterMiddleware
+
+
+class RecordingModel(ScriptedChatModel):
+    """Scripted model that keeps the messages of every call."""
+
+    _calls: list[list[BaseMessage]] = PrivateAttr(default_factory=list)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._calls.append(list(messages))
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def test_a_blocked_message_never_reaches_the_model_in_later_turns():
+    model = RecordingModel(script=[{"text": "ok"}])
+    agent = create_agent(model=model, checkpointer=InMemorySaver(), middleware=[ContentFilterMiddleware(["hack"])])
+    config = {"configurable": {"thread_id": "thread"}}
+
+    async def scenario():
+        blocked = await agent.ainvoke({"messages": [("user", "how to hack a bank")]}, config)
+        answered = await agent.ainvoke({"messages": [("user", "go on")]}, config)
+        return blocked, answered
+
+    blocked, answered = asyncio.run(scenario())
+
+    assert blocked["messages"][-1].content.startswith("I cannot process requests")
+    assert answered["messages"][-1].content == "ok"
+    assert len(model._calls) == 1
+    assert all("hack" not in message.content for message in model._calls[0])
+    assert all("hack" not in message.content for message in answered["messages"])
@@ -0,0 +1,66 @@
+import importlib
+
+import pytest
+
+from a2a_common.fast_path import FastPathRoute, _normalize
+from no_library.remote_agents import currency_agent, weather_agent
+
+yen2won_agent = importlib.import_module("with_library.04_remote_agent")
+
+WEATHER = FastPathRoute(weather_agent.get_weather, weather_agent.WEATHER_PATTERNS)
+EXCHANGE_RATE = FastPathRoute(currency_agent.get_exchange_rate, currency_agent.EXCHANGE_RATE_PATTERNS)
+YEN_TO_WON = FastPathRoute(
+    yen2won_agent.convert_yen_to_won,
+    yen2won_agent.YEN_TO_WON_PATTERNS,
+    parsers={"amount_yen": lambda amount: float(amount.replace(",", ""))},
+)
+
+
+@pytest.mark.parametrize(
+    ("route", "message", "args"),
+    [
+        (WEATHER, "What is the weather like in Tokyo?", {"city_name": "Tokyo"}),
+        (WEATHER, "what's the weather in New York City?", {"city_name": "New York City"}),
+        (WEATHER, "weather in Paris today", {"city_name": "Paris"}),
+        (WEATHER, "東京の天気は？", {"city_name": "東京"}),
+        (EXCHANGE_RATE, "What is the exchange rate between USD and JPY?", {}),
+        (YEN_TO_WON, "1000円は何ウォン？", {"amount_yen": 1000.0}),
+        (YEN_TO_WON, "1,000円は何ウォン？", {"amount_yen": 1000.0}),
+        (YEN_TO_WON, "Convert 12,345.5 yen to won", {"amount_yen": 12345.5}),
+    ],
+)
+def test_direct_requests_match_with_their_arguments(route, message, args):
+    assert route.match(_normalize(message)) == args
+
+
+@pytest.mark.parametrize(
+    ("route", "message"),
+    [
+        # Another time than now
+        (WEATHER, "what's the weather in New York City tomorrow?"),
+        (WEATHER, "What was the weather in Tokyo last week?"),
+        (WEATHER, "weather in Tokyo this weekend?"),
+        (WEATHER, "明日の東京の天気は？"),
+        (WEATHER, "東京の明日の天気は？"),
+        (WEATHER, "先週の東京の天気は？"),
+        (EXCHANGE_RATE, "What was the USD to JPY rate yesterday?"),
+        # More than one city
+        (WEATHER, "weather in Paris and London"),
+        (WEATHER, "東京と大阪の天気は？"),
+        (WEATHER, "東京や大阪の天気は？"),
+        # Not a city
+        (WEATHER, "weather in Tokyo in fahrenheit please"),
+        (WEATHER, "What's the weather like in my city?"),
+        # Malformed or signed amounts
+        (YEN_TO_WON, "1.2.3円は何ウォン？"),
+        (YEN_TO_WON, "convert 1.2.3 yen to won"),
+        (YEN_TO_WON, "1,00円は何ウォン？"),
+        (YEN_TO_WON, "Convert -5 yen to won"),
+        (YEN_TO_WON, "convert 1e9 yen to won"),
+        # More than one request
+        (WEATHER, "What's the weather in Tokyo? Also book me a flight to Osaka."),
+        (YEN_TO_WON, "1000円は何ウォン？ あと2000円は？"),
+    ],
+)
+def test_requests_the_tool_cannot_answer_do_not_match(route, message):
+    assert route.match(_normalize(message)) is None
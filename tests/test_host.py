@@ -0,0 +1,51 @@
+import asyncio
+from uuid import uuid4
+
+import httpx
+from a2a.client import ClientConfig, ClientFactory
+from a2a.types import Message, Part, Role, TextPart
+
+from a2a_common.checkpointer import create_checkpointer
+from a2a_common.host import build_host_app
+from no_library.loadtest import QUERIES, load_spec, serve_apps
+
+BASE_PORT = 19950
+
+
+def test_hosted_agents_keep_conversations_with_the_same_context_apart(monkeypatch, tmp_path):
+    monkeypatch.setenv("MODEL_BACKEND", "scripted")
+    monkeypatch.setenv("A2A_STATE_BACKEND", "memory")
+    monkeypatch.setenv("CHECKPOINT_DB_PATH", str(tmp_path / "checkpoints.sqlite"))
+    monkeypatch.setenv("TASK_DB_PATH", str(tmp_path / "tasks.sqlite"))
+    monkeypatch.setenv("PUBLIC_HOST", "127.0.0.1")
+    monkeypatch.setenv("PORT", str(BASE_PORT))
+    names = ["weather_agent", "currency_agent"]
+
+    async def scenario():
+        app = build_host_app([load_spec(name) for name in names])
+        async with serve_apps({"host": app}, BASE_PORT) as urls, httpx.AsyncClient(timeout=30) as httpx_client:
+            for name in names:
+                client = await ClientFactory.connect(
+                    f"{urls['host']}{name}/", client_config=ClientConfig(httpx_client=httpx_client, streaming=False)
+                )
+                message = Message(
+                    role=Role.user,
+                    parts=[Part(TextPart(text=QUERIES[name]))],
+                    message_id=uuid4().hex,
+                    context_id="shared-context",
+                )
+                async for _event in client.send_message(message):
+                    pass
+
+    # Shutting the host down persists the conversations
+    asyncio.run(scenario())
+
+    for name in names:
+        checkpointer = create_checkpointer(str(tmp_path / f"checkpoints.{name}.sqlite"))
+        try:
+            saved = checkpointer.get_tuple({"configurable": {"thread_id": "shared-context", "checkpoint_ns": ""}})
+        finally:
+            checkpointer.close()
+        questions = [message.content for message in saved.checkpoint["channel_values"]["messages"] if message.type == "human"]
+        assert questions == [QUERIES[name]]
+    assert (tmp_path / "tasks.weather_agent.sqlite").exists() and (tmp_path / "tasks.currency_agent.sqlite").exists()
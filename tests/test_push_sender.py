@@ -0,0 +1,62 @@
+import asyncio
+
+from a2a.server.tasks import InMemoryPushNotificationConfigStore
+from a2a.types import PushNotificationConfig, Task, TaskState, TaskStatus
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from a2a_common.push_sender import QueuedPushNotificationSender
+from no_library.loadtest import serve_apps
+
+BASE_PORT = 19780
+
+
+def _webhook(received: list[tuple[dict, str | None]]) -> Starlette:
+    """Stand-in webhook that records each notification and its token."""
+
+    async def notify(request: Request) -> Response:
+        received.append((await request.json(), request.headers.get("X-A2A-Notification-Token")))
+        return Response(status_code=204)
+
+    app = Starlette()
+    app.add_route("/webhook", notify, methods=["POST"])
+    return app
+
+
+def _task(task_id: str, state: TaskState) -> Task:
+    return Task(id=task_id, context_id="context", status=TaskStatus(state=state))
+
+
+def test_only_tasks_with_a_webhook_are_snapshotted_and_delivered():
+    async def scenario():
+        received: list[tuple[dict, str | None]] = []
+        async with serve_apps({"webhook": _webhook(received)}, BASE_PORT) as urls:
+            store = InMemoryPushNotificationConfigStore()
+            sender = QueuedPushNotificationSender(store)
+            await store.set_info("watched", PushNotificationConfig(url=f"{urls['webhook']}webhook", token="secret"))
+
+            watched = _task("watched", TaskState.working)
+            await sender.send_notification(watched)
+            # Either delivered in turn or merged into the newer snapshot
+            watched.status = TaskStatus(state=TaskState.completed)
+            await sender.send_notification(watched)
+            for _ in range(3):
+                await sender.send_notification(_task("unwatched", TaskState.working))
+
+            while sender.stats()["pending"] or sender.stats()["in_flight"]:
+                await asyncio.sleep(0.01)
+            await store.delete_info("watched")
+            await sender.send_notification(_task("watched", TaskState.canceled))
+
+            await sender.aclose()
+            return received, sender.stats()
+
+    received, stats = asyncio.run(scenario())
+
+    assert [payload["id"] for payload, _ in received] == ["watched"] * len(received)
+    assert received[-1][0]["status"]["state"] == TaskState.completed.value
+    assert {token for _, token in received} == {"secret"}
+    assert stats["skipped"] == 4
+    assert stats["enqueued"] + stats["coalesced"] == 2
+    assert stats["delivered"] == len(received)
@@ -0,0 +1,31 @@
+import asyncio
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from a2a_common.state_backend import create_state_backend
+
+
+def test_sqlite_state_is_shared_per_agent_not_across_agents(monkeypatch, tmp_path):
+    monkeypatch.setenv("A2A_STATE_BACKEND", "sqlite")
+    monkeypatch.setenv("A2A_STATE_DB_PATH", str(tmp_path / "a2a_state.sqlite"))
+
+    async def scenario():
+        weather, currency = create_state_backend("weather_agent"), create_state_backend("currency_agent")
+        weather_worker = create_state_backend("weather_agent")  # another worker process of the same agent
+        try:
+            await weather.task_store.save(
+                Task(id="task", context_id="context", status=TaskStatus(state=TaskState.completed))
+            )
+            return await weather_worker.task_store.get("task"), await currency.task_store.get("task")
+        finally:
+            for state in (weather, currency, weather_worker):
+                state.close()
+
+    shared, other_agent = asyncio.run(scenario())
+
+    assert shared is not None and shared.id == "task"
+    assert other_agent is None
+    assert sorted(path.name for path in tmp_path.glob("*.sqlite")) == [
+        "a2a_state.currency_agent.sqlite",
+        "a2a_state.weather_agent.sqlite",
+    ]
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from a2a_common.fake_model import ResponseRecording
+from a2a_common.strands_models import RecordedStrandsModel, ScriptedStrandsModel
+
+
+class Weather(BaseModel):
+    city: str
+    summary: str
+
+
+async def _structured_output(model: ScriptedStrandsModel | RecordedStrandsModel, text: str) -> list[dict]:
+    prompt = [{"role": "user", "content": [{"text": text}]}]
+    return [event async for event in model.structured_output(Weather, prompt)]
+
+
+def test_structured_output_parses_the_last_answer_of_the_script():
+    model = ScriptedStrandsModel([
+        {"tool": "get_weather", "args": {"city_name": "Tokyo"}},
+        {"text": '{"city": "Tokyo", "summary": "{input}"}'},
+    ])
+
+    events = asyncio.run(_structured_output(model, "Sunny"))
+
+    assert events == [{"output": Weather(city="Tokyo", summary="Sunny")}]
+
+
+def test_structured_output_rejects_an_answer_that_does_not_fit():
+    model = ScriptedStrandsModel([{"text": "Tokyo is Sunny"}])
+
+    with pytest.raises(ValidationError):
+        asyncio.run(_structured_output(model, "What is the weather like in Tokyo?"))
+
+
+def test_recorded_structured_output_replays_offline(tmp_path):
+    recording = ResponseRecording(str(tmp_path / "recording.jsonl"))
+    live = ScriptedStrandsModel([{"text": '{"city": "Tokyo", "summary": "Sunny"}'}])
+
+    recorded = asyncio.run(_structured_output(RecordedStrandsModel(recording, inner=live), "Tokyo?"))
+    # A fresh recording from the same file, without the live model
+    replayed = asyncio.run(
+        _structured_output(RecordedStrandsModel(ResponseRecording(recording.path), latency=0.0), "Tokyo?")
+    )
+
+    assert recorded == replayed == [{"output": Weather(city="Tokyo", summary="Sunny")}]
+    with pytest.raises(LookupError):
+        asyncio.run(_structured_output(RecordedStrandsModel(recording, latency=0.0), "Osaka?"))
@@ -0,0 +1,39 @@
+import asyncio
+
+from langchain_core.tools import StructuredTool
+
+from no_library.supervisor_agent.timing import TimingCallbackHandler, TimingRecorder
+
+
+async def a2a_send_messages(messages: list[dict[str, str]]) -> dict:
+    """Send to several agents."""
+    return {"status": "success", "results": []}
+
+
+async def a2a_route_message(message_text: str) -> dict:
+    """Send to the best matching agent."""
+    return {"status": "success", "target_agent_url": "http://weather/"}
+
+
+def test_multi_agent_tool_spans_are_tagged_with_their_agents():
+    recorder = TimingRecorder()
+    config = {"callbacks": [TimingCallbackHandler(recorder)]}
+    messages = [
+        {"target_agent_url": "http://weather/", "message_text": "Tokyo?"},
+        {"target_agent_url": "http://currency/", "message_text": "USD/JPY?"},
+    ]
+
+    async def scenario():
+        await StructuredTool.from_function(coroutine=a2a_send_messages).ainvoke({"messages": messages}, config)
+        # As called from the graph: the result arrives as a ToolMessage
+        await StructuredTool.from_function(coroutine=a2a_route_message).ainvoke(
+            {"type": "tool_call", "id": "call-1", "name": "a2a_route_message", "args": {"message_text": "Tokyo?"}},
+            config,
+        )
+
+    asyncio.run(scenario())
+
+    assert set(recorder.histograms()) == {
+        "tool:a2a_send_messages@http://currency/,http://weather/",
+        "tool:a2a_route_message@http://weather/",
+    }
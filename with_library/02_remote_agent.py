@@ -2,6 +2,7 @@ import os
 from strands import Agent, tool
 from fastapi import FastAPI
 import uvicorn
+from contextlib import asynccontextmanager
 import logging
 from strands.multiagent.a2a import A2AServer
 from strands.models.openai import OpenAIModel
@@ -10,6 +11,13 @@ from dotenv import load_dotenv
 import base64
 from strands.telemetry import StrandsTelemetry
 import uuid
+from pathlib import Path
+
+# Share task state between worker processes through the shared state backend,
+# select the model with the model backend and trace with the tracing setup
+from a2a_common.model_backend import create_strands_model
+from a2a_common.state_backend import create_state_backend
+from a2a_common.tracing import TraceContextMiddleware, setup_tracing
 
 
 load_dotenv()
@@ -20,23 +28,21 @@ LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_BASE_URL = os.getenv("LANGFUSE_BASE_URL")
 
-LANGFUSE_AUTH = base64.b64encode(
-    f"{LANGFUSE_PUBLIC_KEY}:{LANGFUSE_SECRET_KEY}".encode()
-).decode()  
-
-# OpenTelemetry のエンドポイントと認証ヘッダーを設定
-os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = LANGFUSE_BASE_URL + "/api/public/otel"
-os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {LANGFUSE_AUTH}"
+strands_telemetry = StrandsTelemetry()
+if LANGFUSE_BASE_URL:
+    LANGFUSE_AUTH = base64.b64encode(
+        f"{LANGFUSE_PUBLIC_KEY}:{LANGFUSE_SECRET_KEY}".encode()
+    ).decode()
 
-# OpenTelemetry エクスポーターをセットアップ
-strands_telemetry = StrandsTelemetry().setup_otlp_exporter()
+    # OpenTelemetry のエンドポイントと認証ヘッダーを設定
+    os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = LANGFUSE_BASE_URL + "/api/public/otel"
+    os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {LANGFUSE_AUTH}"
 
+    # OpenTelemetry エクスポーターをセットアップ
+    strands_telemetry.setup_otlp_exporter()
 
-model = OpenAIModel(
-    client_args={"api_key": os.environ["OPENAI_API_KEY"]},
-    model_id="gpt-4o-mini",
-    params={"temperature": 0.2},
-)
+# TRACING=memory / file でローカルにも出力する（Strands と同じ TracerProvider に追加）
+setup_tracing("weather_agent")
 
 
 @tool
@@ -44,40 +50,73 @@ def get_weather(city_name: str) -> str:
     """Get the current weather."""
     return f"{city_name} is Sunny"
 
-session_id = str(uuid.uuid4())  
-# Create a Strands agent
-strands_agent = Agent(
-    name="Weather Agent",
-    model=model,
-    description="A weather agent that can search weather.",
-    tools=[get_weather],
-    trace_attributes={
-        "session.id": session_id,                 # セッション識別
-        "user.id": "test-user@example.com",       # ユーザー識別
-        "langfuse.tags": ["シングルエージェント"],  # タグ付け
-    },
-    callback_handler=None
-)
-
 host = "127.0.0.1"
 port = 9001
-# Create A2A server (streaming enabled by default)
-a2a_server = A2AServer(
-    agent=strands_agent,
-    host=host,
-    port=port,
+
+
+def create_app() -> FastAPI:
+    """Build the app; called once in every worker process."""
+    state = create_state_backend("weather_agent")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        state.close()
+
+    # MODEL_BACKEND=scripted / replay runs the agent offline (no API key needed)
+    model = create_strands_model(
+        "weather_agent",
+        lambda: OpenAIModel(
+            client_args={"api_key": os.environ["OPENAI_API_KEY"]},
+            model_id="gpt-4o-mini",
+            params={"temperature": 0.2},
+        ),
+        script=[{"tool": "get_weather", "args": {"city_name": "Tokyo"}}, {"text": "{last}"}],
     )
 
-# # Start the server
-# a2a_server.serve()
+    session_id = str(uuid.uuid4())  
+    # Create a Strands agent
+    strands_agent = Agent(
+        name="Weather Agent",
+        model=model,
+        description="A weather agent that can search weather.",
+        tools=[get_weather],
+        trace_attributes={
+            "session.id": session_id,                 # セッション識別
+            "user.id": "test-user@example.com",       # ユーザー識別
+            "langfuse.tags": ["シングルエージェント"],  # タグ付け
+        },
+        callback_handler=None
+    )
+
+    # Create A2A server (streaming enabled by default)
+    a2a_server = A2AServer(
+        agent=strands_agent,
+        host=host,
+        port=port,
+        task_store=state.task_store,
+        push_config_store=state.push_config_store,
+        )
 
-app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
-@app.get("/ping")
-def ping():
-    return {"status": "healthy"}
+    @app.get("/ping")
+    def ping():
+        return {"status": "healthy"}
+
+    app.mount("/", a2a_server.to_fastapi_app())
+    # Continue the supervisor's trace (W3C trace context in the request headers)
+    app.add_middleware(TraceContextMiddleware)
+    return app
 
-app.mount("/", a2a_server.to_fastapi_app())
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=9001)
\ No newline at end of file
+    # Import string + factory so uvicorn can start several worker processes (WORKERS)
+    uvicorn.run(
+        f"{Path(__file__).stem}:create_app",
+        factory=True,
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WORKERS", "1")),
+        timeout_graceful_shutdown=30,
+    )
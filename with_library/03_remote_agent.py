@@ -8,9 +8,21 @@ from langgraph_a2a_server import A2AServer
 # LangChain/LangGraph
 from langchain_core.tools import tool
 from langchain.agents import create_agent
-from langgraph.checkpoint.memory import InMemorySaver
 from dotenv import load_dotenv
 
+# Reuse the agent spec, the bounded checkpointer, the fast path and the model selection of a2a_common
+from a2a_common.app_factory import AgentSpec
+from a2a_common.checkpointer import create_checkpointer
+from a2a_common.fast_path import (
+    CITY_NAME,
+    JA_CITY_NAME,
+    QUESTION_PREFIX,
+    SENTENCE_END,
+    FastPathRoute,
+    create_fast_path,
+)
+from a2a_common.model_backend import create_chat_model
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -50,20 +62,47 @@ def get_temperature(city_name: str) -> str:
     return f"{city_name} is 15℃"
 
 
-# Create LangGraph agent
-agent = create_agent(
-    model="openai:gpt-4.1-nano",
-    tools=[get_temperature],
-    checkpointer=InMemorySaver(),
-)
+# Requests answered by calling get_temperature directly when FAST_PATH=true
+TEMPERATURE_PATTERNS = [
+    rf"{QUESTION_PREFIX}temperature (?:in|for|at) {CITY_NAME}(?: (?:today|now|right now))?{SENTENCE_END}",
+    rf"{JA_CITY_NAME}の(?:気温|温度)(?:は|を教えて(?:ください)?)?{SENTENCE_END}",
+]
+
 
-# Create A2A server with the agent
-server = A2AServer(
-    graph=agent,
-    agent_card=agent_card,
-    port=9002,
+def build_agent(model, checkpointer):
+    return create_agent(
+        model=model,
+        tools=[get_temperature],
+        checkpointer=checkpointer,
+        middleware=create_fast_path([
+            FastPathRoute(get_temperature, TEMPERATURE_PATTERNS),
+        ]),
+    )
+
+
+# Lets no_library/remote_agents/agent_host.py serve this agent next to the others
+spec = AgentSpec(
+    name="temperature_agent",
+    default_port=PORT,
+    default_public_host=PUBLIC_HOST,
+    model="openai:gpt-4.1-nano",
+    build_agent=build_agent,
+    build_card=lambda url: agent_card.model_copy(update={"url": url}),
+    # Offline stand-in for the model (MODEL_BACKEND=scripted): call the tool, answer with its result
+    script=[{"tool": "get_temperature", "args": {"city_name": "Tokyo"}}, {"text": "{last}"}],
 )
 
 # Start the server
 if __name__ == '__main__':
-    server.serve()
\ No newline at end of file
+    # Create LangGraph agent
+    checkpointer = create_checkpointer()
+    agent = build_agent(create_chat_model(spec.model, spec.name, spec.script), checkpointer)
+
+    # Create A2A server with the agent
+    server = A2AServer(
+        graph=agent,
+        agent_card=agent_card,
+        port=9002,
+    )
+    server.serve()
+    checkpointer.close()
\ No newline at end of file
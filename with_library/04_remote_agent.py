@@ -8,9 +8,14 @@ from langgraph_a2a_server import A2AServer
 # LangChain/LangGraph
 from langchain_core.tools import tool
 from langchain.agents import create_agent
-from langgraph.checkpoint.memory import InMemorySaver
 from dotenv import load_dotenv
 
+# Reuse the agent spec, the bounded checkpointer, the fast path and the model selection of a2a_common
+from a2a_common.app_factory import AgentSpec
+from a2a_common.checkpointer import create_checkpointer
+from a2a_common.fast_path import SENTENCE_END, FastPathRoute, create_fast_path
+from a2a_common.model_backend import create_chat_model
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -35,7 +40,8 @@ agent_card = AgentCard(
             id="convert_yen_to_won",
             name="convert_yen_to_won",
             description="Convert an amount in Japanese Yen to Korean Won using the fixed rate 1円=10ウォン (100円=1000ウォン).",
-            tags=["currency", "conversion", "JPY", "KRW"],
+            # "cacheable": fixed-rate answers can be reused by the supervisor
+            tags=["currency", "conversion", "JPY", "KRW", "cacheable"],
             examples=["1000円は何ウォン？", "Convert 2500 yen to won"],
             input_modes=["text"],
             output_modes=["text"],
@@ -51,20 +57,54 @@ def convert_yen_to_won(amount_yen: float) -> str:
     return f"{amount_yen}円は{amount_won}ウォンです（固定レート: 1円=10ウォン）"
 
 
-# Create LangGraph agent
-agent = create_agent(
-    model="openai:gpt-4.1-nano",
-    tools=[convert_yen_to_won],
-    checkpointer=InMemorySaver(),
-)
+# Requests answered by calling convert_yen_to_won directly when FAST_PATH=true
+# A number on its own, with thousands separators only in groups of three: no sign, letter or
+# digit before it and no sign, digit or exponent after it ("-5", "1.2.3" and "1e9" do not match)
+AMOUNT_YEN = r"(?<![\w.,+\-−])(?P<amount_yen>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)(?![\d.,+\-−])(?!e[+\-]?\d)"
+YEN_TO_WON_PATTERNS = [
+    rf"(?:convert |how much is |what is )?{AMOUNT_YEN} ?(?:yen|jpy|円) (?:to|in|into) (?:korean )?(?:won|krw){SENTENCE_END}",
+    rf"{AMOUNT_YEN} ?円(?:は|って)?(?:何|なん)ウォン(?:ですか|になる(?:の)?)?{SENTENCE_END}",
+]
+
 
-# Create A2A server with the agent
-server = A2AServer(
-    graph=agent,
-    agent_card=agent_card,
-    port=PORT,
+def build_agent(model, checkpointer):
+    return create_agent(
+        model=model,
+        tools=[convert_yen_to_won],
+        checkpointer=checkpointer,
+        middleware=create_fast_path([
+            FastPathRoute(
+                convert_yen_to_won,
+                YEN_TO_WON_PATTERNS,
+                parsers={"amount_yen": lambda amount: float(amount.replace(",", ""))},
+            ),
+        ]),
+    )
+
+
+# Lets no_library/remote_agents/agent_host.py serve this agent next to the others
+spec = AgentSpec(
+    name="yen2won_agent",
+    default_port=PORT,
+    default_public_host=PUBLIC_HOST,
+    model="openai:gpt-4.1-nano",
+    build_agent=build_agent,
+    build_card=lambda url: agent_card.model_copy(update={"url": url}),
+    # Offline stand-in for the model (MODEL_BACKEND=scripted): call the tool, answer with its result
+    script=[{"tool": "convert_yen_to_won", "args": {"amount_yen": 1000}}, {"text": "{last}"}],
 )
 
 # Start the server
 if __name__ == '__main__':
+    # Create LangGraph agent
+    checkpointer = create_checkpointer()
+    agent = build_agent(create_chat_model(spec.model, spec.name, spec.script), checkpointer)
+
+    # Create A2A server with the agent
+    server = A2AServer(
+        graph=agent,
+        agent_card=agent_card,
+        port=PORT,
+    )
     server.serve()
+    checkpointer.close()